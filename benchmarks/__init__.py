@@ -0,0 +1 @@
+"""效能基準測試模組"""
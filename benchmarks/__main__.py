@@ -0,0 +1,103 @@
+"""
+基準測試命令列入口
+
+用法:
+    python -m benchmarks run [--filter 名稱] [--output 檔案]
+    python -m benchmarks compare 基準.json 目前.json [--threshold 0.1]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from .harness import (
+    BASELINE_DIR,
+    DEFAULT_THRESHOLD,
+    build_report,
+    compare_reports,
+    format_duration,
+    load_report,
+    save_report,
+)
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """執行基準測試"""
+    from game.headless import create_headless_engine
+
+    from .bench_engine import BENCHMARKS
+
+    engine = create_headless_engine()
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = bench(engine)
+        print(f"{name:<32} {format_duration(results[name]['median_ns']):>12}")
+
+    report = build_report(results)
+    if args.output:
+        save_report(report, Path(args.output))
+        print(f"結果已儲存: {args.output}")
+
+    if args.compare:
+        return _print_comparison(load_report(Path(args.compare)), report, args)
+    return 0
+
+
+def compare_command(args: argparse.Namespace) -> int:
+    """比較兩份報告"""
+    return _print_comparison(
+        load_report(Path(args.baseline)), load_report(Path(args.current)), args
+    )
+
+
+def _print_comparison(baseline, current, args: argparse.Namespace) -> int:
+    """輸出比較表，有退化時回傳非零結束碼"""
+    rows = compare_reports(baseline, current, args.threshold)
+    regressions = 0
+    for row in rows:
+        if row["ratio"] is None:
+            print(f"{row['name']:<32} {'(new)':>12}")
+            continue
+        flag = "  <-- REGRESSION" if row["status"] == "regression" else ""
+        print(
+            f"{row['name']:<32} {format_duration(row['baseline_ns']):>12}"
+            f" -> {format_duration(row['current_ns']):>12}"
+            f"  x{row['ratio']:.2f}{flag}"
+        )
+        regressions += row["status"] == "regression"
+
+    if regressions:
+        print(f"{regressions} 項基準測試退化超過 {args.threshold:.0%}")
+        return 1
+    print("沒有超過門檻的退化")
+    return 0
+
+
+def main() -> int:
+    """主程式入口"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="執行基準測試")
+    run_parser.add_argument("--filter", help="只執行名稱包含此字串的項目")
+    run_parser.add_argument(
+        "--output", help=f"儲存結果的JSON路徑（基準放在 {BASELINE_DIR.name}/）"
+    )
+    run_parser.add_argument("--compare", help="執行後與此基準比較")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    run_parser.set_defaults(handler=run_command)
+
+    compare_parser = subparsers.add_parser("compare", help="比較兩份結果")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.set_defaults(handler=compare_command)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
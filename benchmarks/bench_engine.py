@@ -0,0 +1,166 @@
+"""
+遊戲引擎熱點基準測試
+"""
+
+import random
+from typing import Callable, Dict
+
+import pygame
+
+from .harness import measure
+
+from game.arrow import Arrow
+from game.constants import ARROW_START_Y, JUDGMENT_LINE_Y, GameState
+from game.headless import start_session
+from utils.asset_loader import AssetLoader
+
+DIRECTIONS = ["LEFT", "DOWN", "UP", "RIGHT"]
+NOTE_COUNTS = (10, 100, 1000)
+FRAME_DT = 1.0 / 60
+
+Benchmark = Callable[[object], Dict[str, float]]
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    """註冊基準測試"""
+
+    def register(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+def _populate_arrows(engine, count: int, y_min: float, y_max: float) -> None:
+    """在畫面上放置指定數量的箭頭"""
+    rng = random.Random(count)
+    engine.arrows.clear()
+    speed = engine.difficulty.get_arrow_speed()
+    for _ in range(count):
+        direction = rng.choice(DIRECTIONS)
+        x, _ = engine.difficulty.get_arrow_position(direction)
+        y = rng.uniform(y_min, y_max)
+        engine.arrows.append(
+            Arrow(direction, x, y, speed, image=engine.arrow_images.get(direction))
+        )
+
+
+def _make_update_benchmark(count: int) -> Benchmark:
+    def run(engine) -> Dict[str, float]:
+        start_session(engine)
+        _populate_arrows(engine, count, JUDGMENT_LINE_Y + 10, ARROW_START_Y)
+        arrows = engine.arrows
+
+        def update(_):
+            for arrow in arrows:
+                arrow.update(FRAME_DT)
+
+        def reset_positions():
+            for index, arrow in enumerate(arrows):
+                arrow.y = JUDGMENT_LINE_Y + 10 + index % 400
+
+        return measure(update, setup=reset_positions, repeat=100, number=10)
+
+    return run
+
+
+def _make_cull_benchmark(count: int) -> Benchmark:
+    def run(engine) -> Dict[str, float]:
+        start_session(engine)
+        _populate_arrows(engine, count, JUDGMENT_LINE_Y - 200, ARROW_START_Y)
+        template = list(engine.arrows)
+
+        def setup():
+            engine.arrows[:] = template
+            for arrow in template:
+                arrow.hit = False
+                arrow.missed = False
+            engine.score.reset()
+            engine.judgment_log.reset()
+
+        return measure(
+            lambda _: engine._remove_out_of_bounds_arrows(), setup=setup, repeat=100
+        )
+
+    return run
+
+
+def _make_hit_benchmark(count: int) -> Benchmark:
+    def run(engine) -> Dict[str, float]:
+        start_session(engine)
+        _populate_arrows(engine, count, JUDGMENT_LINE_Y - 40, ARROW_START_Y)
+
+        def setup():
+            for arrow in engine.arrows:
+                arrow.hit = False
+            engine.last_key_press_time.clear()
+            engine.timing.last_judgment_time.clear()
+
+        return measure(
+            lambda _: engine._check_arrow_hit(pygame.K_LEFT), setup=setup, repeat=200
+        )
+
+    return run
+
+
+for _count in NOTE_COUNTS:
+    BENCHMARKS[f"arrow_update[{_count}]"] = _make_update_benchmark(_count)
+    BENCHMARKS[f"arrow_cull[{_count}]"] = _make_cull_benchmark(_count)
+    BENCHMARKS[f"check_arrow_hit[{_count}]"] = _make_hit_benchmark(_count)
+
+
+@benchmark("render_text")
+def bench_render_text(engine) -> Dict[str, float]:
+    """單行置中文字繪製"""
+    return measure(
+        lambda _: engine._render_text_centered(
+            "Score: 123456", engine.font_medium, (255, 255, 255), (400, 300)
+        ),
+        repeat=100,
+        number=10,
+    )
+
+
+@benchmark("draw_hud")
+def bench_draw_hud(engine) -> Dict[str, float]:
+    """遊戲中UI（分數、連擊、難度、準確率、連擊特效）"""
+    start_session(engine)
+    for index in range(10):
+        engine.score.add_score("PERFECT", 100, engine.current_time + index * 0.01)
+    return measure(lambda _: engine._draw_ui(), repeat=100, number=5)
+
+
+def _make_frame_benchmark(state: str, arrow_count: int = 0) -> Benchmark:
+    def run(engine) -> Dict[str, float]:
+        start_session(engine)
+        _populate_arrows(engine, arrow_count, JUDGMENT_LINE_Y, ARROW_START_Y)
+        if state == "GAME_OVER":
+            engine.timing_stats = engine.timing_analytics.compute(engine.judgment_log)
+        engine.game_state = GameState[state]
+        return measure(lambda _: engine._draw(), repeat=60, number=3)
+
+    return run
+
+
+BENCHMARKS["draw_frame[menu]"] = _make_frame_benchmark("MENU")
+BENCHMARKS["draw_frame[playing,20]"] = _make_frame_benchmark("PLAYING", 20)
+BENCHMARKS["draw_frame[playing,200]"] = _make_frame_benchmark("PLAYING", 200)
+BENCHMARKS["draw_frame[paused,20]"] = _make_frame_benchmark("PAUSED", 20)
+BENCHMARKS["draw_frame[game_over]"] = _make_frame_benchmark("GAME_OVER")
+
+
+@benchmark("asset_loader_startup")
+def bench_asset_loader_startup(engine) -> Dict[str, float]:
+    """建立 AssetLoader 並載入引擎啟動所需的全部資源"""
+
+    def load_all(_):
+        loader = AssetLoader()
+        for size in (48, 32, 24):
+            loader.load_font(size=size)
+        for direction in DIRECTIONS:
+            loader.load_image(f"arrow_{direction.lower()}.png", subfolder="arrows")
+        for name in ("perfect", "good", "miss", "combo"):
+            loader.load_sound(f"{name}.wav", "effects")
+
+    return measure(load_all, repeat=10)
@@ -0,0 +1,146 @@
+"""
+基準測試量測工具
+提供計時、結果統計與基準比較
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pygame
+
+# 添加src目錄到Python路徑
+SRC_PATH = Path(__file__).parent.parent / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+DEFAULT_THRESHOLD = 0.10  # 中位數變慢超過10%視為退化
+
+
+def measure(
+    operation: Callable[[Any], None],
+    setup: Optional[Callable[[], Any]] = None,
+    repeat: int = 50,
+    number: int = 1,
+) -> Dict[str, float]:
+    """
+    量測操作耗時
+
+    Args:
+        operation: 受測操作，參數為 setup 的回傳值
+        setup: 每輪量測前執行的準備函式（不計時）
+        repeat: 量測輪數
+        number: 每輪執行次數
+
+    Returns:
+        Dict[str, float]: 每次操作的耗時統計（奈秒）
+    """
+    samples: List[float] = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            operation(state)
+        samples.append((time.perf_counter_ns() - start) / number)
+
+    samples.sort()
+    return {
+        "median_ns": statistics.median(samples),
+        "min_ns": samples[0],
+        "mean_ns": statistics.fmean(samples),
+        "p95_ns": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def build_report(results: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    """
+    組合包含執行環境資訊的報告
+
+    Args:
+        results: 各基準測試的結果
+
+    Returns:
+        Dict[str, Any]: 報告
+    """
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def save_report(report: Dict[str, Any], file_path: Path) -> None:
+    """儲存報告為JSON"""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def load_report(file_path: Path) -> Dict[str, Any]:
+    """載入JSON報告"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    比較目前結果與基準
+
+    Args:
+        baseline: 基準報告
+        current: 目前報告
+        threshold: 允許的中位數變慢比例
+
+    Returns:
+        List[Dict[str, Any]]: 各基準測試的比較結果
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            rows.append({"name": name, "status": "new", "ratio": None})
+            continue
+
+        ratio = result["median_ns"] / base["median_ns"] if base["median_ns"] else 1.0
+        if ratio > 1.0 + threshold:
+            status = "regression"
+        elif ratio < 1.0 - threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append(
+            {
+                "name": name,
+                "status": status,
+                "ratio": ratio,
+                "baseline_ns": base["median_ns"],
+                "current_ns": result["median_ns"],
+            }
+        )
+    return rows
+
+
+def format_duration(nanoseconds: float) -> str:
+    """將奈秒格式化為易讀的時間"""
+    if nanoseconds >= 1_000_000:
+        return f"{nanoseconds / 1_000_000:.3f} ms"
+    if nanoseconds >= 1_000:
+        return f"{nanoseconds / 1_000:.2f} us"
+    return f"{nanoseconds:.0f} ns"
@@ -0,0 +1,183 @@
+"""
+浸泡測試
+以自動遊玩機器人連續進行多場遊戲，定期取樣記憶體與影格時間，
+用來發現長時間執行下的記憶體成長與效能衰退
+
+用法:
+    python -m benchmarks.soak [--hours 2] [--profile average] [--difficulty NORMAL]
+                              [--sample-seconds 60] [--realtime] [--output 檔案]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pygame
+
+from .harness import format_duration
+from .stress import current_rss_bytes
+
+from game.autoplay import SKILL_PROFILES, AutoplayBot
+from game.constants import FPS, GameState
+from game.headless import create_headless_engine, start_session
+
+SECONDS_PER_HOUR = 3600.0
+BYTES_PER_MB = 1_048_576
+
+
+def linear_slope(xs: List[float], ys: List[float]) -> float:
+    """以最小平方法計算斜率"""
+    if len(xs) < 2:
+        return 0.0
+    mean_x = statistics.fmean(xs)
+    mean_y = statistics.fmean(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return 0.0
+    return (
+        sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys, strict=True)) / variance
+    )
+
+
+def run_soak(engine, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    執行浸泡測試
+
+    Args:
+        engine: 遊戲引擎
+        args: 命令列參數
+
+    Returns:
+        List[Dict[str, Any]]: 各取樣點的量測結果
+    """
+    dt = 1.0 / FPS
+    total_frames = int(args.hours * SECONDS_PER_HOUR * FPS)
+    sample_frames = int(args.sample_seconds * FPS)
+
+    start_session(engine, args.difficulty)
+    sessions = 1
+    samples = []
+    frame_ns: List[int] = []
+    wall_start = time.perf_counter()
+
+    for frame in range(1, total_frames + 1):
+        if args.realtime:
+            engine.clock.tick(FPS)
+        engine.current_time += dt
+
+        frame_start = time.perf_counter_ns()
+        engine._handle_events()
+        engine._update(dt)
+        if args.render:
+            engine._render_frame()
+            pygame.display.flip()
+        frame_ns.append(time.perf_counter_ns() - frame_start)
+
+        # 結束後立即開始下一場，模擬連續遊玩
+        if engine.game_state == GameState["GAME_OVER"]:
+            start_session(engine, args.difficulty)
+            sessions += 1
+
+        if frame % sample_frames == 0:
+            frame_ns.sort()
+            sample = {
+                "game_hours": frame / FPS / SECONDS_PER_HOUR,
+                "wall_seconds": time.perf_counter() - wall_start,
+                "sessions": sessions,
+                "rss_bytes": current_rss_bytes(),
+                "arrows": len(engine.arrows),
+                "frame_mean_ns": statistics.fmean(frame_ns),
+                "frame_p99_ns": frame_ns[int(len(frame_ns) * 0.99)],
+            }
+            samples.append(sample)
+            frame_ns.clear()
+            rss = sample["rss_bytes"]
+            print(
+                f"{sample['game_hours']:>7.3f}h sessions={sessions:<5}"
+                f" rss={rss / BYTES_PER_MB if rss else float('nan'):.1f}MB"
+                f" frame mean={format_duration(sample['frame_mean_ns'])}"
+                f" p99={format_duration(sample['frame_p99_ns'])}"
+            )
+    return samples
+
+
+def summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """計算記憶體成長率與影格時間衰退"""
+    if not samples:
+        return {}
+
+    hours = [s["game_hours"] for s in samples]
+    summary: Dict[str, Any] = {
+        "sessions": samples[-1]["sessions"],
+        "frame_p99_first_ns": samples[0]["frame_p99_ns"],
+        "frame_p99_last_ns": samples[-1]["frame_p99_ns"],
+        "frame_p99_slope_ns_per_hour": linear_slope(
+            hours, [s["frame_p99_ns"] for s in samples]
+        ),
+    }
+    if all(s["rss_bytes"] for s in samples):
+        summary["rss_growth_mb_per_hour"] = (
+            linear_slope(hours, [s["rss_bytes"] for s in samples]) / BYTES_PER_MB
+        )
+    return summary
+
+
+def main() -> int:
+    """主程式入口"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.soak")
+    parser.add_argument("--hours", type=float, default=1.0, help="遊戲時間（小時）")
+    parser.add_argument("--profile", choices=sorted(SKILL_PROFILES), default="average")
+    parser.add_argument("--sigma", type=float, help="覆寫按鍵時機誤差標準差（秒）")
+    parser.add_argument("--miss-rate", type=float, help="覆寫放棄按鍵的機率")
+    parser.add_argument("--difficulty", default="NORMAL")
+    parser.add_argument("--sample-seconds", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--realtime", action="store_true", help="以實際 FPS 節奏執行（預設盡速模擬）"
+    )
+    parser.add_argument(
+        "--no-render", dest="render", action="store_false", help="只模擬不繪製"
+    )
+    parser.add_argument("--output", help="儲存結果的JSON路徑")
+    args = parser.parse_args()
+
+    profile = dict(SKILL_PROFILES[args.profile])
+    if args.sigma is not None:
+        profile["timing_sigma"] = args.sigma
+    if args.miss_rate is not None:
+        profile["miss_rate"] = args.miss_rate
+
+    engine = create_headless_engine()
+    if not engine.difficulty.is_difficulty_available(args.difficulty):
+        parser.error(f"未知的難度: {args.difficulty}")
+    engine.set_autoplay(AutoplayBot(**profile, seed=args.seed))
+
+    samples = run_soak(engine, args)
+    summary = summarize(samples)
+    if "rss_growth_mb_per_hour" in summary:
+        print(f"記憶體成長: {summary['rss_growth_mb_per_hour']:+.2f} MB/小時")
+    if summary:
+        print(
+            "影格 p99: "
+            f"{format_duration(summary['frame_p99_first_ns'])} -> "
+            f"{format_duration(summary['frame_p99_last_ns'])}"
+        )
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"profile": profile, "summary": summary, "samples": samples},
+                f,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
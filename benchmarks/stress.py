@@ -0,0 +1,173 @@
+"""
+壓力測試
+逐步提高箭頭密度，量測每個密度下的影格時間、模擬時間與記憶體用量，
+並回報無法再維持 60 FPS 的密度
+
+用法:
+    python -m benchmarks.stress [--start 10] [--max 800] [--factor 1.5]
+                                [--lanes 4] [--seconds 5] [--output 檔案]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pygame
+
+from .harness import format_duration
+
+from game.constants import FPS
+from game.headless import create_headless_engine, start_session
+
+FRAME_BUDGET_NS = 1_000_000_000 / FPS
+WARMUP_SECONDS = 2.0  # 讓箭頭佈滿畫面後才開始量測
+
+
+def current_rss_bytes() -> Optional[int]:
+    """取得目前行程的常駐記憶體（無法取得時回傳None）"""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+
+        # macOS 以位元組、Linux 以 KB 回報峰值
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+def run_density_step(
+    engine, notes_per_second: float, lanes: int, seconds: float
+) -> Dict[str, Any]:
+    """
+    以指定密度執行一段固定步長的遊戲並量測
+
+    Args:
+        engine: 遊戲引擎
+        notes_per_second: 每秒生成箭頭數
+        lanes: 軌道數
+        seconds: 量測的遊戲秒數
+
+    Returns:
+        Dict[str, Any]: 量測結果
+    """
+    engine.difficulty.configure_stress(notes_per_second, lanes)
+    start_session(engine, "STRESS")
+    dt = 1.0 / FPS
+
+    for _ in range(int(WARMUP_SECONDS * FPS)):
+        engine.current_time += dt
+        engine._update(dt)
+
+    frame_ns: List[int] = []
+    update_ns: List[int] = []
+    peak_arrows = 0
+    for _ in range(int(seconds * FPS)):
+        engine.current_time += dt
+        frame_start = time.perf_counter_ns()
+        engine._handle_events()
+        update_start = time.perf_counter_ns()
+        engine._update(dt)
+        update_end = time.perf_counter_ns()
+        engine._render_frame()
+        pygame.display.flip()
+        frame_end = time.perf_counter_ns()
+
+        update_ns.append(update_end - update_start)
+        frame_ns.append(frame_end - frame_start)
+        peak_arrows = max(peak_arrows, len(engine.arrows))
+
+    frame_ns.sort()
+    p95_frame = frame_ns[int(len(frame_ns) * 0.95)]
+    return {
+        "notes_per_second": notes_per_second,
+        "frame_mean_ns": statistics.fmean(frame_ns),
+        "frame_p95_ns": p95_frame,
+        "update_mean_ns": statistics.fmean(update_ns),
+        "update_max_ns": max(update_ns),
+        "peak_arrows": peak_arrows,
+        "rss_bytes": current_rss_bytes(),
+        "sustains_60fps": p95_frame <= FRAME_BUDGET_NS,
+    }
+
+
+def density_steps(start: float, maximum: float, factor: float) -> List[float]:
+    """產生等比遞增的密度序列"""
+    steps = []
+    density = start
+    while density <= maximum:
+        steps.append(round(density, 2))
+        density *= factor
+    return steps
+
+
+def main() -> int:
+    """主程式入口"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.stress")
+    parser.add_argument("--start", type=float, default=10.0, help="起始每秒箭頭數")
+    parser.add_argument("--max", type=float, default=800.0, help="最高每秒箭頭數")
+    parser.add_argument("--factor", type=float, default=1.5, help="每步密度倍率")
+    parser.add_argument("--lanes", type=int, default=4, help="軌道數 (1-4)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="每步量測秒數")
+    parser.add_argument("--output", help="儲存結果的JSON路徑")
+    parser.add_argument(
+        "--keep-going", action="store_true", help="超出影格預算後仍繼續提高密度"
+    )
+    args = parser.parse_args()
+
+    if not 1 <= args.lanes <= 4:
+        parser.error("--lanes 必須介於 1 到 4")
+
+    engine = create_headless_engine()
+    results = []
+    limit = None
+    print(
+        f"{'notes/s':>8} {'frame mean':>12} {'frame p95':>12}"
+        f" {'update':>12} {'arrows':>7} {'RSS MB':>8}"
+    )
+    for density in density_steps(args.start, args.max, args.factor):
+        result = run_density_step(engine, density, args.lanes, args.seconds)
+        results.append(result)
+        rss = result["rss_bytes"]
+        print(
+            f"{density:>8.1f} {format_duration(result['frame_mean_ns']):>12}"
+            f" {format_duration(result['frame_p95_ns']):>12}"
+            f" {format_duration(result['update_mean_ns']):>12}"
+            f" {result['peak_arrows']:>7}"
+            f" {rss / 1_048_576 if rss else float('nan'):>8.1f}"
+        )
+        if not result["sustains_60fps"] and limit is None:
+            limit = density
+            if not args.keep_going:
+                break
+
+    if limit is None:
+        print(f"所有密度皆可維持 {FPS} FPS（最高 {results[-1]['notes_per_second']}/s）")
+    else:
+        print(f"每秒 {limit} 支箭頭時影格 p95 超出 {FPS} FPS 預算")
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"lanes": args.lanes, "fps_limit_density": limit, "steps": results},
+                f,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+資源包建置工具
+將 assets/images 下的 PNG 轉為原始像素、assets/sounds/effects 下的 WAV
+轉為混音器格式 PCM，打包成單一資源包，啟動時由 AssetLoader 以 mmap 載入
+
+用法:
+    python scripts/build_asset_bundle.py [--assets src/assets] [--output PATH]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from utils.asset_bundle import AssetBundleWriter
+from utils.asset_loader import AssetLoader
+from utils.config import Config
+
+IMAGE_PATTERNS = ("*.png", "*.jpg", "*.bmp")
+SOUND_PATTERNS = ("*.wav", "*.ogg")
+# 只打包音效；sounds/music 下的歌曲由 pygame.mixer.music 串流播放，
+# 轉成 PCM 會讓資源包膨脹數百 MB 且永遠不會被讀取
+SOUND_SUBFOLDERS = ("effects",)
+
+
+def collect_files(root: Path, patterns) -> list:
+    """遞迴收集符合樣式的檔案（依路徑排序，確保輸出穩定）"""
+    files = set()
+    for pattern in patterns:
+        files.update(root.rglob(pattern))
+    return sorted(files)
+
+
+def collect_sounds(sounds_dir: Path) -> list:
+    """收集要打包的音效（只含 SOUND_SUBFOLDERS 下的檔案）"""
+    files = []
+    for subfolder in SOUND_SUBFOLDERS:
+        files.extend(collect_files(sounds_dir / subfolder, SOUND_PATTERNS))
+    return files
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="建置預先轉換的資源包")
+    parser.add_argument("--assets", default="src/assets", help="資源目錄")
+    parser.add_argument("--output", help="輸出檔案（預設為資源目錄下的資源包）")
+    args = parser.parse_args()
+
+    assets_dir = Path(args.assets)
+    output = Path(args.output) if args.output else assets_dir / AssetLoader.BUNDLE_FILE
+
+    pygame.init()
+    # 以遊戲相同的設定初始化混音器，確保 PCM 格式一致
+    loader = AssetLoader(str(assets_dir), audio_config=Config().get_audio_config())
+    if loader.bundle is not None:
+        loader.bundle.close()
+        loader.bundle = None
+    writer = AssetBundleWriter(pygame.mixer.get_init())
+
+    start = time.perf_counter()
+    image_count = sound_count = 0
+
+    images_dir = assets_dir / "images"
+    for file_path in collect_files(images_dir, IMAGE_PATTERNS):
+        key = file_path.relative_to(images_dir).as_posix()
+        try:
+            writer.add_image(key, pygame.image.load(str(file_path)), file_path)
+            image_count += 1
+        except pygame.error as e:
+            print(f"略過圖片 {key}: {e}")
+
+    sounds_dir = assets_dir / "sounds"
+    for file_path in collect_sounds(sounds_dir):
+        key = file_path.relative_to(sounds_dir).as_posix()
+        try:
+            writer.add_sound(key, pygame.mixer.Sound(str(file_path)), file_path)
+            sound_count += 1
+        except pygame.error as e:
+            print(f"略過音效 {key}: {e}")
+
+    if not writer.write(output):
+        return 1
+
+    elapsed = time.perf_counter() - start
+    size_mb = output.stat().st_size / (1024 * 1024)
+    print(
+        f"已建置 {output}: {image_count} 張圖片, {sound_count} 個音效, "
+        f"{size_mb:.2f} MB ({elapsed:.2f}s)"
+    )
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+難度參數掃描工具
+對參數網格與模擬玩家技巧設定的每個組合，以行程池平行執行大量無頭遊戲，
+彙整分數、準確率與提前結束（失誤過多）比例
+
+用法:
+    python scripts/difficulty_sweep.py --spawn-interval 0.6,0.8,1.0 \\
+        --arrow-speed 120,150,180 --profiles expert,average,beginner \\
+        --sessions 200 [--workers 8] [--output sweep.csv]
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.autoplay import SKILL_PROFILES, AutoplayBot
+from game.constants import FPS, MAX_MISSES, GameState
+from game.headless import create_headless_engine, start_session
+
+SWEEP_DIFFICULTY = "SWEEP"
+PARAMETERS = ("spawn_interval", "arrow_speed", "score_multiplier")
+
+# 每個工作行程各自持有一個引擎，避免每場重新初始化 pygame 與資源
+_engine = None
+
+
+def _init_worker() -> None:
+    """工作行程初始化"""
+    global _engine
+    _engine = create_headless_engine()
+
+
+def run_sessions(
+    params: Dict[str, float], profile: str, seeds: List[int], dt: float
+) -> List[Tuple[int, float, bool]]:
+    """
+    在工作行程中執行多場模擬遊戲
+
+    Args:
+        params: 難度參數
+        profile: 技巧設定名稱
+        seeds: 每場的亂數種子
+        dt: 模擬時間步長（秒）
+
+    Returns:
+        List[Tuple[int, float, bool]]: 每場的（分數, 準確率, 是否因失誤過多結束）
+    """
+    engine = _engine
+    engine.difficulty.define_difficulty(SWEEP_DIFFICULTY, **params)
+
+    results = []
+    for seed in seeds:
+        random.seed(seed)
+        engine.set_autoplay(AutoplayBot.from_profile(profile, seed=seed))
+        start_session(engine, SWEEP_DIFFICULTY)
+        while engine.game_state == GameState["PLAYING"]:
+            engine.current_time += dt
+            engine._handle_events()
+            engine._update(dt)
+
+        results.append(
+            (
+                engine.score.total_score,
+                engine.score.get_accuracy(),
+                engine.score.miss_count >= MAX_MISSES,
+            )
+        )
+    return results
+
+
+def summarize(results: List[Tuple[int, float, bool]]) -> Dict[str, float]:
+    """彙整同一組合的多場結果"""
+    scores = sorted(r[0] for r in results)
+    accuracies = [r[1] for r in results]
+    return {
+        "sessions": len(results),
+        "score_mean": statistics.fmean(scores),
+        "score_stdev": statistics.pstdev(scores),
+        "score_p10": scores[int(len(scores) * 0.1)],
+        "score_p50": scores[len(scores) // 2],
+        "score_p90": scores[min(len(scores) - 1, int(len(scores) * 0.9))],
+        "accuracy_mean": statistics.fmean(accuracies),
+        "accuracy_min": min(accuracies),
+        "game_over_rate": sum(r[2] for r in results) / len(results),
+    }
+
+
+def parse_values(text: str) -> List[float]:
+    """解析以逗號分隔的數值"""
+    return [float(value) for value in text.split(",") if value]
+
+
+def main() -> int:
+    """主程式入口"""
+    parser = argparse.ArgumentParser(description="難度參數掃描")
+    parser.add_argument("--spawn-interval", type=parse_values, default=[1.0])
+    parser.add_argument("--arrow-speed", type=parse_values, default=[150.0])
+    parser.add_argument("--score-multiplier", type=parse_values, default=[1.0])
+    parser.add_argument("--profiles", default="expert,average,beginner")
+    parser.add_argument("--sessions", type=int, default=100, help="每個組合的場數")
+    parser.add_argument("--chunk", type=int, default=10, help="每個工作項目的場數")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--dt", type=float, default=1.0 / FPS, help="模擬時間步長")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="輸出CSV路徑")
+    args = parser.parse_args()
+
+    profiles = args.profiles.split(",")
+    unknown = [p for p in profiles if p not in SKILL_PROFILES]
+    if unknown:
+        parser.error(f"未知的技巧設定: {', '.join(unknown)}")
+
+    grid = [
+        dict(zip(PARAMETERS, values, strict=True))
+        for values in itertools.product(
+            args.spawn_interval, args.arrow_speed, args.score_multiplier
+        )
+    ]
+    combos = [(params, profile) for params in grid for profile in profiles]
+    print(f"{len(combos)} 個組合 x {args.sessions} 場，使用 {args.workers} 個工作行程")
+
+    collected: Dict[int, List[Tuple[int, float, bool]]] = {
+        i: [] for i in range(len(combos))
+    }
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init_worker
+    ) as executor:
+        futures = {}
+        for index, (params, profile) in enumerate(combos):
+            seeds = [
+                args.seed + index * args.sessions + n for n in range(args.sessions)
+            ]
+            for offset in range(0, len(seeds), args.chunk):
+                chunk = seeds[offset : offset + args.chunk]
+                future = executor.submit(run_sessions, params, profile, chunk, args.dt)
+                futures[future] = index
+
+        for future in as_completed(futures):
+            collected[futures[future]].extend(future.result())
+
+    elapsed = time.perf_counter() - start
+    total_sessions = len(combos) * args.sessions
+    print(f"完成 {total_sessions} 場，耗時 {elapsed:.1f} 秒\n")
+
+    rows: List[Dict[str, Any]] = []
+    for index, (params, profile) in enumerate(combos):
+        rows.append({**params, "profile": profile, **summarize(collected[index])})
+
+    header = (
+        f"{'interval':>8} {'speed':>6} {'mult':>5} {'profile':<9}"
+        f" {'score p50':>9} {'p10-p90':>13} {'acc%':>6} {'fail%':>6}"
+    )
+    print(header)
+    for row in rows:
+        print(
+            f"{row['spawn_interval']:>8.2f} {row['arrow_speed']:>6.0f}"
+            f" {row['score_multiplier']:>5.2f} {row['profile']:<9}"
+            f" {row['score_p50']:>9}"
+            f" {str(row['score_p10']) + '-' + str(row['score_p90']):>13}"
+            f" {row['accuracy_mean']:>6.1f} {row['game_over_rate'] * 100:>6.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\n結果已儲存: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,42 +1,68 @@
-from PIL import Image
-import os
-
-def remove_checkered_background(file_path):
-    print(f"Processing {file_path}...")
-    img = Image.open(file_path).convert("RGBA")
-    datas = img.getdata()
-
-    new_data = []
-    for item in datas:
-        # Checkered pattern often consists of light gray and dark gray pixels
-        # Typically around (128, 128, 128) and (192, 192, 192) or (153, 153, 153) etc.
-        # We can also detect if R==G==B and they are not too dark or too light (likely background)
-        # Or better: just remove anything that isn't the arrow's core color.
-        # But a safer bet is to remove the specific shades of the checkered board.
-        
-        r, g, b, a = item
-        
-        # Detect gray/white checkered pattern
-        # Common checkered shades: (102,102,102), (153,153,153)
-        if (abs(r - g) < 5 and abs(g - b) < 5 and abs(r - b) < 5):
-             # It's a gray pixel. Most likely background if it's not part of the arrow's neon glow.
-             # In the screenshots, the background is a gray/dark-gray checker.
-             # We should avoid removing the arrow colors. 
-             # Blue arrow has high B, Green has high G, etc.
-             
-             # If it's very balanced gray, it's likely the background.
-             new_data.append((r, g, b, 0))
-        else:
-            new_data.append(item)
-
-    img.putdata(new_data)
-    img.save(file_path, "PNG")
-    print(f"Saved {file_path}")
-
-base_dir = "/Users/roger/Desktop/testOpencode_antigravity/dance-game/src/assets/images/arrows"
-files = ["arrow_left.png", "arrow_up.png", "arrow_down.png", "arrow_right.png"]
-
-for f in files:
-    full_path = os.path.join(base_dir, f)
-    if os.path.exists(full_path):
-        remove_checkered_background(full_path)
+#!/usr/bin/env python3
+"""
+精靈圖去背工具
+移除圖片中與邊框相連的灰色棋盤格背景並羽化邊緣，以行程池平行處理整個資源目錄；
+內容未變更的圖片依清單（快取目錄下的 sprite_alpha.json）略過
+
+用法:
+    python scripts/fix_transparency.py [目錄 ...] [--output DIR] [--tolerance 6]
+        [--feather 1] [--workers 8] [--force]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.cache import get_cache_dir
+from utils.sprite_alpha import DEFAULT_FEATHER, DEFAULT_TOLERANCE, SpriteAlphaProcessor
+
+
+def main() -> int:
+    """主程式入口"""
+    parser = argparse.ArgumentParser(description="移除精靈圖的灰色棋盤格背景")
+    parser.add_argument(
+        "directories",
+        nargs="*",
+        default=["src/assets/images"],
+        help="圖片目錄（遞迴處理，預設為 src/assets/images）",
+    )
+    parser.add_argument("--output", help="輸出目錄（預設覆寫來源圖片）")
+    parser.add_argument(
+        "--tolerance", type=int, default=DEFAULT_TOLERANCE, help="灰色判定容許誤差"
+    )
+    parser.add_argument(
+        "--feather", type=int, default=DEFAULT_FEATHER, help="邊緣羽化寬度（像素）"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="工作行程數")
+    parser.add_argument("--force", action="store_true", help="忽略清單全部重新處理")
+    args = parser.parse_args()
+
+    processor = SpriteAlphaProcessor(
+        get_cache_dir(SpriteAlphaProcessor.MANIFEST_FILE),
+        tolerance=args.tolerance,
+        feather=args.feather,
+    )
+    processor.load()
+
+    start = time.perf_counter()
+    stats = processor.run(
+        [Path(directory) for directory in args.directories],
+        output_dir=Path(args.output) if args.output else None,
+        workers=args.workers,
+        force=args.force,
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"共 {stats['total']} 張："
+        f"處理 {stats['processed']}（去背 {stats['changed']}）、"
+        f"略過 {stats['skipped']}、失敗 {stats['failed']}，耗時 {elapsed:.2f} 秒"
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+程序化歌曲庫產生工具
+以行程池平行產生多首長篇歌曲（WAV）與對齊節拍的譜面，供負載測試使用
+
+用法:
+    python scripts/generate_songs.py --count 50 --minutes 3 \\
+        --bpm-min 90 --bpm-max 180 [--output generated_songs] [--workers 8]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Tuple
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.chart import Chart
+from game.song_generator import SongGenerator
+from game.synth import DEFAULT_SAMPLE_RATE
+
+
+def generate_song(
+    output_dir: str, index: int, bpm: float, minutes: float, seed: int, sample_rate: int
+) -> Tuple[str, int, float]:
+    """
+    在工作行程中產生一首歌曲與譜面
+
+    Returns:
+        Tuple[str, int, float]: (WAV 路徑, 音符數, 歌曲長度秒數)
+    """
+    wav_path = Path(output_dir) / f"song_{index:04d}_{bpm:.0f}bpm.wav"
+    generator = SongGenerator.for_duration(
+        bpm, minutes, seed=seed, sample_rate=sample_rate
+    )
+    chart = generator.render(wav_path, Chart.sidecar_path(wav_path))
+    return str(wav_path), chart.note_count, chart.duration
+
+
+def main() -> int:
+    """主程式入口"""
+    parser = argparse.ArgumentParser(description="產生程序化歌曲庫")
+    parser.add_argument("--count", type=int, default=10, help="歌曲數量")
+    parser.add_argument("--minutes", type=float, default=3.0, help="每首長度（分鐘）")
+    parser.add_argument("--bpm-min", type=float, default=90.0)
+    parser.add_argument("--bpm-max", type=float, default=180.0)
+    parser.add_argument("--sample-rate", type=int, default=DEFAULT_SAMPLE_RATE)
+    parser.add_argument("--output", default="generated_songs", help="輸出目錄")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.bpm_min <= 0 or args.bpm_max < args.bpm_min:
+        parser.error("BPM 範圍不合法")
+
+    rng = random.Random(args.seed)
+    jobs = [
+        (index, round(rng.uniform(args.bpm_min, args.bpm_max)), args.seed + index)
+        for index in range(args.count)
+    ]
+    print(f"產生 {args.count} 首歌曲至 {args.output}，使用 {args.workers} 個工作行程")
+
+    start = time.perf_counter()
+    total_seconds = 0.0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(
+                generate_song,
+                args.output,
+                index,
+                bpm,
+                args.minutes,
+                seed,
+                args.sample_rate,
+            )
+            for index, bpm, seed in jobs
+        ]
+        for future in as_completed(futures):
+            wav_path, note_count, duration = future.result()
+            total_seconds += duration
+            print(f"  {wav_path}: {duration:.0f}s, {note_count} 個音符")
+
+    elapsed = time.perf_counter() - start
+    print(f"完成，共 {total_seconds / 60:.1f} 分鐘音訊，耗時 {elapsed:.1f} 秒")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
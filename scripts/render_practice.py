@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+練習音訊預先產生工具
+以行程池為歌曲庫中的歌曲產生練習速率的變速音訊（WSOLA），遊戲中選擇練習速率時可立即開始
+（速率預設取自 config.json 的 practice.rates）
+
+用法:
+    python scripts/render_practice.py [--rates 0.75 0.9] [--workers 8]
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import as_completed
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.engine import GameEngine
+from game.practice import PracticeRenderer
+from game.song_library import SongLibrary
+from utils.cache import get_cache_dir
+from utils.config import Config
+
+
+def main() -> int:
+    """主程式入口"""
+    config = Config()
+    parser = argparse.ArgumentParser(description="預先產生練習速率的變速音訊")
+    parser.add_argument(
+        "--rates",
+        type=float,
+        nargs="+",
+        default=config.get_practice_config().get("rates", []),
+        help="播放速率",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="工作行程數")
+    args = parser.parse_args()
+
+    rates = [rate for rate in args.rates if 0 < rate != 1.0]
+    if not rates:
+        parser.error("沒有需要產生的速率")
+
+    library = SongLibrary.from_config(
+        config.get_library_config(),
+        Path("src/assets/sounds/music"),
+        exclude=[GameEngine.BACKGROUND_MUSIC],
+    )
+    if not library.load():
+        library.scan(workers=args.workers, analyze=False)
+    songs = [song for song in library.songs if song.playable]
+    print(f"為 {len(songs)} 首歌曲產生 {len(rates)} 種速率的練習音訊")
+
+    start = time.perf_counter()
+    renderer = PracticeRenderer(get_cache_dir("practice"), workers=args.workers)
+    jobs = {
+        renderer.submit(Path(song.path), rate, song.digest): (song, rate)
+        for song in songs
+        for rate in rates
+    }
+    failed = 0
+    for job in as_completed(jobs):
+        song, rate = jobs[job]
+        if job.exception() or job.result() is None:
+            failed += 1
+            print(f"  {song.title} {rate:g}x: 失敗")
+        else:
+            print(f"  {song.title} {rate:g}x")
+    renderer.shutdown()
+
+    elapsed = time.perf_counter() - start
+    print(f"完成 {len(jobs) - failed}/{len(jobs)}，耗時 {elapsed:.1f} 秒")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+歌曲庫掃描工具
+以行程池平行擷取歌曲資訊並分析 BPM，更新遊戲使用的歌曲庫索引
+（掃描內建音樂目錄與 config.json 中 library.music_dirs 列出的目錄）
+
+用法:
+    python scripts/scan_library.py [--workers 8] [--no-analyze]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.engine import GameEngine
+from game.song_library import SongLibrary
+from utils.config import Config
+
+
+def main() -> int:
+    """主程式入口"""
+    parser = argparse.ArgumentParser(description="掃描歌曲庫並更新索引")
+    parser.add_argument("--workers", type=int, default=None, help="工作行程數")
+    parser.add_argument("--no-analyze", action="store_true", help="不分析 BPM")
+    args = parser.parse_args()
+
+    library = SongLibrary.from_config(
+        Config().get_library_config(),
+        Path("src/assets/sounds/music"),
+        exclude=[GameEngine.BACKGROUND_MUSIC],
+    )
+    library.load()
+
+    start = time.perf_counter()
+    stats = library.scan(workers=args.workers, analyze=not args.no_analyze)
+    elapsed = time.perf_counter() - start
+    print(
+        f"共 {stats['total']} 首：重新擷取 {stats['scanned']}、"
+        f"沿用 {stats['unchanged']}、移除 {stats['removed']}，耗時 {elapsed:.2f} 秒"
+    )
+    print(f"索引: {library.index_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
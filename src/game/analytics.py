@@ -0,0 +1,331 @@
+"""
+時機誤差分析
+以向量化方式統計整場遊戲的判定時機誤差分佈
+"""
+
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.persistence import atomic_write
+
+from .constants import ARROW_DIRECTIONS
+
+# 判定等級對應的代碼（存入 int8 陣列）
+JUDGMENT_CODES = {"PERFECT": 0, "GOOD": 1, "MISS": 2, "MISS_FAR": 3}
+JUDGMENT_NAMES = {code: name for name, code in JUDGMENT_CODES.items()}
+LANE_NAMES = {index: direction for direction, index in ARROW_DIRECTIONS.items()}
+
+MS_PER_SECOND = 1000.0
+SECONDS_PER_MINUTE = 60.0
+
+
+class JudgmentLog:
+    """
+    整場遊戲的判定記錄
+
+    以預先配置的 NumPy 陣列儲存，容量不足時倍增，
+    記錄時不產生任何 Python 物件。
+    時機誤差為有號秒數：負值表示提早按下，正值表示延遲按下；
+    未按下而錯過的箭頭誤差記為 NaN。
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.count = 0
+        self._times = np.empty(capacity, dtype=np.float64)
+        self._errors = np.empty(capacity, dtype=np.float64)
+        self._lanes = np.empty(capacity, dtype=np.int8)
+        self._judgments = np.empty(capacity, dtype=np.int8)
+
+    def record(self, time: float, direction: str, error: float, judgment: str) -> None:
+        """
+        記錄一次判定
+
+        Args:
+            time: 判定發生時的遊戲時間（秒）
+            direction: 箭頭方向
+            error: 有號時機誤差（秒），錯過時為 NaN
+            judgment: 判定等級
+        """
+        if self.count == len(self._times):
+            self._grow()
+
+        index = self.count
+        self._times[index] = time
+        self._errors[index] = error
+        self._lanes[index] = ARROW_DIRECTIONS[direction]
+        self._judgments[index] = JUDGMENT_CODES[judgment]
+        self.count += 1
+
+    def _grow(self) -> None:
+        """容量倍增"""
+        capacity = len(self._times) * 2
+        self._times = np.resize(self._times, capacity)
+        self._errors = np.resize(self._errors, capacity)
+        self._lanes = np.resize(self._lanes, capacity)
+        self._judgments = np.resize(self._judgments, capacity)
+
+    def reset(self) -> None:
+        """清除記錄（保留已配置的容量）"""
+        self.count = 0
+
+    def copy(self) -> "JudgmentLog":
+        """
+        複製目前的記錄（交給背景執行緒匯出時使用，之後的記錄不影響副本）
+
+        Returns:
+            JudgmentLog: 記錄副本
+        """
+        snapshot = JudgmentLog(max(self.count, 1))
+        snapshot._times[: self.count] = self.times
+        snapshot._errors[: self.count] = self.errors
+        snapshot._lanes[: self.count] = self.lanes
+        snapshot._judgments[: self.count] = self.judgments
+        snapshot.count = self.count
+        return snapshot
+
+    @property
+    def times(self) -> np.ndarray:
+        """判定時間陣列（唯讀視圖）"""
+        return self._times[: self.count]
+
+    @property
+    def errors(self) -> np.ndarray:
+        """有號時機誤差陣列（秒）"""
+        return self._errors[: self.count]
+
+    @property
+    def lanes(self) -> np.ndarray:
+        """軌道索引陣列"""
+        return self._lanes[: self.count]
+
+    @property
+    def judgments(self) -> np.ndarray:
+        """判定代碼陣列"""
+        return self._judgments[: self.count]
+
+
+class TimingAnalytics:
+    """時機誤差統計類別"""
+
+    PERCENTILES = (50, 95, 99)
+    HISTOGRAM_RANGE_MS = 200.0  # 直方圖範圍 ±200ms
+    HISTOGRAM_BINS = 20
+    DRIFT_SEGMENTS = 8  # 將整場時間切成的區段數
+
+    def compute(self, log: JudgmentLog) -> Dict[str, Any]:
+        """
+        計算時機誤差分佈
+
+        Args:
+            log: 判定記錄
+
+        Returns:
+            Dict[str, Any]: 統計結果（毫秒為單位），無有效判定時數值欄位為 None
+        """
+        errors = log.errors
+        valid = ~np.isnan(errors)
+        errors_ms = errors[valid] * MS_PER_SECOND
+        times = log.times[valid]
+        lanes = log.lanes[valid]
+        sample_count = int(errors_ms.size)
+
+        stats: Dict[str, Any] = {
+            "judgment_count": log.count,
+            "sample_count": sample_count,
+            "unjudged_miss_count": log.count - sample_count,
+            "mean_ms": None,
+            "stddev_ms": None,
+            "percentiles_ms": {},
+            "abs_percentiles_ms": {},
+            "early_count": 0,
+            "late_count": 0,
+            "lane_bias_ms": {},
+            "drift_ms_per_minute": None,
+            "drift_segments_ms": [],
+            "histogram": {"edges_ms": [], "counts": []},
+        }
+        if sample_count == 0:
+            return stats
+
+        stats["mean_ms"] = float(errors_ms.mean())
+        stats["stddev_ms"] = float(errors_ms.std())
+        stats["early_count"] = int(np.count_nonzero(errors_ms < 0))
+        stats["late_count"] = int(np.count_nonzero(errors_ms > 0))
+
+        signed = self._sorted_percentiles(np.sort(errors_ms))
+        absolute = self._sorted_percentiles(np.sort(np.abs(errors_ms)))
+        stats["percentiles_ms"] = {
+            f"p{p}": float(v) for p, v in zip(self.PERCENTILES, signed, strict=True)
+        }
+        stats["abs_percentiles_ms"] = {
+            f"p{p}": float(v) for p, v in zip(self.PERCENTILES, absolute, strict=True)
+        }
+
+        stats["lane_bias_ms"] = self._lane_bias(errors_ms, lanes)
+        stats["drift_ms_per_minute"] = self._drift_slope(errors_ms, times)
+        stats["drift_segments_ms"] = self._drift_segments(errors_ms, times)
+
+        stats["histogram"] = self._histogram(errors_ms)
+        return stats
+
+    def _sorted_percentiles(self, sorted_values: np.ndarray) -> np.ndarray:
+        """
+        從已排序陣列以線性內插取百分位數
+
+        與 np.percentile 結果相同，但只需排序一次，避免每個百分位數重複分割。
+        """
+        positions = np.asarray(self.PERCENTILES, dtype=np.float64) / 100.0
+        positions *= sorted_values.size - 1
+        lower = np.floor(positions).astype(np.intp)
+        upper = np.minimum(lower + 1, sorted_values.size - 1)
+        fraction = positions - lower
+        return (
+            sorted_values[lower]
+            + (sorted_values[upper] - sorted_values[lower]) * fraction
+        )
+
+    def _histogram(self, errors_ms: np.ndarray) -> Dict[str, List]:
+        """以固定範圍等寬分箱計算誤差直方圖（超出範圍者歸入兩端）"""
+        bins = self.HISTOGRAM_BINS
+        span = 2.0 * self.HISTOGRAM_RANGE_MS
+        indices = ((errors_ms + self.HISTOGRAM_RANGE_MS) * (bins / span)).astype(
+            np.intp
+        )
+        np.clip(indices, 0, bins - 1, out=indices)
+        counts = np.bincount(indices, minlength=bins)
+        edges = np.linspace(-self.HISTOGRAM_RANGE_MS, self.HISTOGRAM_RANGE_MS, bins + 1)
+        return {"edges_ms": edges.tolist(), "counts": counts.tolist()}
+
+    def _lane_bias(
+        self, errors_ms: np.ndarray, lanes: np.ndarray
+    ) -> Dict[str, Optional[float]]:
+        """計算各軌道的平均誤差"""
+        lane_count = len(ARROW_DIRECTIONS)
+        counts = np.bincount(lanes, minlength=lane_count)
+        sums = np.bincount(lanes, weights=errors_ms, minlength=lane_count)
+        return {
+            LANE_NAMES[lane]: (
+                float(sums[lane] / counts[lane]) if counts[lane] else None
+            )
+            for lane in range(lane_count)
+        }
+
+    def _drift_slope(self, errors_ms: np.ndarray, times: np.ndarray) -> float:
+        """以最小平方法計算誤差隨時間的漂移（毫秒/分鐘）"""
+        centered_times = times - times.mean()
+        variance = float(np.dot(centered_times, centered_times))
+        if variance == 0.0:
+            return 0.0
+        slope = float(np.dot(centered_times, errors_ms - errors_ms.mean())) / variance
+        return slope * SECONDS_PER_MINUTE
+
+    def _drift_segments(
+        self, errors_ms: np.ndarray, times: np.ndarray
+    ) -> List[Optional[float]]:
+        """將整場時間等分成區段，計算各區段的平均誤差"""
+        start = times.min()
+        span = times.max() - start
+        if span <= 0:
+            segments = np.zeros(times.size, dtype=np.intp)
+        else:
+            segments = ((times - start) / span * self.DRIFT_SEGMENTS).astype(np.intp)
+            np.minimum(segments, self.DRIFT_SEGMENTS - 1, out=segments)
+
+        counts = np.bincount(segments, minlength=self.DRIFT_SEGMENTS)
+        sums = np.bincount(segments, weights=errors_ms, minlength=self.DRIFT_SEGMENTS)
+        return [
+            float(sums[i] / counts[i]) if counts[i] else None
+            for i in range(self.DRIFT_SEGMENTS)
+        ]
+
+    def encode_json(self, stats: Dict[str, Any], breakdown: Dict[str, Any]) -> bytes:
+        """
+        將統計結果編碼為JSON
+
+        Args:
+            stats: compute() 的結果
+            breakdown: Score.get_score_breakdown() 的結果
+
+        Returns:
+            bytes: UTF-8 JSON 內容
+        """
+        return json.dumps(
+            {"score": breakdown, "timing": stats}, indent=2, ensure_ascii=False
+        ).encode("utf-8")
+
+    def encode_csv(self, log: JudgmentLog) -> bytes:
+        """
+        將逐筆判定記錄編碼為CSV
+
+        Args:
+            log: 判定記錄
+
+        Returns:
+            bytes: UTF-8 CSV 內容
+        """
+        errors_ms = log.errors * MS_PER_SECOND
+        buffer = io.StringIO(newline="")
+        writer = csv.writer(buffer)
+        writer.writerow(["time_s", "lane", "judgment", "error_ms"])
+        for time, lane, judgment, error in zip(
+            log.times.tolist(),
+            log.lanes.tolist(),
+            log.judgments.tolist(),
+            errors_ms.tolist(),
+            strict=True,
+        ):
+            writer.writerow(
+                [
+                    f"{time:.4f}",
+                    LANE_NAMES[lane],
+                    JUDGMENT_NAMES[judgment],
+                    "" if error != error else f"{error:.2f}",
+                ]
+            )
+        return buffer.getvalue().encode("utf-8")
+
+    def export_json(
+        self, stats: Dict[str, Any], breakdown: Dict[str, Any], file_path: Path
+    ) -> bool:
+        """
+        匯出統計結果為JSON
+
+        Args:
+            stats: compute() 的結果
+            breakdown: Score.get_score_breakdown() 的結果
+            file_path: 匯出檔案路徑
+
+        Returns:
+            bool: 匯出是否成功
+        """
+        try:
+            atomic_write(file_path, self.encode_json(stats, breakdown))
+            return True
+        except Exception as e:
+            print(f"匯出統計失敗: {e}")
+            return False
+
+    def export_csv(self, log: JudgmentLog, file_path: Path) -> bool:
+        """
+        匯出逐筆判定記錄為CSV
+
+        Args:
+            log: 判定記錄
+            file_path: 匯出檔案路徑
+
+        Returns:
+            bool: 匯出是否成功
+        """
+        try:
+            atomic_write(file_path, self.encode_csv(log))
+            return True
+        except Exception as e:
+            print(f"匯出判定記錄失敗: {e}")
+            return False
@@ -31,6 +31,7 @@ class Arrow:
         y: float,
         speed: float,
         image: Optional[pygame.Surface] = None,
+        keysound: str = "",
     ):
         self.direction = direction  # LEFT, DOWN, UP, RIGHT
         self.x = x
@@ -40,6 +41,7 @@ class Arrow:
         self.height = ARROW_HEIGHT
         self.hit = False  # 是否已被擊中
         self.missed = False  # 是否已錯過
+        self.keysound = keysound  # 擊中時播放的按鍵音樣本名稱
 
         # 圖片處理
         self.image = None
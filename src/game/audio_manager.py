@@ -4,13 +4,42 @@
 """
 
 import pygame
+from pathlib import Path
 from typing import Optional
 from utils.asset_loader import AssetLoader
+from utils.settings import AudioSettings
+
+from .sfx_channels import SfxChannelManager
+from .synth import synthesize_sfx
 
 
 class AudioManager:
     """音效管理器類別"""
 
+    SFX_SUBFOLDER = "effects"
+    SFX_FILES = {
+        "perfect": "perfect.wav",
+        "good": "good.wav",
+        "miss": "miss.wav",
+        "combo": "combo.wav",
+    }
+
+    # 各類音效保留的聲道數
+    SFX_CHANNELS = {"judgment": 4, "combo": 2, "keysound": 16}
+
+    # 選歌試聽保留的聲道數（兩個聲道交替使用以交叉淡入淡出）
+    PREVIEW_CHANNELS = 2
+    # 練習模式段落循環使用的聲道數
+    SECTION_CHANNELS = 1
+
+    # 音效對應的（類別, 優先權），同類聲道用盡時優先權高的可搶占低的
+    SFX_ROUTING = {
+        "perfect": ("judgment", 1),
+        "good": ("judgment", 1),
+        "miss": ("judgment", 2),
+        "combo": ("combo", 1),
+    }
+
     def __init__(self, asset_loader: AssetLoader):
         self.asset_loader = asset_loader
         self.current_music = None
@@ -19,38 +48,58 @@ class AudioManager:
 
         # 預載入音效檔案
         self._load_sfx()
+        self.channels = SfxChannelManager(self.SFX_CHANNELS)
+        self.preview_channels = self.channels.add_category(
+            "preview", self.PREVIEW_CHANNELS
+        ).channels
+        self.section_channel = self.channels.add_category(
+            "section", self.SECTION_CHANNELS
+        ).channels[0]
 
     def _load_sfx(self) -> None:
-        """預載入音效檔案"""
-        self.sfx = {
-            "perfect": self.asset_loader.load_sound("perfect.wav", "effects"),
-            "good": self.asset_loader.load_sound("good.wav", "effects"),
-            "miss": self.asset_loader.load_sound("miss.wav", "effects"),
-            "combo": self.asset_loader.load_sound("combo.wav", "effects"),
-        }
+        """預載入音效檔案，缺少或無法解碼的音效改為即時合成"""
+        self.sfx = {}
+        for name, filename in self.SFX_FILES.items():
+            sound = self.asset_loader.load_sound(filename, self.SFX_SUBFOLDER, pin=True)
+            if self.asset_loader.is_fallback_sound(filename, self.SFX_SUBFOLDER):
+                synthesized = synthesize_sfx(name)
+                if synthesized is not None:
+                    # 放回資源快取，之後載入同一音效不需重新合成
+                    self.asset_loader.replace_sound(
+                        filename, self.SFX_SUBFOLDER, synthesized
+                    )
+                    sound = synthesized
+            self.sfx[name] = sound
 
         # 設定音效音量（載入成功才設定）
         for sfx in self.sfx.values():
             if sfx:
                 sfx.set_volume(self.sfx_volume)
 
-    def play_music(self, music_file: str, loop: bool = True) -> bool:
+    def play_music(
+        self, music_file: str, loop: bool = True, start: float = 0.0
+    ) -> bool:
         """
         播放背景音樂
 
         Args:
-            music_file: 音樂檔案名稱
+            music_file: 音樂檔案名稱（sounds/music 下），或歌曲庫中的完整路徑
             loop: 是否循環播放
+            start: 開始播放的位置（秒）
 
         Returns:
             bool: 播放是否成功
         """
         try:
-            music_path = self.asset_loader.base_path / "sounds" / "music" / music_file
+            music_path = Path(music_file)
+            if not music_path.is_absolute():
+                music_path = (
+                    self.asset_loader.base_path / "sounds" / "music" / music_file
+                )
             if music_path.exists():
                 pygame.mixer.music.load(str(music_path))
                 pygame.mixer.music.set_volume(self.music_volume)
-                pygame.mixer.music.play(-1 if loop else 0)
+                pygame.mixer.music.play(-1 if loop else 0, start=start)
                 self.current_music = music_file
                 return True
             return False
@@ -59,18 +108,33 @@ class AudioManager:
             return False
 
     def stop_music(self) -> None:
-        """停止背景音樂"""
+        """停止背景音樂與練習段落"""
         pygame.mixer.music.stop()
+        self.section_channel.stop()
         self.current_music = None
 
     def pause_music(self) -> None:
-        """暫停背景音樂"""
+        """暫停背景音樂與練習段落"""
         pygame.mixer.music.pause()
+        self.section_channel.pause()
 
     def resume_music(self) -> None:
-        """恢復背景音樂"""
+        """恢復背景音樂與練習段落"""
         if self.current_music:
             pygame.mixer.music.unpause()
+        self.section_channel.unpause()
+
+    def play_section(self, sound: pygame.mixer.Sound) -> None:
+        """
+        以段落聲道從頭播放預先切好的練習段落（取代背景音樂）
+
+        Args:
+            sound: 段落音訊
+        """
+        pygame.mixer.music.stop()
+        self.current_music = None
+        self.section_channel.set_volume(self.music_volume)
+        self.section_channel.play(sound)
 
     def play_sfx(self, sfx_name: str) -> None:
         """
@@ -79,8 +143,18 @@ class AudioManager:
         Args:
             sfx_name: 音效名稱
         """
-        if sfx_name in self.sfx and self.sfx[sfx_name]:
-            self.sfx[sfx_name].play()
+        sound = self.sfx.get(sfx_name)
+        if sound:
+            category, priority = self.SFX_ROUTING[sfx_name]
+            self.channels.play(sfx_name, sound, category, priority)
+
+    def begin_frame(self) -> None:
+        """每個影格開始時呼叫，同一影格觸發的相同音效只播放一次"""
+        self.channels.begin_frame()
+
+    def get_sfx_stats(self) -> dict:
+        """取得音效聲道統計（播放、合併、搶占與捨棄次數）"""
+        return self.channels.get_stats()
 
     def set_music_volume(self, volume: float) -> None:
         """
@@ -122,6 +196,17 @@ class AudioManager:
         # 更新asset_loader的主音量
         self.asset_loader.set_master_volume(normalized_volume)
 
+    def apply_volume_config(self, audio: AudioSettings) -> None:
+        """
+        套用設定中的音量（音樂與音效音量為主音量乘上各自的音量）
+
+        Args:
+            audio: 音訊設定
+        """
+        self.asset_loader.set_master_volume(audio.master_volume)
+        self.set_music_volume(audio.music_gain)
+        self.set_sfx_volume(audio.sfx_gain)
+
     def get_music_status(self) -> dict:
         """取得音樂播放狀態"""
         return {
@@ -138,6 +223,7 @@ class AudioManager:
         self.stop_music()
 
         # 清理音效
+        self.channels.stop()
         for sfx in self.sfx.values():
             if sfx:
                 sfx.stop()
@@ -0,0 +1,119 @@
+"""
+自動遊玩機器人
+模擬玩家按鍵，供浸泡測試與負載測試驅動遊戲
+"""
+
+import heapq
+import random
+from typing import Dict, List, Optional, Set, Tuple
+
+from .arrow import Arrow
+from .constants import JUDGMENT_LINE_Y, get_key_code
+
+# 技巧設定：timing_sigma 為按鍵時機誤差的標準差（秒），miss_rate 為放棄按鍵的機率
+SKILL_PROFILES: Dict[str, Dict[str, float]] = {
+    "perfect": {"timing_sigma": 0.0, "miss_rate": 0.0},
+    "expert": {"timing_sigma": 0.015, "miss_rate": 0.01},
+    "average": {"timing_sigma": 0.035, "miss_rate": 0.05},
+    "beginner": {"timing_sigma": 0.06, "miss_rate": 0.15},
+}
+
+
+class AutoplayBot:
+    """自動遊玩機器人類別"""
+
+    def __init__(
+        self,
+        timing_sigma: float = 0.0,
+        miss_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.timing_sigma = max(0.0, timing_sigma)
+        self.miss_rate = min(1.0, max(0.0, miss_rate))
+        self.random = random.Random(seed)
+
+        # 待按下的按鍵（按鍵時間, 序號, 方向），序號確保排序穩定
+        self._pending: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._seen: Set[Arrow] = set()
+        self._key_codes = {}
+
+    @classmethod
+    def from_profile(cls, profile: str, seed: Optional[int] = None) -> "AutoplayBot":
+        """
+        以預設技巧設定建立機器人
+
+        Args:
+            profile: 技巧設定名稱（perfect, expert, average, beginner）
+            seed: 亂數種子
+
+        Returns:
+            AutoplayBot: 機器人
+        """
+        return cls(**SKILL_PROFILES[profile], seed=seed)
+
+    def observe(self, arrows: List[Arrow], current_time: float) -> None:
+        """
+        為新出現的箭頭排定按鍵時間
+
+        須在箭頭位置更新後呼叫，current_time 為位置對應的時間。
+
+        Args:
+            arrows: 目前畫面上的箭頭
+            current_time: 當前遊戲時間
+        """
+        for arrow in arrows:
+            if arrow in self._seen or arrow.hit or arrow.missed:
+                continue
+            self._seen.add(arrow)
+
+            if self.miss_rate and self.random.random() < self.miss_rate:
+                continue
+
+            arrival_time = current_time + (arrow.y - JUDGMENT_LINE_Y) / arrow.speed
+            if self.timing_sigma:
+                arrival_time += self.random.gauss(0.0, self.timing_sigma)
+            heapq.heappush(
+                self._pending, (arrival_time, self._sequence, arrow.direction)
+            )
+            self._sequence += 1
+
+        # 只保留仍在畫面上的箭頭，避免集合無限成長
+        if len(self._seen) > len(arrows) * 2:
+            self._seen.intersection_update(arrows)
+
+    def poll(self, current_time: float) -> List[int]:
+        """
+        取出已到按鍵時間的按鍵
+
+        Args:
+            current_time: 當前遊戲時間
+
+        Returns:
+            List[int]: 要按下的pygame按鍵碼
+        """
+        keys = []
+        while self._pending and self._pending[0][0] <= current_time:
+            _, _, direction = heapq.heappop(self._pending)
+            keys.append(self._get_key_code(direction))
+        return keys
+
+    def set_key_codes(self, key_codes: Dict[str, int]) -> None:
+        """
+        設定方向對應的按鍵碼（依玩家的按鍵設定，未設定的方向使用預設按鍵）
+
+        Args:
+            key_codes: 方向對應pygame按鍵碼
+        """
+        self._key_codes = dict(key_codes)
+
+    def _get_key_code(self, direction: str) -> int:
+        """取得方向對應的按鍵碼（快取結果）"""
+        if direction not in self._key_codes:
+            self._key_codes[direction] = get_key_code(direction)
+        return self._key_codes[direction]
+
+    def reset(self) -> None:
+        """清除所有排定的按鍵"""
+        self._pending.clear()
+        self._seen.clear()
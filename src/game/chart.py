@@ -0,0 +1,198 @@
+"""
+譜面資料
+依時間排序的音符清單與歌曲資訊，以 JSON 檔案儲存
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .constants import ARROW_DIRECTIONS
+
+# 譜面檔與音訊檔放在同一目錄，檔名為 <歌曲名>.chart.json
+CHART_SUFFIX = ".chart.json"
+
+
+class Chart:
+    """譜面類別"""
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        notes: List[Tuple],
+        bpm: float,
+        offset: float = 0.0,
+        duration: float = 0.0,
+        title: str = "",
+        audio_file: str = "",
+        difficulty: str = "",
+        samples: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            notes: (時間秒數, 方向) 或 (時間秒數, 方向, 按鍵音樣本名稱) 清單
+            bpm: 每分鐘拍數
+            offset: 第一拍的時間（秒）
+            duration: 歌曲長度（秒）
+            title: 歌曲名稱
+            audio_file: 音訊檔案名稱
+            difficulty: 譜面難度
+            samples: 按鍵音樣本名稱對應的檔案（相對於譜面所在目錄）
+        """
+        ordered = sorted(notes, key=lambda note: (note[0], note[1]))
+        self.notes = [(note[0], note[1]) for note in ordered]
+        # 與 notes 對齊的按鍵音樣本名稱，空字串表示沒有按鍵音
+        self.note_samples = [note[2] if len(note) > 2 else "" for note in ordered]
+        self.samples = dict(samples or {})
+        self.bpm = bpm
+        self.offset = offset
+        self.duration = duration
+        self.title = title
+        self.audio_file = audio_file
+        self.difficulty = difficulty
+
+    @property
+    def note_count(self) -> int:
+        """音符數量"""
+        return len(self.notes)
+
+    @property
+    def has_keysounds(self) -> bool:
+        """譜面是否宣告按鍵音樣本"""
+        return bool(self.samples)
+
+    @property
+    def beat_interval(self) -> float:
+        """每拍秒數"""
+        return 60.0 / self.bpm if self.bpm else 0.0
+
+    def scaled(self, rate: float) -> "Chart":
+        """
+        取得配合變速音訊的譜面（時間除以速率，BPM 乘以速率）
+
+        Args:
+            rate: 播放速率（0.75 表示放慢為 75% 速度）
+
+        Returns:
+            Chart: 新的譜面
+        """
+        return Chart(
+            [
+                (time / rate, direction, sample)
+                for (time, direction), sample in zip(
+                    self.notes, self.note_samples, strict=True
+                )
+            ],
+            bpm=self.bpm * rate,
+            offset=self.offset / rate,
+            duration=self.duration / rate,
+            title=self.title,
+            audio_file=self.audio_file,
+            difficulty=self.difficulty,
+            samples=self.samples,
+        )
+
+    @staticmethod
+    def sidecar_path(audio_path: Path) -> Path:
+        """取得音訊檔對應的譜面檔路徑"""
+        return audio_path.with_name(audio_path.stem + CHART_SUFFIX)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """轉換為可序列化的字典"""
+        data = {
+            "version": self.VERSION,
+            "title": self.title,
+            "audio_file": self.audio_file,
+            "difficulty": self.difficulty,
+            "bpm": self.bpm,
+            "offset": self.offset,
+            "duration": self.duration,
+            "notes": [
+                (
+                    [round(time, 4), direction, sample]
+                    if sample
+                    else [round(time, 4), direction]
+                )
+                for (time, direction), sample in zip(
+                    self.notes, self.note_samples, strict=True
+                )
+            ],
+        }
+        if self.samples:
+            data["samples"] = self.samples
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Chart":
+        """
+        從字典建立譜面（略過格式或方向不合法的音符，未宣告的按鍵音樣本視為沒有按鍵音）
+
+        Args:
+            data: to_dict() 產生的字典
+
+        Returns:
+            Chart: 譜面
+        """
+        samples = data.get("samples", {})
+        notes = [
+            (
+                float(note[0]),
+                note[1],
+                note[2] if note[2:] and note[2] in samples else "",
+            )
+            for note in data.get("notes", [])
+            if isinstance(note, (list, tuple))
+            and len(note) >= 2
+            and note[1] in ARROW_DIRECTIONS
+        ]
+        return cls(
+            notes,
+            bpm=float(data.get("bpm", 0.0)),
+            offset=float(data.get("offset", 0.0)),
+            duration=float(data.get("duration", 0.0)),
+            title=data.get("title", ""),
+            audio_file=data.get("audio_file", ""),
+            difficulty=data.get("difficulty", ""),
+            samples=samples,
+        )
+
+    def save(self, file_path: Path) -> bool:
+        """
+        儲存譜面
+
+        Args:
+            file_path: 檔案路徑
+
+        Returns:
+            bool: 儲存是否成功
+        """
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False)
+            return True
+        except Exception as e:
+            print(f"儲存譜面失敗: {e}")
+            return False
+
+    @classmethod
+    def load(cls, file_path: Path) -> Optional["Chart"]:
+        """
+        載入譜面
+
+        Args:
+            file_path: 檔案路徑
+
+        Returns:
+            Chart or None: 譜面，檔案不存在或格式錯誤時為 None
+        """
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+                return None
+            return cls.from_dict(data)
+        except (OSError, ValueError, TypeError, LookupError, AttributeError) as e:
+            print(f"載入譜面失敗 {file_path}: {e}")
+            return None
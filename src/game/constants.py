@@ -16,6 +16,7 @@ ARROW_WIDTH = 60
 ARROW_HEIGHT = 60
 ARROW_SPEED_EASY = 100  # 像素/秒
 ARROW_SPEED_NORMAL = 150  # 像素/秒
+ARROW_SPEED_STRESS = 300  # 像素/秒
 
 # 判定範圍設定
 PERFECT_RANGE = 20  # 完美判定範圍（像素）
@@ -26,12 +27,18 @@ MISS_RANGE = 80  # 失誤判定範圍（像素）
 JUDGMENT_COOLDOWN_SECONDS = 0.1
 FEEDBACK_FADE_SECONDS = 0.5
 COMBO_EFFECT_FADE_SECONDS = 2.0
+FEEDBACK_QUEUE_CAPACITY = 16  # 同時顯示的判定回饋上限
+COMBO_EFFECT_QUEUE_CAPACITY = 64  # 同時顯示的連擊特效上限
 
 # 分數設定
 PERFECT_SCORE = 100
 GOOD_SCORE = 50
 MISS_SCORE = 0
 
+# 箭頭生成設定：落後不超過此秒數時補生成並依經過時間校正位置，
+# 超過時（如暫停後）只生成一支，避免一次湧出大量箭頭
+SPAWN_CATCHUP_SECONDS = 0.25
+
 # 遊戲輸入設定
 KEY_PRESS_COOLDOWN_SECONDS = 0.1
 MAX_HIT_DISTANCE = 80
@@ -79,7 +86,9 @@ MUSIC_VOLUME = 0.6
 
 # 遊戲狀態
 GameState = {
+    "LOADING": "loading",
     "MENU": "menu",
+    "SONG_SELECT": "song_select",
     "PLAYING": "playing",
     "PAUSED": "paused",
     "GAME_OVER": "game_over",
@@ -90,4 +99,4 @@ GAME_DURATION_SECONDS = 90
 MAX_MISSES = 20
 
 # 難度等級
-DifficultyLevel = {"EASY": "easy", "NORMAL": "normal"}
+DifficultyLevel = {"EASY": "easy", "NORMAL": "normal", "STRESS": "stress"}
@@ -3,14 +3,20 @@
 處理遊戲難度設定和參數調整
 """
 
-from typing import Dict, Tuple, Optional
-from .constants import ARROW_SPEED_EASY, ARROW_SPEED_NORMAL, GAME_AREA_X
+from typing import Dict, List, Tuple, Optional
+from .constants import (
+    ARROW_SPEED_EASY,
+    ARROW_SPEED_NORMAL,
+    ARROW_SPEED_STRESS,
+    GAME_AREA_X,
+)
 
 
 class Difficulty:
     """難度管理系統類別"""
 
     DEFAULT_DIFFICULTY = "EASY"
+    STRESS_DEFAULT_NOTES_PER_SECOND = 10.0
     LANE_OFFSETS = {
         "LEFT": 30,
         "DOWN": 80,
@@ -30,6 +36,8 @@ class Difficulty:
                 "judgment_window": 1.2,  # 判定窗口倍率
                 "arrow_density": 0.7,  # 箭頭密度
                 "score_multiplier": 1.0,  # 分數倍率
+                "chart_subdivision": 1,  # 自動譜面每拍格數（四分音符）
+                "chart_min_gap": 0.4,  # 自動譜面音符最小間隔（秒）
             },
             "NORMAL": {
                 "name": "Normal",
@@ -38,6 +46,21 @@ class Difficulty:
                 "judgment_window": 1.0,  # 判定窗口倍率
                 "arrow_density": 1.0,  # 箭頭密度
                 "score_multiplier": 1.2,  # 分數倍率
+                "chart_subdivision": 2,  # 自動譜面每拍格數（八分音符）
+                "chart_min_gap": 0.2,  # 自動譜面音符最小間隔（秒）
+            },
+            # 壓力測試：密度與軌道數由 configure_stress 設定，不會因失誤結束
+            "STRESS": {
+                "name": "Stress",
+                "arrow_speed": ARROW_SPEED_STRESS,
+                "spawn_interval": 1.0 / self.STRESS_DEFAULT_NOTES_PER_SECOND,
+                "judgment_window": 1.0,
+                "arrow_density": 1.0,
+                "score_multiplier": 1.0,
+                "chart_subdivision": 4,
+                "chart_min_gap": 0.1,
+                "lanes": list(self.LANE_OFFSETS),
+                "endless": True,
             },
         }
 
@@ -82,6 +105,74 @@ class Difficulty:
         """取得當前難度的分數倍率"""
         return self.difficulties[self.current_difficulty]["score_multiplier"]
 
+    def get_chart_settings(self) -> Dict:
+        """
+        取得自動產生譜面使用的參數
+
+        Returns:
+            Dict: subdivision（每拍格數）、min_gap（音符最小間隔秒數）、
+                density（保留的起音比例）
+        """
+        settings = self.difficulties[self.current_difficulty]
+        return {
+            "subdivision": settings.get("chart_subdivision", 2),
+            "min_gap": settings.get("chart_min_gap", 0.2),
+            "density": settings.get("arrow_density", 1.0),
+        }
+
+    def get_active_lanes(self) -> List[str]:
+        """取得當前難度會生成箭頭的方向"""
+        return self.difficulties[self.current_difficulty].get(
+            "lanes", list(self.LANE_OFFSETS)
+        )
+
+    def is_endless(self) -> bool:
+        """當前難度是否停用時間與失誤次數的結束條件"""
+        return self.difficulties[self.current_difficulty].get("endless", False)
+
+    def define_difficulty(
+        self, difficulty: str, base: str = "NORMAL", **overrides
+    ) -> bool:
+        """
+        以既有難度為基礎定義新難度（供難度調校工具使用）
+
+        Args:
+            difficulty: 新難度名稱
+            base: 作為基礎的難度名稱
+            **overrides: 要覆寫的設定（如 spawn_interval、arrow_speed）
+
+        Returns:
+            bool: 定義是否成功
+        """
+        if base not in self.difficulties:
+            return False
+
+        settings = dict(self.difficulties[base])
+        settings.update(overrides)
+        # 基礎難度一定有 name，需明確覆寫才不會沿用基礎難度的名稱
+        settings["name"] = overrides.get("name", difficulty.title())
+        self.difficulties[difficulty] = settings
+        return True
+
+    def configure_stress(self, notes_per_second: float, lane_count: int = 4) -> bool:
+        """
+        設定壓力測試難度的箭頭密度與軌道數
+
+        Args:
+            notes_per_second: 每秒生成的箭頭數
+            lane_count: 使用的軌道數（1 - 4，依 LEFT/DOWN/UP/RIGHT 順序取用）
+
+        Returns:
+            bool: 設定是否成功
+        """
+        if notes_per_second <= 0 or not 1 <= lane_count <= len(self.LANE_OFFSETS):
+            return False
+
+        stress = self.difficulties["STRESS"]
+        stress["spawn_interval"] = 1.0 / notes_per_second
+        stress["lanes"] = list(self.LANE_OFFSETS)[:lane_count]
+        return True
+
     def get_arrow_position(self, direction: str) -> Tuple[int, int]:
         """
         取得指定方向的箭頭位置
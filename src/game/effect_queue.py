@@ -0,0 +1,114 @@
+"""
+特效佇列
+以固定容量環形緩衝區管理依時間排序的短暫特效
+"""
+
+from typing import Iterator, Tuple
+
+
+class EffectRecord:
+    """預先配置的特效記錄，推入佇列時覆寫欄位重複使用"""
+
+    __slots__ = ("time", "text", "color", "combo")
+
+    def __init__(self):
+        self.time = 0.0
+        self.text = ""
+        self.color: Tuple[int, int, int] = (255, 255, 255)
+        self.combo = 0
+
+    def __getitem__(self, key: str):
+        """支援以字典方式讀取欄位（如 record["text"]）"""
+        return getattr(self, key)
+
+
+class EffectQueue:
+    """
+    固定容量的特效環形緩衝區
+
+    特效依觸發時間先後推入，因此過期的項目必定位於頭端，
+    更新時只需從頭端彈出，成本為 O(過期數量) 且不配置任何物件。
+    佇列已滿時覆寫最舊的特效。
+    """
+
+    def __init__(self, capacity: int, duration: float):
+        self.capacity = capacity
+        self.duration = duration  # 特效存活時間（秒）
+        self._records = [EffectRecord() for _ in range(capacity)]
+        self._head = 0
+        self._count = 0
+
+    def push(
+        self,
+        time: float,
+        text: str = "",
+        color: Tuple[int, int, int] = (255, 255, 255),
+        combo: int = 0,
+    ) -> EffectRecord:
+        """
+        推入新特效
+
+        Args:
+            time: 觸發時間
+            text: 顯示文字
+            color: 顯示顏色
+            combo: 連擊數
+
+        Returns:
+            EffectRecord: 被寫入的記錄
+        """
+        if self._count == self.capacity:
+            # 已滿時捨棄最舊的特效
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+
+        record = self._records[(self._head + self._count) % self.capacity]
+        record.time = time
+        record.text = text
+        record.color = color
+        record.combo = combo
+        self._count += 1
+        return record
+
+    def expire(self, current_time: float) -> int:
+        """
+        從頭端移除過期特效
+
+        Args:
+            current_time: 當前時間
+
+        Returns:
+            int: 移除的數量
+        """
+        expired = 0
+        while (
+            self._count
+            and current_time - self._records[self._head].time >= self.duration
+        ):
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+            expired += 1
+        return expired
+
+    def clear(self) -> None:
+        """清空佇列（保留預先配置的記錄）"""
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> EffectRecord:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("effect queue index out of range")
+        return self._records[(self._head + index) % self.capacity]
+
+    def __iter__(self) -> Iterator[EffectRecord]:
+        """由舊到新依序走訪特效"""
+        records = self._records
+        capacity = self.capacity
+        head = self._head
+        for offset in range(self._count):
+            yield records[(head + offset) % capacity]
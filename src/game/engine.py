@@ -4,9 +4,14 @@
 """
 
 import pygame
+import threading
 import time
 import random
-from typing import List, Optional
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
 
 from .constants import (
     WINDOW_WIDTH,
@@ -26,6 +31,7 @@ from .constants import (
     KEY_PRESS_COOLDOWN_SECONDS,
     MAX_HIT_DISTANCE,
     PAUSE_OVERLAY_ALPHA,
+    SPAWN_CATCHUP_SECONDS,
     BLACK,
     WHITE,
     GRAY,
@@ -36,13 +42,52 @@ from .timing import Timing
 from .score import Score
 from .difficulty import Difficulty
 from .audio_manager import AudioManager
+from .analytics import JUDGMENT_CODES, JudgmentLog, TimingAnalytics
+from .gc_control import GcController
+from .profiler import FrameProfiler
+from .autoplay import AutoplayBot
+from .beat_analysis import BeatAnalysisCache
+from .chart import Chart
+from .song_library import SongInfo, SongLibrary
+from .song_preview import SongPreview
+from .practice import PracticeRenderer, load_section
+from .keysounds import KeysoundBank
+from utils.asset_cache import BYTES_PER_MB, budget_from_mb
 from utils.asset_loader import AssetLoader
+from utils.cache import get_cache_dir
 from utils.config import Config
+from utils.config_watcher import ConfigWatcher
+from utils.settings import (
+    AudioSettings,
+    ControlSettings,
+    DisplaySettings,
+)
 
 
 class GameEngine:
     """遊戲引擎主類別"""
 
+    EXPORT_DIR = Path("exports")
+    OVERLAY_REFRESH_SECONDS = 0.5
+    OVERLAY_POSITION = (560, 10)
+    OVERLAY_LINE_HEIGHT = 20
+    LOADING_FONT_SIZE = 32
+    LOADING_BAR_SIZE = (400, 24)
+    FONT_SIZES = {"large": 48, "medium": 32, "small": 24}
+    BACKGROUND_MUSIC = "background.wav"
+    # 選歌清單顯示的列數與列高
+    SONG_LIST_ROWS = 7
+    SONG_LIST_ROW_HEIGHT = 40
+    # 練習段落的最短長度，以及終點後保留給最後音符判定的時間（秒）
+    LOOP_MIN_SECONDS = 1.0
+    LOOP_TAIL_SECONDS = 0.3
+    ARROW_IMAGE_FILES = {
+        "LEFT": "arrow_left.png",
+        "DOWN": "arrow_down.png",
+        "UP": "arrow_up.png",
+        "RIGHT": "arrow_right.png",
+    }
+
     def __init__(self):
         pygame.init()
 
@@ -52,16 +97,40 @@ class GameEngine:
         self.clock = pygame.time.Clock()
 
         # 初始化系統
-        self.asset_loader = AssetLoader()
         self.config = Config()
+        # 背景寫入器（配置與匯出檔案都在背景執行緒寫入，主循環不寫入磁碟）
+        self.writer = self.config.writer
+        self.asset_loader = AssetLoader(
+            cache_config=self.config.get_assets_config(),
+            audio_config=self.config.get_audio_config(),
+        )
         self.timing = Timing()
         self.score = Score()
         self.difficulty = Difficulty()
-        self.audio_manager = AudioManager(self.asset_loader)
+        self.audio_manager: Optional[AudioManager] = None
+
+        # 時機誤差分析
+        self.judgment_log = JudgmentLog()
+        self.timing_analytics = TimingAnalytics()
+        self.timing_stats: Optional[Dict[str, Any]] = None
+
+        # 影格效能分析（停用時主循環不做任何量測）
+        settings = self.config.settings
+        self.profiler = FrameProfiler(enabled=settings.performance.profiler_enabled)
+        self.profiler_dump_path = settings.performance.profiler_dump_path
+        self.overlay_lines: List[str] = []
+        self.overlay_refresh_time = 0.0
+
+        # 垃圾回收只在安全時機執行，停頓記錄於效能分析器的 gc_pause 階段
+        self.gc_control = GcController(
+            self.profiler.histograms[FrameProfiler.GC_PHASE],
+            enabled=settings.performance.gc_safe_points,
+        )
+        self.gc_control.install()
 
-        # 遊戲狀態
+        # 遊戲狀態（資源在背景載入完成後才進入選單）
         self.running = True
-        self.game_state = GameState["MENU"]
+        self.game_state = GameState["LOADING"]
         self.current_time = 0.0
         self.game_start_time = 0.0
 
@@ -69,45 +138,239 @@ class GameEngine:
         self.arrows: List[Arrow] = []
         self.last_spawn_time = 0.0
 
+        # 歌曲與譜面（未選歌時沿用隨機生成箭頭的模式）
+        self.beat_analysis = BeatAnalysisCache(get_cache_dir("analysis"))
+        self.library = SongLibrary.from_config(
+            self.config.get_library_config(),
+            self.asset_loader.base_path / "sounds" / "music",
+            exclude=[self.BACKGROUND_MUSIC],
+        )
+        self.library_scan_workers = settings.library.scan_workers or None
+        self.song_index = 0
+        # 游標所對應的歌曲清單（背景掃描替換清單後由 _sync_song_list 重新對齊）
+        self.listed_songs: List[SongInfo] = []
+        self.selected_song: Optional[Path] = None
+        self.preview: Optional[SongPreview] = None
+        self.chart: Optional[Chart] = None
+        # 所選歌曲的原速譜面（確認選歌時載入，重新開始時沿用），None 為隨機模式
+        self.song_chart: Optional[Chart] = None
+        # 譜面載入與音訊分析在背景執行緒進行，不阻塞繪製循環
+        self.chart_loader = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="chart-load"
+        )
+        self.chart_job: Optional[Future] = None
+        self.song_time = 0.0
+        self.next_note_index = 0
+        self.music_pending = False
+        self.song_audio: Optional[Path] = None
+
+        # 練習模式（變速音訊在行程池產生，段落循環使用預先切好的音訊）
+        self.practice = PracticeRenderer(
+            get_cache_dir("practice"), workers=settings.practice.workers or None
+        )
+        self.practice_rates = [1.0] + sorted(
+            {rate for rate in settings.practice.rates if 0 < rate != 1.0},
+            reverse=True,
+        )
+        self.practice_rate = 1.0
+        self.practice_job: Optional[Future] = None
+        self.loop_start: Optional[float] = None
+        self.loop_end: Optional[float] = None
+        self.loop_section_start = 0.0
+        self.loop_sound: Optional[pygame.mixer.Sound] = None
+        self.keysounds: Optional[KeysoundBank] = None
+
         # 輸入狀態
         self.keys_pressed = set()
         self.last_key_press_time = {}
+        self.autoplay: Optional[AutoplayBot] = None
+
+        # 顯示與按鍵設定（配置檔變更時由背景執行緒重新載入，_update 通知以下訂閱者）
+        self.fps = FPS
+        self.fullscreen = False
+        self.controls: ControlSettings = settings.controls
+        self._apply_display_config(settings.display)
+        self._apply_controls_config(settings.controls)
+        self.config.subscribe("display", self._apply_display_config)
+        self.config.subscribe("audio", self._apply_audio_config)
+        self.config.subscribe("controls", self._apply_controls_config)
+        self.config_watcher = ConfigWatcher(self.config)
+        self.config_watcher.start()
+
+        # 載入畫面使用 pygame 內建字體，不需等待系統字體搜尋
+        self.font_large = self.font_medium = self.font_small = pygame.font.Font(
+            None, self.LOADING_FONT_SIZE
+        )
+        self.arrow_images: Dict[str, Optional[pygame.Surface]] = {}
+
+        # 在背景執行緒池解碼字體、箭頭圖片與音效
+        self.preloader = self.asset_loader.create_preloader()
+        for size in self.FONT_SIZES.values():
+            self.preloader.add_font(size=size)
+        for filename in self.ARROW_IMAGE_FILES.values():
+            self.preloader.add_image(filename, subfolder="arrows")
+        for filename in AudioManager.SFX_FILES.values():
+            self.preloader.add_sound(filename, AudioManager.SFX_SUBFOLDER)
+        self.preloader.start()
+
+    def wait_for_assets(self) -> None:
+        """阻塞直到資源載入完成並進入選單（供無頭模式使用）"""
+        if self.game_state == GameState["LOADING"]:
+            self.preloader.wait()
+            self._finish_loading()
+
+    def _update_loading(self) -> None:
+        """將背景解碼完成的資源放入快取，全部完成後進入選單"""
+        self.preloader.poll()
+        if self.preloader.is_done():
+            self._finish_loading()
+
+    def _finish_loading(self) -> None:
+        """以快取中的資源完成初始化"""
+        # 字體與箭頭圖片整場遊戲都會使用，釘選於快取
+        self.font_large, self.font_medium, self.font_small = (
+            self.asset_loader.load_font(size=self.FONT_SIZES[name], pin=True)
+            for name in ("large", "medium", "small")
+        )
 
-        # 字體
-        self.font_large = self.asset_loader.load_font(size=48)
-        self.font_medium = self.asset_loader.load_font(size=32)
-        self.font_small = self.asset_loader.load_font(size=24)
+        self.arrow_images = {
+            direction: self.asset_loader.load_image(
+                filename, subfolder="arrows", pin=True
+            )
+            for direction, filename in self.ARROW_IMAGE_FILES.items()
+        }
+
+        # 音效
+        self.audio_manager = AudioManager(self.asset_loader)
 
         # 設定音量
-        audio_config = self.config.get_audio_config()
-        master_volume = audio_config.get("master_volume", 0.7)
-        self.asset_loader.set_master_volume(master_volume)
-        self.audio_manager.set_master_volume(master_volume)
+        self.audio_manager.apply_volume_config(self.config.settings.audio)
 
-        # 預載入箭頭圖片
-        self.arrow_images = {
-            "LEFT": self.asset_loader.load_image("arrow_left.png", subfolder="arrows"),
-            "DOWN": self.asset_loader.load_image("arrow_down.png", subfolder="arrows"),
-            "UP": self.asset_loader.load_image("arrow_up.png", subfolder="arrows"),
-            "RIGHT": self.asset_loader.load_image(
-                "arrow_right.png", subfolder="arrows"
-            ),
-        }
+        # 選歌試聽（背景解碼，使用專用聲道）
+        self.preview = SongPreview(
+            self.audio_manager.preview_channels,
+            budget_from_mb(self.config.settings.assets.preview_cache_mb),
+            volume=self.audio_manager.music_volume,
+        )
+
+        # 載入的資源整場遊戲都會存在，凍結後回收不再掃描它們
+        self.gc_control.freeze()
+
+        threading.Thread(
+            target=self._scan_library, name="song-library-scan", daemon=True
+        ).start()
+        self.game_state = GameState["MENU"]
+
+    def _scan_library(self) -> None:
+        """
+        在背景執行緒載入歌曲庫索引並重新掃描
+
+        選單不等待索引載入；上次的索引載入後即可選歌，目錄變動由掃描補上。
+        遊戲執行中只讀取 WAV 標頭（以執行緒池處理），不分析 BPM，避免搶占 CPU；
+        完整分析可用 scripts/scan_library.py 預先執行。
+        """
+        try:
+            self.library.load()
+            self.library.scan(
+                workers=self.library_scan_workers, analyze=False, use_processes=False
+            )
+        except Exception as e:
+            print(f"掃描歌曲庫失敗: {e}")
 
     def run(self) -> None:
         """執行遊戲主循環"""
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0  # 轉換為秒
+            dt = self.clock.tick(self.fps) / 1000.0  # 轉換為秒
             self.current_time += dt
 
-            self._handle_events()
-            self._update(dt)
-            self._draw()
+            if self.profiler.enabled:
+                self._run_profiled_frame(dt)
+            else:
+                self._handle_events()
+                self._update(dt)
+                self._draw()
 
         self._cleanup()
 
+    def _run_profiled_frame(self, dt: float) -> None:
+        """執行一個影格並記錄各階段耗時"""
+        profiler = self.profiler
+        frame_start = time.perf_counter_ns()
+
+        self._handle_events()
+        events_end = time.perf_counter_ns()
+        profiler.record("events", events_end - frame_start)
+
+        self._update(dt)
+        update_end = time.perf_counter_ns()
+        profiler.record("update", update_end - events_end)
+
+        self._render_frame()
+        flip_start = time.perf_counter_ns()
+        pygame.display.flip()
+        frame_end = time.perf_counter_ns()
+        profiler.record("flip", frame_end - flip_start)
+        profiler.record("frame", frame_end - frame_start)
+
+    def set_autoplay(self, bot: Optional[AutoplayBot]) -> None:
+        """
+        設定自動遊玩機器人
+
+        Args:
+            bot: 機器人，None 表示交還給玩家操作
+        """
+        self.autoplay = bot
+        if bot:
+            bot.set_key_codes(self.controls.key_codes)
+
+    def _apply_display_config(self, display: DisplaySettings) -> None:
+        """
+        套用顯示設定（影格率與全螢幕；畫面座標固定為 800x600，視窗大小需重新啟動）
+
+        Args:
+            display: 顯示設定
+        """
+        self.fps = display.fps
+        fullscreen = display.fullscreen
+        if fullscreen != self.fullscreen:
+            self.fullscreen = fullscreen
+            self.screen = pygame.display.set_mode(
+                (WINDOW_WIDTH, WINDOW_HEIGHT), pygame.FULLSCREEN if fullscreen else 0
+            )
+
+    def _apply_audio_config(self, audio: AudioSettings) -> None:
+        """
+        套用音量設定（資源載入完成前由 _finish_loading 套用）
+
+        Args:
+            audio: 音訊設定
+        """
+        if self.audio_manager is None:
+            return
+        self.audio_manager.apply_volume_config(audio)
+        if self.preview:
+            self.preview.set_volume(self.audio_manager.music_volume)
+
+    def _apply_controls_config(self, controls: ControlSettings) -> None:
+        """
+        套用按鍵設定（按鍵碼查詢表已在編譯設定快照時建立）
+
+        Args:
+            controls: 按鍵設定
+        """
+        self.controls = controls
+        if self.autoplay:
+            self.set_autoplay(self.autoplay)
+
     def _handle_events(self) -> None:
         """處理事件"""
+        # 新影格開始，同一影格內觸發的相同音效只播放一次
+        if self.audio_manager:
+            self.audio_manager.begin_frame()
+
+        if self.autoplay and self.game_state == GameState["PLAYING"]:
+            self._post_autoplay_keys()
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
@@ -118,13 +381,27 @@ class GameEngine:
             elif event.type == pygame.KEYUP:
                 self._handle_key_up(event.key)
 
+    def _post_autoplay_keys(self) -> None:
+        """將機器人到期的按鍵放入事件佇列，與實際按鍵走相同的輸入流程"""
+        for key in self.autoplay.poll(self.current_time):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+            pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key))
+
     def _handle_key_down(self, key: int) -> None:
         """處理按鍵按下事件"""
         self.keys_pressed.add(key)
 
+        # 效能覆蓋層可在任何狀態切換
+        if key == pygame.K_F3:
+            self.profiler.toggle_overlay()
+            self.overlay_refresh_time = 0.0
+            return
+
         # 根據遊戲狀態處理按鍵
         if self.game_state == GameState["MENU"]:
             self._handle_menu_key(key)
+        elif self.game_state == GameState["SONG_SELECT"]:
+            self._handle_song_select_key(key)
         elif self.game_state == GameState["PLAYING"]:
             self._handle_game_key(key)
         elif self.game_state == GameState["PAUSED"]:
@@ -138,46 +415,176 @@ class GameEngine:
 
     def _handle_menu_key(self, key: int) -> None:
         """處理選單狀態的按鍵"""
-        if key == pygame.K_RETURN:
-            self._start_game()
+        if key == self.controls.start_key:
+            self._open_song_select()
         elif key == pygame.K_1:
             self.difficulty.set_difficulty("EASY")
-            self._start_game()
+            self._open_song_select()
         elif key == pygame.K_2:
             self.difficulty.set_difficulty("NORMAL")
-            self._start_game()
+            self._open_song_select()
         elif key == pygame.K_ESCAPE:
             self.running = False
 
+    def _open_song_select(self) -> None:
+        """進入選歌畫面並開始試聽游標所在的歌曲"""
+        self.game_state = GameState["SONG_SELECT"]
+        self._cycle_song(0)
+
+    def _handle_song_select_key(self, key: int) -> None:
+        """處理選歌狀態的按鍵"""
+        if key in (pygame.K_UP, pygame.K_DOWN):
+            self._cycle_song(1 if key == pygame.K_DOWN else -1)
+        elif key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+            page = self.SONG_LIST_ROWS
+            self._cycle_song(page if key == pygame.K_PAGEDOWN else -page)
+        elif key in (pygame.K_LEFT, pygame.K_RIGHT):
+            self._cycle_practice_rate(1 if key == pygame.K_RIGHT else -1)
+        elif key == self.controls.start_key:
+            self._confirm_song()
+        elif key == pygame.K_ESCAPE:
+            self.chart_job = None
+            self.practice_job = None
+            self.preview.stop()
+            self.game_state = GameState["MENU"]
+
+    def _cycle_practice_rate(self, step: int) -> None:
+        """
+        切換練習速率
+
+        Args:
+            step: 移動方向（1 或 -1）
+        """
+        index = self.practice_rates.index(self.practice_rate)
+        self.practice_rate = self.practice_rates[
+            (index + step) % len(self.practice_rates)
+        ]
+        self.chart_job = None
+        self.practice_job = None
+
+    def _confirm_song(self) -> None:
+        """
+        確認選歌並開始遊戲
+
+        譜面在背景執行緒載入（沒有譜面檔時需分析整首歌），完成後由 _update 交給
+        _prepare_song；等待期間畫面照常更新，也可以取消或改選其他歌曲。
+        """
+        if self.selected_song is None:
+            self._prepare_song(None)
+            return
+        self.chart_job = self.chart_loader.submit(self._load_chart, self.selected_song)
+
+    def _prepare_song(self, chart: Optional[Chart]) -> None:
+        """
+        以載入的譜面開始遊戲
+
+        練習速率的音訊尚未產生時排入行程池，完成後由 _update 開始遊戲。
+        沒有譜面（隨機模式）時不產生變速音訊，直接以原速開始。
+
+        Args:
+            chart: 所選歌曲的原速譜面，None 為隨機模式
+        """
+        self.song_chart = chart
+        if chart is not None and self.practice_rate != 1.0:
+            info = self.library.get(self.selected_song)
+            self.practice_job = self.practice.submit(
+                self.selected_song, self.practice_rate, info.digest if info else None
+            )
+            return
+        self.preview.stop()
+        self._start_game()
+
+    def _cycle_song(self, step: int) -> None:
+        """
+        移動選歌游標（第 0 個選項為隨機模式），並排程游標附近歌曲的試聽
+
+        Args:
+            step: 移動的列數，負數向上
+        """
+        songs = self.library.songs
+        self.listed_songs = songs
+        self.chart_job = None
+        self.practice_job = None
+        self.song_index = (self.song_index + step) % (len(songs) + 1)
+        self.selected_song = (
+            Path(songs[self.song_index - 1].path) if self.song_index else None
+        )
+        self.preview.select(songs, self.song_index - 1 if self.song_index else None)
+
+    def _sync_song_list(self) -> None:
+        """
+        背景掃描替換歌曲清單後重新對齊游標
+
+        所選歌曲仍在清單中時游標跟著移到它的新位置；已移除時游標限制於清單範圍內，
+        並改選游標所在的歌曲，確保開始的歌曲與畫面上選取的一致。
+        """
+        songs = self.library.songs
+        if songs is self.listed_songs:
+            return
+        if self.selected_song is not None:
+            paths = [Path(info.path) for info in songs]
+            if self.selected_song in paths:
+                self.listed_songs = songs
+                self.song_index = paths.index(self.selected_song) + 1
+                self.preview.select(songs, self.song_index - 1)
+                return
+        self.song_index = min(self.song_index, len(songs))
+        self._cycle_song(0)
+
     def _handle_game_key(self, key: int) -> None:
         """處理遊戲狀態的按鍵"""
-        if key == pygame.K_ESCAPE:
+        if key == self.controls.pause_key:
             self.game_state = GameState["PAUSED"]
             self.audio_manager.pause_music()
+        elif key == pygame.K_l and self.chart:
+            self._mark_loop()
         else:
             self._check_arrow_hit(key)
 
     def _handle_pause_key(self, key: int) -> None:
         """處理暫停狀態的按鍵"""
-        if key == pygame.K_ESCAPE:
+        if key == self.controls.pause_key:
             self.game_state = GameState["PLAYING"]
             self.audio_manager.resume_music()
         elif key == pygame.K_q:
             self.audio_manager.stop_music()
+            self._close_keysounds()
             self.game_state = GameState["MENU"]
 
     def _handle_game_over_key(self, key: int) -> None:
         """處理遊戲結束狀態的按鍵"""
-        if key == pygame.K_RETURN:
-            self._start_game()
+        if key == self.controls.start_key:
+            # 以相同速率重新開始時沿用已產生的變速音訊
+            practice_audio = self.song_audio if self.practice_rate != 1.0 else None
+            self._start_game(practice_audio)
         elif key == pygame.K_ESCAPE:
             self.audio_manager.stop_music()
             self.game_state = GameState["MENU"]
+        elif key == pygame.K_e:
+            self._export_session_stats()
+
+    def _export_session_stats(self) -> None:
+        """匯出本場統計（JSON）與逐筆判定記錄（CSV），由背景寫入器編碼與寫入"""
+        if self.timing_stats is None:
+            return
+
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        json_path = self.EXPORT_DIR / f"session_{stamp}.json"
+        csv_path = self.EXPORT_DIR / f"session_{stamp}_judgments.csv"
+        stats = self.timing_stats
+        breakdown = self.score.get_score_breakdown()
+        log = self.judgment_log.copy()
+        analytics = self.timing_analytics
+        self.writer.submit(
+            json_path, lambda: analytics.encode_json(stats, breakdown), delay=0.0
+        )
+        self.writer.submit(csv_path, lambda: analytics.encode_csv(log), delay=0.0)
+        print(f"匯出統計: {json_path}")
 
     def _check_arrow_hit(self, key: int) -> None:
         """檢查箭頭擊中判定"""
-        # 防止重複觸發
-        current_time = time.time()
+        # 防止重複觸發（使用遊戲時間，無頭模式加速模擬時同樣適用）
+        current_time = self.current_time
         if key in self.last_key_press_time:
             if (
                 current_time - self.last_key_press_time[key]
@@ -186,19 +593,11 @@ class GameEngine:
                 return
         self.last_key_press_time[key] = current_time
 
-        # 對應按鍵到方向
-        direction_map = {
-            pygame.K_LEFT: "LEFT",
-            pygame.K_DOWN: "DOWN",
-            pygame.K_UP: "UP",
-            pygame.K_RIGHT: "RIGHT",
-        }
-
-        if key not in direction_map:
+        # 對應按鍵到方向（依配置的按鍵設定）
+        direction = self.controls.lane_keys.get(key)
+        if direction is None:
             return
 
-        direction = direction_map[key]
-
         # 尋找最近的箭頭
         closest_arrow = None
         closest_distance = float("inf")
@@ -219,14 +618,24 @@ class GameEngine:
             # 標記箭頭為已擊中
             closest_arrow.hit = True
 
+            # 記錄有號時機誤差（負值為提早，正值為延遲）
+            if judgment in JUDGMENT_CODES:
+                error = (JUDGMENT_LINE_Y - closest_arrow.y) / closest_arrow.speed
+                self.judgment_log.record(self.current_time, direction, error, judgment)
+
             # 計算分數
             adjusted_score = self.difficulty.calculate_adjusted_score(base_score)
             actual_score, combo_milestone = self.score.add_score(
                 judgment, adjusted_score, self.current_time
             )
 
-            # 播放音效
-            self._play_hit_sound(judgment)
+            # 播放音效（有按鍵音時取代判定音效）
+            if not (
+                closest_arrow.keysound
+                and self.keysounds
+                and self.keysounds.trigger(closest_arrow.keysound)
+            ):
+                self._play_hit_sound(judgment)
             if combo_milestone:
                 self.audio_manager.play_sfx("combo")
 
@@ -236,8 +645,29 @@ class GameEngine:
 
     def _update(self, dt: float) -> None:
         """更新遊戲狀態"""
+        self.config_watcher.poll()
+        # 離開遊戲進行中（暫停、結束、回到選單）時回收
+        self.gc_control.set_playing(self.game_state == GameState["PLAYING"])
+
+        if self.game_state == GameState["LOADING"]:
+            self._update_loading()
+            return
+
         if self.game_state == GameState["PLAYING"]:
             self._update_game(dt)
+        elif self.game_state == GameState["SONG_SELECT"]:
+            self._sync_song_list()
+            self.preview.update(dt)
+            if self.chart_job and self.chart_job.done():
+                job, self.chart_job = self.chart_job, None
+                chart = None if job.cancelled() or job.exception() else job.result()
+                self._prepare_song(chart)
+            if self.practice_job and self.practice_job.done():
+                job, self.practice_job = self.practice_job, None
+                # 直接使用工作結果，不在主執行緒重新檢查快取或重新計算
+                audio = None if job.cancelled() or job.exception() else job.result()
+                self.preview.stop()
+                self._start_game(Path(audio) if audio else None)
 
         # 更新時機系統
         self.timing.update_feedback(self.current_time)
@@ -248,7 +678,10 @@ class GameEngine:
     def _update_game(self, dt: float) -> None:
         """更新遊戲邏輯"""
         # 生成新箭頭
-        self._spawn_arrows(dt)
+        if self.chart:
+            self._spawn_chart_notes(dt)
+        else:
+            self._spawn_arrows(dt)
 
         # 更新箭頭位置
         for arrow in self.arrows:
@@ -257,29 +690,147 @@ class GameEngine:
         # 移除超出範圍的箭頭
         self._remove_out_of_bounds_arrows()
 
+        # 自動遊玩機器人依更新後的位置排定按鍵
+        if self.autoplay:
+            self.autoplay.observe(self.arrows, self.current_time)
+
         # 檢查遊戲結束條件
         self._check_game_over()
 
     def _spawn_arrows(self, dt: float) -> None:
-        """生成新箭頭"""
+        """生成新箭頭（高密度時每個影格可生成多支）"""
         spawn_interval = self.difficulty.get_spawn_interval()
+        elapsed = self.current_time - self.last_spawn_time
 
-        if self.current_time - self.last_spawn_time >= spawn_interval:
-            # 隨機選擇方向
-            directions = ["LEFT", "DOWN", "UP", "RIGHT"]
-            direction = random.choice(directions)
+        if elapsed < spawn_interval:
+            return
 
-            # 取得位置
-            x, _ = self.difficulty.get_arrow_position(direction)
-            y = ARROW_START_Y
-            speed = self.difficulty.get_arrow_speed()
+        if elapsed > spawn_interval + SPAWN_CATCHUP_SECONDS:
+            # 落後過多（如暫停後），只生成一支並重新計時
+            self._spawn_arrow(0.0)
+            self.last_spawn_time = self.current_time
+            return
+
+        spawn_count = int(elapsed // spawn_interval)
+        for index in range(1, spawn_count + 1):
+            # 依應生成時間校正位置，讓同一影格生成的箭頭保持間距
+            self._spawn_arrow(elapsed - index * spawn_interval)
+        self.last_spawn_time += spawn_count * spawn_interval
+
+    def _arrow_travel_time(self) -> float:
+        """箭頭從生成位置移動到判定線所需的時間（秒）"""
+        return (ARROW_START_Y - JUDGMENT_LINE_Y) / self.difficulty.get_arrow_speed()
+
+    def _spawn_chart_notes(self, dt: float) -> None:
+        """
+        依譜面生成箭頭
+
+        歌曲時間只在遊戲進行中前進；箭頭提前一段移動時間生成，
+        並依應生成時間校正位置，讓音符準時抵達判定線。
+        """
+        self.song_time += dt
+        if self.music_pending and self.song_time >= 0:
+            self.music_pending = False
+            self.audio_manager.play_music(str(self.song_audio), loop=False)
+        if (
+            self.loop_end is not None
+            and self.song_time >= self.loop_end + self.LOOP_TAIL_SECONDS
+        ):
+            self._restart_loop()
+        if self.keysounds:
+            self.keysounds.update(self.song_time)
+
+        travel_time = self._arrow_travel_time()
+        notes = self.chart.notes
+        while self.next_note_index < len(notes):
+            note_time, direction = notes[self.next_note_index]
+            if self.loop_end is not None and note_time > self.loop_end:
+                break
+            spawn_time = note_time - travel_time
+            if spawn_time > self.song_time:
+                break
+            self._spawn_arrow(
+                self.song_time - spawn_time,
+                direction,
+                self.chart.note_samples[self.next_note_index],
+            )
+            self.next_note_index += 1
 
-            # 建立箭頭
-            arrow_image = self.arrow_images.get(direction)
-            arrow = Arrow(direction, x, y, speed, image=arrow_image)
-            self.arrows.append(arrow)
+    def _mark_loop(self) -> None:
+        """
+        設定練習段落循環
 
-            self.last_spawn_time = self.current_time
+        第一次按下設定起點，第二次設定終點並立即回到起點，第三次取消循環並接續播放整首歌。
+        """
+        if self.loop_end is not None:
+            self._clear_loop()
+            self.audio_manager.stop_music()
+            self.audio_manager.play_music(
+                str(self.song_audio), loop=False, start=max(0.0, self.song_time)
+            )
+            return
+
+        if self.loop_start is None:
+            self.loop_start = max(0.0, self.song_time)
+            return
+        if self.song_time - self.loop_start < self.LOOP_MIN_SECONDS:
+            return
+
+        # 段落包含起點前的箭頭移動時間與終點後的判定時間，循環時直接從頭重播
+        self.loop_end = self.song_time
+        self.loop_section_start = max(0.0, self.loop_start - self._arrow_travel_time())
+        self.loop_sound = load_section(
+            self.song_audio,
+            self.loop_section_start,
+            self.loop_end + self.LOOP_TAIL_SECONDS,
+        )
+        if self.loop_sound is None:
+            self._clear_loop()
+            return
+        self._restart_loop()
+
+    def _restart_loop(self) -> None:
+        """回到練習段落開頭（重播預先切好的段落，不需讀檔或搜尋）"""
+        self.arrows.clear()
+        self.song_time = self.loop_section_start
+        self.next_note_index = bisect_left(self.chart.notes, (self.loop_start,))
+        self.music_pending = False
+        self.audio_manager.play_section(self.loop_sound)
+        if self.keysounds:
+            self.keysounds.seek(self.song_time)
+        if self.autoplay:
+            self.autoplay.reset()
+
+    def _clear_loop(self) -> None:
+        """取消練習段落循環"""
+        self.loop_start = None
+        self.loop_end = None
+        self.loop_sound = None
+
+    def _spawn_arrow(
+        self, age: float, direction: Optional[str] = None, keysound: str = ""
+    ) -> None:
+        """
+        生成一支箭頭
+
+        Args:
+            age: 箭頭應生成後已經過的時間（秒）
+            direction: 箭頭方向，None 時隨機選擇
+            keysound: 擊中時播放的按鍵音樣本名稱
+        """
+        if direction is None:
+            direction = random.choice(self.difficulty.get_active_lanes())
+
+        # 取得位置
+        x, _ = self.difficulty.get_arrow_position(direction)
+        speed = self.difficulty.get_arrow_speed()
+        y = ARROW_START_Y - speed * age
+
+        # 建立箭頭
+        arrow_image = self.arrow_images.get(direction)
+        self.arrows.append(
+            Arrow(direction, x, y, speed, image=arrow_image, keysound=keysound)
+        )
 
     def _remove_out_of_bounds_arrows(self) -> None:
         """移除超出範圍的箭頭"""
@@ -292,35 +843,126 @@ class GameEngine:
                 # 如果箭頭未被擊中且超出範圍，記錄為Miss
                 if not arrow.hit and not arrow.missed:
                     self.score.add_score("MISS", 0, self.current_time)
+                    self.judgment_log.record(
+                        self.current_time, arrow.direction, float("nan"), "MISS"
+                    )
 
         for arrow in arrows_to_remove:
             self.arrows.remove(arrow)
 
     def _check_game_over(self) -> None:
         """檢查遊戲結束條件"""
-        if self.game_state != GameState["PLAYING"]:
+        if self.game_state != GameState["PLAYING"] or self.difficulty.is_endless():
             return
 
-        elapsed = self.current_time - self.game_start_time
-        if elapsed >= GAME_DURATION_SECONDS or self.score.miss_count >= MAX_MISSES:
+        if self.chart:
+            finished = (
+                self.next_note_index >= self.chart.note_count
+                and all(arrow.hit or arrow.missed for arrow in self.arrows)
+                and self.song_time >= self.chart.duration
+            )
+        else:
+            finished = self.current_time - self.game_start_time >= GAME_DURATION_SECONDS
+        # 段落循環是反覆練習，不因失誤次數結束
+        too_many_misses = self.score.miss_count >= MAX_MISSES and self.loop_end is None
+        if finished or too_many_misses:
             self.audio_manager.stop_music()
+            self._close_keysounds()
+            # 結算時計算一次時機統計，供結束畫面與匯出使用
+            self.timing_stats = self.timing_analytics.compute(self.judgment_log)
             self.game_state = GameState["GAME_OVER"]
 
     def _draw(self) -> None:
         """繪製遊戲畫面"""
-        self._draw_background()
+        self._render_frame()
+        pygame.display.flip()
 
-        if self.game_state == GameState["MENU"]:
-            self._draw_menu()
+    def _render_frame(self) -> None:
+        """繪製當前狀態的畫面（不含翻頁）"""
+        self._draw_phase("draw_background", self._draw_background)
+
+        if self.game_state == GameState["LOADING"]:
+            self._draw_phase("draw_loading", self._draw_loading)
+        elif self.game_state == GameState["MENU"]:
+            self._draw_phase("draw_menu", self._draw_menu)
+        elif self.game_state == GameState["SONG_SELECT"]:
+            self._draw_phase("draw_song_select", self._draw_song_select)
         elif self.game_state == GameState["PLAYING"]:
-            self._draw_game()
+            self._draw_phase("draw_game", self._draw_game)
         elif self.game_state == GameState["PAUSED"]:
-            self._draw_game()
-            self._draw_pause_overlay()
+            self._draw_phase("draw_game", self._draw_game)
+            self._draw_phase("draw_pause_overlay", self._draw_pause_overlay)
         elif self.game_state == GameState["GAME_OVER"]:
-            self._draw_game_over()
+            self._draw_phase("draw_game_over", self._draw_game_over)
 
-        pygame.display.flip()
+        if self.profiler.overlay_visible:
+            self._draw_phase("draw_overlay", self._draw_profiler_overlay)
+
+    def _draw_phase(self, phase: str, draw_method: Callable[[], None]) -> None:
+        """執行繪製方法，啟用效能分析時記錄耗時"""
+        if not self.profiler.enabled:
+            draw_method()
+            return
+
+        start = time.perf_counter_ns()
+        draw_method()
+        self.profiler.record(phase, time.perf_counter_ns() - start)
+
+    def _draw_profiler_overlay(self) -> None:
+        """繪製效能覆蓋層（統計文字每0.5秒更新一次）"""
+        if (
+            self.current_time - self.overlay_refresh_time
+            >= self.OVERLAY_REFRESH_SECONDS
+        ):
+            self.overlay_lines = self.profiler.get_overlay_lines(self.clock.get_fps())
+            self.overlay_lines.extend(self._format_cache_stats())
+            if self.audio_manager:
+                sfx_stats = self.audio_manager.get_sfx_stats()
+                self.overlay_lines.append(
+                    "sfx play {played}  merge {coalesced}  steal {stolen}"
+                    "  drop {dropped}".format(**sfx_stats)
+                )
+            gc_stats = self.gc_control.get_stats()
+            self.overlay_lines.append(
+                "gc {collections[0]}/{collections[1]}/{collections[2]}"
+                "  play {playing_collections}  max {pause_max_ms:.1f}ms".format(
+                    **gc_stats
+                )
+            )
+            self.overlay_refresh_time = self.current_time
+
+        x, y = self.OVERLAY_POSITION
+        overlay = pygame.Surface(
+            (WINDOW_WIDTH - x, len(self.overlay_lines) * self.OVERLAY_LINE_HEIGHT + 10)
+        )
+        overlay.set_alpha(PAUSE_OVERLAY_ALPHA)
+        overlay.fill(BLACK)
+        self.screen.blit(overlay, (x - 5, y - 5))
+
+        for line in self.overlay_lines:
+            self._render_text_at(line, self.font_small, WHITE, (x, y))
+            y += self.OVERLAY_LINE_HEIGHT
+
+    def _format_cache_stats(self) -> List[str]:
+        """產生資源快取統計文字（用量/預算、命中率、淘汰次數）"""
+        lines = []
+        cache_stats = self.asset_loader.get_cache_stats()
+        if self.preview:
+            cache_stats["preview"] = self.preview.cache.get_stats()
+        if self.keysounds:
+            cache_stats["keysound"] = self.keysounds.cache.get_stats()
+        for name, stats in cache_stats.items():
+            used_mb = stats["bytes"] / BYTES_PER_MB
+            budget = (
+                f"{stats['budget_bytes'] / BYTES_PER_MB:.0f}MB"
+                if stats["budget_bytes"]
+                else "-"
+            )
+            lines.append(
+                f"{name} {used_mb:.1f}/{budget}  hit {stats['hit_rate']:.0%}"
+                f"  evict {stats['evictions']}"
+            )
+        return lines
 
     def _render_text_centered(
         self,
@@ -348,6 +990,28 @@ class GameEngine:
         surface = font.render(text, True, color)
         self.screen.blit(surface, position)
 
+    def _draw_loading(self) -> None:
+        """繪製載入畫面與進度條"""
+        progress = self.preloader.progress
+        bar_width, bar_height = self.LOADING_BAR_SIZE
+        bar_x = (WINDOW_WIDTH - bar_width) // 2
+        bar_y = WINDOW_HEIGHT // 2
+
+        self._render_text_centered(
+            f"Loading... {int(progress * 100)}%",
+            self.font_medium,
+            WHITE,
+            (WINDOW_WIDTH // 2, bar_y - 40),
+        )
+        pygame.draw.rect(
+            self.screen, GRAY, (bar_x, bar_y, bar_width, bar_height), width=2
+        )
+        pygame.draw.rect(
+            self.screen,
+            YELLOW,
+            (bar_x + 4, bar_y + 4, int((bar_width - 8) * progress), bar_height - 8),
+        )
+
     def _draw_menu(self) -> None:
         """繪製選單"""
         # 標題
@@ -368,7 +1032,12 @@ class GameEngine:
         )
 
         # 操作說明
-        instructions = ["Use Arrow Keys to Play", "ESC to Pause", "ESC in Menu to Quit"]
+        instructions = [
+            "Enter to Choose Song",
+            "Use Arrow Keys to Play",
+            "ESC to Pause",
+            "ESC in Menu to Quit",
+        ]
 
         y_offset = 450
         for instruction in instructions:
@@ -377,6 +1046,73 @@ class GameEngine:
             )
             y_offset += 30
 
+    def _draw_song_select(self) -> None:
+        """繪製選歌清單（只繪製游標附近的列，歌曲數量不影響繪製成本）"""
+        self._render_text_centered(
+            f"Select Song - {self.difficulty.current_difficulty.title()}",
+            self.font_medium,
+            WHITE,
+            (WINDOW_WIDTH // 2, 80),
+        )
+
+        # 使用游標對齊過的清單（背景掃描的新清單在 _update 中對齊）
+        songs = self.listed_songs
+        entry_count = len(songs) + 1
+        half = self.SONG_LIST_ROWS // 2
+        center_y = 280
+        for row in range(-half, half + 1):
+            index = self.song_index + row
+            if not 0 <= index < entry_count:
+                continue
+            info = songs[index - 1] if index else None
+            name = info.title if info else "Random"
+            y = center_y + row * self.SONG_LIST_ROW_HEIGHT
+            if row == 0:
+                self._render_text_centered(
+                    f"> {name} <", self.font_medium, YELLOW, (WINDOW_WIDTH // 2, y)
+                )
+            else:
+                self._render_text_centered(
+                    name, self.font_small, GRAY, (WINDOW_WIDTH // 2, y)
+                )
+
+        info = songs[self.song_index - 1] if self.song_index else None
+        details = self._format_song_details(info)
+        if info and info.playable and not self.preview.is_ready(info.path):
+            details += "  Loading preview..."
+        self._render_text_centered(
+            details, self.font_small, GRAY, (WINDOW_WIDTH // 2, 440)
+        )
+        if info:
+            if self.chart_job:
+                speed = "Loading chart..."
+            elif self.practice_job:
+                speed = f"Rendering {self.practice_rate:g}x..."
+            else:
+                speed = f"< Speed {self.practice_rate:g}x >"
+            self._render_text_centered(
+                speed, self.font_small, YELLOW, (WINDOW_WIDTH // 2, 475)
+            )
+
+        instructions = [
+            "Up/Down to Choose  Left/Right for Speed",
+            "Enter to Start  ESC to Back  L in Game to Loop",
+        ]
+        for row, instruction in enumerate(instructions):
+            self._render_text_centered(
+                instruction, self.font_small, GRAY, (WINDOW_WIDTH // 2, 520 + row * 30)
+            )
+
+    def _format_song_details(self, info: Optional[SongInfo]) -> str:
+        """將選擇的歌曲資訊格式化為選單的說明文字"""
+        count = len(self.listed_songs)
+        if info is None:
+            return f"Random Arrows  ({count} songs)"
+        minutes, seconds = divmod(int(info.duration), 60)
+        bpm = f"{info.bpm:.0f} BPM" if info.bpm else "BPM ?"
+        chart = "  Chart" if info.has_chart else ""
+        return f"{bpm}  {minutes}:{seconds:02d}{chart}  ({self.song_index}/{count})"
+
     def _draw_game(self) -> None:
         """繪製遊戲畫面"""
         # 繪製判定線與背景箭頭
@@ -409,12 +1145,12 @@ class GameEngine:
     def _draw_feedback(self) -> None:
         """繪製判定回饋"""
         for feedback in self.timing.feedback_messages:
-            age = self.current_time - feedback["time"]
+            age = self.current_time - feedback.time
             alpha = max(0, 1 - age / FEEDBACK_FADE_SECONDS)  # 淡出效果
 
             if alpha > 0:
-                text = feedback["text"]
-                color = feedback["color"]
+                text = feedback.text
+                color = feedback.color
 
                 # 繪製在判定線附近
                 self._render_text_centered(
@@ -444,15 +1180,30 @@ class GameEngine:
         accuracy_text = f"Accuracy: {accuracy:.1f}%"
         self._render_text_at(accuracy_text, self.font_small, WHITE, (50, 160))
 
+        # 練習模式
+        practice_text = self._format_practice_status()
+        if practice_text:
+            self._render_text_at(practice_text, self.font_small, YELLOW, (50, 190))
+
         self._draw_combo_effects()
 
+    def _format_practice_status(self) -> str:
+        """將練習速率與段落循環格式化為遊戲畫面的說明文字"""
+        parts = []
+        if self.chart and self.practice_rate != 1.0:
+            parts.append(f"Speed {self.practice_rate:g}x")
+        if self.loop_start is not None:
+            end = f"{self.loop_end:.1f}s" if self.loop_end is not None else "..."
+            parts.append(f"Loop {self.loop_start:.1f}s - {end}")
+        return "  ".join(parts)
+
     def _draw_combo_effects(self) -> None:
         for effect in self.score.combo_effects:
-            age = self.current_time - effect["time"]
+            age = self.current_time - effect.time
             alpha = max(0, 1 - age / COMBO_EFFECT_FADE_SECONDS)
 
             if alpha > 0:
-                text = f"{effect['combo']} COMBO!"
+                text = f"{effect.combo} COMBO!"
                 y_offset = int(age * COMBO_FLOAT_SPEED)
                 self._render_text_centered(
                     text,
@@ -535,39 +1286,158 @@ class GameEngine:
             f"Accuracy: {stats['accuracy']:.1f}%",
         ]
 
-        y_offset = 340
+        y_offset = 320
         for stat in stats_text:
             self._render_text_centered(
                 stat, self.font_small, WHITE, (WINDOW_WIDTH // 2, y_offset)
             )
-            y_offset += 30
+            y_offset += 26
+
+        # 時機誤差統計
+        for timing_line in self._format_timing_stats():
+            self._render_text_centered(
+                timing_line, self.font_small, GRAY, (WINDOW_WIDTH // 2, y_offset)
+            )
+            y_offset += 26
 
         # 操作提示
         restart_text = "ENTER to Restart"
         self._render_text_centered(
-            restart_text, self.font_medium, WHITE, (WINDOW_WIDTH // 2, 500)
+            restart_text, self.font_medium, WHITE, (WINDOW_WIDTH // 2, 510)
         )
 
-        menu_text = "ESC to Menu"
+        menu_text = "ESC to Menu  E to Export"
         self._render_text_centered(
-            menu_text, self.font_medium, WHITE, (WINDOW_WIDTH // 2, 540)
+            menu_text, self.font_medium, WHITE, (WINDOW_WIDTH // 2, 550)
         )
 
-    def _start_game(self) -> None:
-        """開始新遊戲"""
+    def _format_timing_stats(self) -> List[str]:
+        """將時機統計格式化為結束畫面的文字行"""
+        stats = self.timing_stats
+        if not stats or stats["mean_ms"] is None:
+            return []
+
+        mean = stats["mean_ms"]
+        tendency = "Early" if mean < 0 else "Late"
+        abs_percentiles = stats["abs_percentiles_ms"]
+        return [
+            f"Timing: {mean:+.1f}ms ({tendency})  SD {stats['stddev_ms']:.1f}ms",
+            f"|Error| p50 {abs_percentiles['p50']:.0f}"
+            f" / p95 {abs_percentiles['p95']:.0f}"
+            f" / p99 {abs_percentiles['p99']:.0f} ms",
+        ]
+
+    def _start_game(self, practice_audio: Optional[Path] = None) -> None:
+        """
+        開始新遊戲
+
+        Args:
+            practice_audio: 練習速率的變速音訊（已在背景產生），None 時改用原速
+        """
         self.game_state = GameState["PLAYING"]
         self.arrows.clear()
         self.score.reset()
         self.timing = Timing()
-        self.last_spawn_time = 0.0
+        self.judgment_log.reset()
+        self.timing_stats = None
+        # 讓第一支箭頭在開始時立即生成
+        self.last_spawn_time = self.current_time - self.difficulty.get_spawn_interval()
         self.last_key_press_time.clear()
         self.game_start_time = self.current_time
+        if self.autoplay:
+            self.autoplay.reset()
+
+        self.chart = self.song_chart
+        self.next_note_index = 0
+        self.music_pending = False
+        self.song_audio = self.selected_song
+        self._clear_loop()
+        if self.chart and self.practice_rate != 1.0:
+            self._apply_practice_rate(practice_audio)
+        self._close_keysounds()
+        if self.chart and self.chart.has_keysounds:
+            self.keysounds = KeysoundBank(
+                self.chart,
+                self.selected_song.parent,
+                self.audio_manager.channels,
+                self.asset_loader.audio_converter,
+                budget_from_mb(self.config.settings.assets.keysound_cache_mb),
+                volume=self.audio_manager.sfx_volume,
+            )
+        if self.chart:
+            # 第一個音符需要完整的移動時間，歌曲延後開始
+            first_note = self.chart.notes[0][0]
+            self.song_time = min(0.0, first_note - self._arrow_travel_time())
+            self.music_pending = True
+            self.audio_manager.stop_music()
+            return
 
         # 播放背景音樂
-        self.audio_manager.play_music("background.wav")
+        self.audio_manager.play_music(self.BACKGROUND_MUSIC)
+
+    def _close_keysounds(self) -> None:
+        """停止按鍵音載入並釋放樣本"""
+        if self.keysounds:
+            self.keysounds.close()
+            self.keysounds = None
+
+    def _apply_practice_rate(self, audio: Optional[Path]) -> None:
+        """
+        改用變速音訊並依速率縮放譜面時間
+
+        Args:
+            audio: 背景產生的變速音訊，None（產生失敗）時改用原速
+        """
+        if audio is None:
+            print(f"無法產生練習音訊，改用原速: {self.selected_song.name}")
+            self.practice_rate = 1.0
+            return
+        self.chart = self.chart.scaled(self.practice_rate)
+        self.song_audio = audio
+
+    def _load_chart(self, song: Path) -> Optional[Chart]:
+        """
+        載入歌曲的譜面（在背景執行緒呼叫）
+
+        歌曲旁有 .chart.json 時直接使用，否則分析音訊並依當前難度產生譜面。
+
+        Args:
+            song: 歌曲檔案路徑
+
+        Returns:
+            Chart or None: 譜面，無法產生譜面時為 None（改用隨機模式）
+        """
+        chart = None
+        sidecar = Chart.sidecar_path(song)
+        if sidecar.exists():
+            chart = Chart.load(sidecar)
+        if chart is None:
+            info = self.library.get(song)
+            analysis = self.beat_analysis.analyze(song, info.digest if info else None)
+            if analysis is not None:
+                chart = analysis.to_chart(
+                    self.difficulty, title=song.stem, audio_file=song.name
+                )
+
+        if chart is None or not chart.notes:
+            print(f"無法產生譜面，改用隨機模式: {song.name}")
+            return None
+        return chart
 
     def _cleanup(self) -> None:
         """清理資源"""
-        self.audio_manager.cleanup()
+        if self.profiler.has_samples() and self.profiler_dump_path:
+            self.profiler.dump(Path(self.profiler_dump_path))
+
+        self.config_watcher.stop()
+        self.writer.flush()
+        self.gc_control.uninstall()
+        if self.preview:
+            self.preview.close()
+        self.chart_loader.shutdown(wait=False, cancel_futures=True)
+        self.practice.shutdown()
+        self._close_keysounds()
+        if self.audio_manager:
+            self.audio_manager.cleanup()
         self.asset_loader.cleanup()
         pygame.quit()
@@ -0,0 +1,110 @@
+"""
+垃圾回收控制
+資源載入後凍結長期存在的物件，遊戲進行中停用自動回收，只在安全時機（暫停、結束、選單）回收；
+以 gc.callbacks 量測每次回收造成的停頓
+"""
+
+import gc
+import time
+from typing import Any, Dict, Optional
+
+from .profiler import NS_PER_MS, PhaseHistogram
+
+
+class GcController:
+    """
+    垃圾回收控制類別
+
+    每個影格的回饋、特效字典與文字 Surface 大多由參考計數立即釋放，
+    自動回收只為了處理循環參考，卻可能在歌曲中途造成 10-30ms 的第二代回收停頓。
+    遊戲進行中延後到下一個安全時機再回收，期間累積的循環參考不多。
+    """
+
+    # 進入安全時機時回收的世代（2 為完整回收）
+    SAFE_POINT_GENERATION = 2
+
+    def __init__(
+        self, histogram: Optional[PhaseHistogram] = None, enabled: bool = True
+    ):
+        """
+        Args:
+            histogram: 記錄回收停頓的直方圖（如效能分析器的 gc_pause 階段），
+                None 時自行建立
+            enabled: 是否在遊戲進行中停用自動回收（False 時只量測停頓）
+        """
+        self.histogram = histogram if histogram is not None else PhaseHistogram()
+        self.enabled = enabled
+        self.playing = False
+        self.collections = [0, 0, 0]
+        self.playing_collections = 0  # 遊戲進行中發生的回收次數
+        self.playing_max_ns = 0
+        self.collected = 0
+        self._start_ns = 0
+        self._installed = False
+
+    def install(self) -> None:
+        """註冊回收停頓量測"""
+        if not self._installed:
+            gc.callbacks.append(self._on_gc)
+            self._installed = True
+
+    def uninstall(self) -> None:
+        """移除回收停頓量測，並恢復自動回收"""
+        if self._installed:
+            gc.callbacks.remove(self._on_gc)
+            self._installed = False
+        self.playing = False
+        gc.enable()
+
+    def freeze(self) -> None:
+        """
+        回收一次後凍結目前所有物件（資源載入完成時呼叫）
+
+        凍結的物件移入永久世代，之後的回收不再掃描字體、圖片快取等長期存在的物件。
+        """
+        gc.collect()
+        gc.freeze()
+
+    def set_playing(self, playing: bool) -> None:
+        """
+        更新是否在遊戲進行中（每個影格呼叫，只在狀態改變時動作）
+
+        Args:
+            playing: 目前是否為遊戲進行中
+        """
+        if playing == self.playing:
+            return
+        self.playing = playing
+        if playing:
+            if self.enabled:
+                gc.disable()
+        elif self.enabled:
+            gc.enable()
+            gc.collect(self.SAFE_POINT_GENERATION)
+
+    def _on_gc(self, phase: str, info: Dict[str, Any]) -> None:
+        """gc.callbacks 回呼：量測回收停頓"""
+        if phase == "start":
+            self._start_ns = time.perf_counter_ns()
+            return
+        elapsed_ns = time.perf_counter_ns() - self._start_ns
+        self.histogram.record(elapsed_ns)
+        self.collections[info["generation"]] += 1
+        self.collected += info["collected"]
+        if self.playing:
+            self.playing_collections += 1
+            if elapsed_ns > self.playing_max_ns:
+                self.playing_max_ns = elapsed_ns
+
+    def get_stats(self) -> Dict[str, Any]:
+        """取得回收統計（各世代次數、遊戲進行中的次數與最長停頓、凍結的物件數）"""
+        return {
+            "enabled": self.enabled,
+            "collections": list(self.collections),
+            "collected": self.collected,
+            "pause_max_ms": round(self.histogram.max_ns / NS_PER_MS, 4),
+            "pause_total_ms": round(self.histogram.total_ns / NS_PER_MS, 4),
+            "playing_collections": self.playing_collections,
+            "playing_pause_max_ms": round(self.playing_max_ns / NS_PER_MS, 4),
+            "frozen": gc.get_freeze_count(),
+        }
@@ -0,0 +1,70 @@
+"""
+無頭模式輔助工具
+以 SDL dummy 驅動建立遊戲引擎，供基準測試與自動化測試使用
+"""
+
+import os
+
+from .constants import GameState
+
+
+def create_headless_engine():
+    """
+    建立不開啟實體視窗與音效裝置的遊戲引擎，並等待資源載入完成
+
+    必須在 pygame 初始化顯示前設定 SDL 驅動，因此延遲匯入引擎。
+
+    Returns:
+        GameEngine: 遊戲引擎
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    from .engine import GameEngine
+
+    engine = GameEngine()
+    engine.wait_for_assets()
+    return engine
+
+
+def step_frame(engine, dt: float, render: bool = True) -> None:
+    """
+    以固定時間步長推進一個影格
+
+    Args:
+        engine: 遊戲引擎
+        dt: 時間步長（秒）
+        render: 是否繪製畫面
+    """
+    engine.current_time += dt
+    engine._handle_events()
+    engine._update(dt)
+    if render:
+        engine._draw()
+
+
+def start_session(
+    engine, difficulty: str = "EASY", song=None, rate: float = 1.0
+) -> None:
+    """
+    直接開始一場遊戲（略過選單）
+
+    Args:
+        engine: 遊戲引擎
+        difficulty: 難度名稱
+        song: 歌曲檔案路徑，None 表示隨機生成箭頭
+        rate: 練習速率（變速音訊未快取時在目前行程產生）
+    """
+    engine.difficulty.set_difficulty(difficulty)
+    engine.selected_song = song
+    engine.practice_rate = rate
+    engine.song_chart = engine._load_chart(song) if song is not None else None
+    practice_audio = None
+    if engine.song_chart is not None and rate != 1.0:
+        practice_audio = engine.practice.render(song, rate)
+    engine._start_game(practice_audio)
+
+
+def is_playing(engine) -> bool:
+    """遊戲是否進行中"""
+    return engine.game_state == GameState["PLAYING"]
@@ -0,0 +1,230 @@
+"""
+按鍵音
+依譜面宣告的樣本，在演奏位置前方於背景載入、後方釋放，
+以位元組預算的 LRU 快取限制記憶體用量
+"""
+
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import pygame
+
+from utils.asset_cache import AssetCache, sound_bytes
+from utils.audio_convert import AudioConverter
+
+from .chart import Chart
+from .sfx_channels import SfxChannelManager
+
+
+class KeysoundBank:
+    """
+    按鍵音樣本庫類別
+
+    音符進入前方 LOOKAHEAD_SECONDS 的視窗時排程載入並釘選樣本，通過判定線
+    RELEASE_DELAY_SECONDS 後取消釘選；之後不再使用的樣本立即釋放，其餘留在 LRU
+    快取中，超出預算時淘汰。視窗外的樣本不佔記憶體，大型譜面的用量只取決於視窗內的樣本。
+    觸發時只查詢快取並交給保留聲道播放，不讀檔也不建立物件。
+    """
+
+    LOOKAHEAD_SECONDS = 4.0
+    RELEASE_DELAY_SECONDS = 0.5
+    CHANNEL_CATEGORY = "keysound"
+    DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024
+
+    def __init__(
+        self,
+        chart: Chart,
+        sample_dir: Path,
+        channels: SfxChannelManager,
+        converter: Optional[AudioConverter] = None,
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        volume: float = 1.0,
+    ):
+        """
+        Args:
+            chart: 宣告按鍵音的譜面
+            sample_dir: 樣本檔案所在目錄（譜面所在目錄）
+            channels: 音效聲道管理器（需有 keysound 類別）
+            converter: 音訊格式轉換器，None 時直接由 SDL 載入
+            budget_bytes: 樣本快取的位元組預算
+            volume: 按鍵音音量 (0.0 - 1.0)
+        """
+        self.paths = {name: sample_dir / file for name, file in chart.samples.items()}
+        self.channels = channels
+        self.converter = converter
+        self.volume = volume
+        self.cache = AssetCache("keysound", budget_bytes, sound_bytes)
+
+        self._times = [time for time, _ in chart.notes]
+        self._samples = chart.note_samples
+        self._last_use: Dict[str, int] = {}
+        for index, sample in enumerate(self._samples):
+            if sample:
+                self._last_use[sample] = index
+
+        # 視窗為 [_behind, _ahead) 的音符；樣本在視窗內的音符數大於 0 時釘選
+        self._ahead = 0
+        self._behind = 0
+        self._window_counts: Dict[str, int] = {}
+        self._requested: Set[str] = set()
+
+        # 統計
+        self.triggered = 0
+        self.late = 0
+        self.released = 0
+
+        # 以下欄位由 _lock 保護，與背景執行緒共用
+        self._lock = threading.Condition()
+        self._wanted: List[str] = []
+        self._ready: List[tuple] = []
+        self._stopped = False
+
+        self._thread = threading.Thread(
+            target=self._worker, name="keysound-loader", daemon=True
+        )
+        self._thread.start()
+
+    def update(self, song_time: float) -> None:
+        """
+        每個影格呼叫：收取載入完成的樣本，移動前方與後方視窗
+
+        Args:
+            song_time: 歌曲時間（秒）
+        """
+        if self._ready:
+            with self._lock:
+                self._store_ready()
+
+        times, samples, counts = self._times, self._samples, self._window_counts
+        horizon = song_time + self.LOOKAHEAD_SECONDS
+        requests = []
+        while self._ahead < len(times) and times[self._ahead] <= horizon:
+            sample = samples[self._ahead]
+            self._ahead += 1
+            if not sample:
+                continue
+            count = counts.get(sample, 0)
+            counts[sample] = count + 1
+            if count == 0:
+                self.cache.pin(sample)
+                if sample not in self.cache and sample not in self._requested:
+                    self._requested.add(sample)
+                    requests.append(sample)
+
+        release_time = song_time - self.RELEASE_DELAY_SECONDS
+        while self._behind < self._ahead and times[self._behind] < release_time:
+            sample = samples[self._behind]
+            self._behind += 1
+            if sample:
+                self._leave_window(sample, self._behind - 1)
+
+        if requests:
+            with self._lock:
+                self._wanted.extend(requests)
+                self._lock.notify()
+
+    def seek(self, song_time: float) -> None:
+        """
+        跳到指定的歌曲時間（段落循環回到起點時呼叫），重新計算視窗
+
+        Args:
+            song_time: 歌曲時間（秒）
+        """
+        for sample in self._window_counts:
+            self.cache.unpin(sample)
+        self._window_counts.clear()
+        start = bisect_left(self._times, song_time - self.RELEASE_DELAY_SECONDS)
+        self._ahead = self._behind = start
+        self.update(song_time)
+
+    def trigger(self, sample: str) -> bool:
+        """
+        播放按鍵音
+
+        Args:
+            sample: 樣本名稱
+
+        Returns:
+            bool: 是否播放（樣本尚未載入完成時為 False）
+        """
+        sound = self.cache.get(sample)
+        if sound is None:
+            self.late += 1
+            return False
+        self.channels.play(sample, sound, self.CHANNEL_CATEGORY)
+        self.triggered += 1
+        return True
+
+    def close(self) -> None:
+        """停止背景執行緒並釋放所有樣本"""
+        with self._lock:
+            self._stopped = True
+            self._wanted.clear()
+            self._lock.notify()
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        取得按鍵音統計
+
+        Returns:
+            Dict[str, int]: 播放、未及載入、釋放次數與目前的樣本數、位元組數
+        """
+        return {
+            "triggered": self.triggered,
+            "late": self.late,
+            "released": self.released,
+            "loaded": len(self.cache),
+            "bytes": self.cache.total_bytes,
+        }
+
+    def _leave_window(self, sample: str, index: int) -> None:
+        """音符離開視窗：樣本不再有視窗內的音符時取消釘選，之後不再使用則立即釋放"""
+        counts = self._window_counts
+        counts[sample] -= 1
+        if counts[sample]:
+            return
+        del counts[sample]
+        self.cache.unpin(sample)
+        if self._last_use[sample] <= index and sample in self.cache:
+            self.cache.discard(sample)
+            self.released += 1
+
+    def _store_ready(self) -> None:
+        """將載入完成的樣本放入快取（需持有 _lock，只在主執行緒呼叫）"""
+        for sample, sound in self._ready:
+            self._requested.discard(sample)
+            if sound is None:
+                continue
+            sound.set_volume(self.volume)
+            # 載入期間已離開視窗且不再使用的樣本直接丟棄
+            if sample in self._window_counts or self._last_use[sample] >= self._ahead:
+                self.cache.put(sample, sound)
+        self._ready.clear()
+
+    def _worker(self) -> None:
+        """背景執行緒：依進入視窗的順序載入樣本"""
+        while True:
+            with self._lock:
+                while not self._wanted and not self._stopped:
+                    self._lock.wait()
+                if self._stopped:
+                    return
+                sample = self._wanted.pop(0)
+
+            sound = self._load(self.paths.get(sample))
+            with self._lock:
+                self._ready.append((sample, sound))
+
+    def _load(self, path: Optional[Path]) -> Optional[pygame.mixer.Sound]:
+        """載入樣本並轉換為混音器格式"""
+        if path is None:
+            return None
+        try:
+            sound = self.converter.load_sound(path) if self.converter else None
+            return sound or pygame.mixer.Sound(str(path))
+        except (OSError, pygame.error) as e:
+            print(f"載入按鍵音失敗 {path.name}: {e}")
+            return None
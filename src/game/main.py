@@ -2,6 +2,7 @@
 跳舞機遊戲主程式入口
 """
 
+import argparse
 import sys
 import os
 import pygame
@@ -11,13 +12,28 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from game.engine import GameEngine
+from game.autoplay import SKILL_PROFILES, AutoplayBot
+
+
+def parse_args() -> argparse.Namespace:
+    """解析命令列參數"""
+    parser = argparse.ArgumentParser(description="跳舞機遊戲")
+    parser.add_argument(
+        "--autoplay",
+        choices=sorted(SKILL_PROFILES),
+        help="由自動遊玩機器人以指定技巧設定進行遊戲",
+    )
+    return parser.parse_args()
 
 
 def main():
     """主程式入口"""
+    args = parse_args()
     try:
         # 建立並執行遊戲引擎
         game = GameEngine()
+        if args.autoplay:
+            game.set_autoplay(AutoplayBot.from_profile(args.autoplay))
         game.run()
     except KeyboardInterrupt:
         print("遊戲被中斷")
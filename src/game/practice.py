@@ -0,0 +1,331 @@
+"""
+練習模式
+以 WSOLA 變速不變調預先算出放慢的歌曲（行程池、磁碟快取），並預先切出段落循環用的音訊
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from utils.audio_convert import (
+    StreamingWavWriter,
+    WavBlockReader,
+    convert_channels,
+    resample,
+    to_int16,
+)
+from utils.persistence import atomic_output
+
+from .beat_analysis import BeatAnalysisCache
+
+
+class WsolaStretcher:
+    """
+    WSOLA（波形相似疊加）變速器類別
+
+    輸出的第 k 個影格取自輸入約 k × 分析跳距處，在容許範圍內搜尋與上一個影格
+    自然延續最相似的位置，以漢寧窗疊加。只改變速度不改變音高；取樣分塊送入，
+    只保留搜尋所需的輸入，長篇歌曲的記憶體用量固定。
+    輸出時間 = 輸入時間 / 速率，位置誤差不超過搜尋容許範圍，不會累積。
+    """
+
+    # 影格長度（秒，取最接近的 2 的冪次取樣數）與搜尋範圍（影格長度的比例）
+    FRAME_SECONDS = 0.025
+    TOLERANCE_RATIO = 0.25
+
+    def __init__(self, rate: float, sample_rate: int, channels: int = 1):
+        """
+        Args:
+            rate: 播放速率（0.75 表示放慢為 75% 速度）
+            sample_rate: 取樣率
+            channels: 聲道數
+        """
+        if rate <= 0:
+            raise ValueError(f"播放速率必須大於 0: {rate}")
+        self.rate = rate
+        self.channels = channels
+        self.frame = 1 << int(round(np.log2(self.FRAME_SECONDS * sample_rate)))
+        self.hop = self.frame // 2
+        self.tolerance = int(self.frame * self.TOLERANCE_RATIO)
+        self.analysis_hop = self.hop * rate
+
+        # 週期性漢寧窗在半影格跳距下疊加總和為 1
+        self.window = np.hanning(self.frame + 1)[:-1].astype(np.float32)[:, np.newaxis]
+        self._fft_size = 1 << int(np.ceil(np.log2(self.frame + 2 * self.tolerance)))
+
+        # 輸入緩衝區前方補 tolerance 個零，第 0 個影格也能向前搜尋
+        self._buffer = np.zeros((self.tolerance, channels), dtype=np.float32)
+        self._buffer_start = 0
+        self._overlap = np.zeros((self.frame, channels), dtype=np.float32)
+        self._index = 0
+        self._previous: Optional[int] = None
+        self._input_frames = 0
+        self._emitted = 0
+
+    def feed(self, samples: np.ndarray) -> np.ndarray:
+        """
+        送入取樣並取得已完成的輸出
+
+        Args:
+            samples: float32 取樣陣列 [影格數, 聲道數]
+
+        Returns:
+            np.ndarray: 已完成的輸出取樣 [影格數, 聲道數]（可能為空）
+        """
+        self._input_frames += samples.shape[0]
+        self._buffer = np.concatenate([self._buffer, samples.astype(np.float32)])
+        output = self._process()
+        self._emitted += output.shape[0]
+        return output
+
+    def finish(self) -> np.ndarray:
+        """
+        補零處理剩餘的輸入
+
+        Returns:
+            np.ndarray: 剩餘的輸出取樣，總長度為輸入長度 / 速率
+        """
+        target = int(round(self._input_frames / self.rate))
+        padding = np.zeros((self.frame + 2 * self.tolerance, self.channels), np.float32)
+        chunks = []
+        while self._emitted < target:
+            self._buffer = np.concatenate([self._buffer, padding])
+            output = self._process()
+            chunks.append(output[: target - self._emitted])
+            self._emitted += output.shape[0]
+        if not chunks:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return np.concatenate(chunks)
+
+    def _process(self) -> np.ndarray:
+        """處理緩衝區內所有可完成的影格"""
+        frame, hop, tolerance = self.frame, self.hop, self.tolerance
+        buffer_end = self._buffer_start + self._buffer.shape[0]
+        chunks = []
+        while True:
+            # 補零後的座標：輸入的第 i 個取樣位於 i + tolerance
+            nominal = int(round(self._index * self.analysis_hop)) + tolerance
+            needed = nominal + tolerance + frame
+            if self._previous is not None:
+                needed = max(needed, self._previous + hop + frame)
+            if needed > buffer_end:
+                break
+
+            position = nominal if self._previous is None else self._search(nominal)
+            start = position - self._buffer_start
+            self._overlap += self._buffer[start : start + frame] * self.window
+            chunks.append(self._overlap[:hop].copy())
+            self._overlap[:-hop] = self._overlap[hop:]
+            self._overlap[-hop:] = 0
+            self._previous = position
+            self._index += 1
+
+        # 丟棄之後不會再用到的輸入
+        nominal = int(round(self._index * self.analysis_hop)) + tolerance
+        keep_from = nominal - tolerance
+        if self._previous is not None:
+            keep_from = min(keep_from, self._previous + hop)
+        drop = keep_from - self._buffer_start
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._buffer_start = keep_from
+
+        if not chunks:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return np.concatenate(chunks)
+
+    def _search(self, nominal: int) -> int:
+        """在名目位置 ± tolerance 內找出與上一影格自然延續相關性最高的位置"""
+        frame, tolerance, size = self.frame, self.tolerance, self._fft_size
+        continuation = self._previous + self.hop - self._buffer_start
+        region_start = nominal - tolerance - self._buffer_start
+        template = self._buffer[continuation : continuation + frame].sum(axis=1)
+        region = self._buffer[region_start : region_start + frame + 2 * tolerance]
+        region = region.sum(axis=1)
+        spectrum = np.fft.rfft(region, size) * np.conj(np.fft.rfft(template, size))
+        correlation = np.fft.irfft(spectrum, size)[: 2 * tolerance + 1]
+        return nominal - tolerance + int(np.argmax(correlation))
+
+
+def render_stretched(song_path: str, output_path: str, rate: float) -> str:
+    """
+    分塊讀取歌曲、變速後原子寫入 WAV（供行程池呼叫）
+
+    Args:
+        song_path: 原始歌曲路徑
+        output_path: 輸出路徑
+        rate: 播放速率
+
+    Returns:
+        str: 輸出路徑
+    """
+    with (
+        WavBlockReader(Path(song_path)) as reader,
+        atomic_output(Path(output_path)) as temp_path,
+    ):
+        stretcher = WsolaStretcher(rate, reader.sample_rate, reader.channels)
+        with StreamingWavWriter(temp_path, reader.sample_rate, reader.channels) as out:
+            for block in reader.blocks():
+                out.write(stretcher.feed(block))
+            out.write(stretcher.finish())
+    return output_path
+
+
+def load_section(
+    file_path: Path, start: float, end: float
+) -> Optional[pygame.mixer.Sound]:
+    """
+    預先切出歌曲段落並轉為混音器格式，循環時直接重播不需重新讀檔
+
+    Args:
+        file_path: WAV 檔案路徑
+        start: 段落開始時間（秒）
+        end: 段落結束時間（秒）
+
+    Returns:
+        pygame.mixer.Sound or None: 段落音訊，讀取失敗時為 None
+    """
+    try:
+        with WavBlockReader(file_path) as reader:
+            rate = reader.sample_rate
+            reader.seek(int(start * rate))
+            samples = reader.read(max(0, int((end - start) * rate)))
+    except (OSError, EOFError, ValueError) as e:
+        print(f"載入練習段落失敗: {e}")
+        return None
+
+    frequency, _, channels = pygame.mixer.get_init()
+    samples = resample(convert_channels(samples, channels), rate, frequency)
+    return pygame.mixer.Sound(buffer=to_int16(samples).tobytes())
+
+
+class PracticeRenderer:
+    """
+    練習音訊產生器類別
+
+    變速結果以「歌曲內容雜湊 + 速率」為鍵存於磁碟，同一首歌的同一速率只計算一次。
+    遊戲中以行程池在背景計算，不佔用主執行緒與 GIL。
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_dir: Path, workers: Optional[int] = None):
+        """
+        Args:
+            cache_dir: 變速音訊的快取目錄
+            workers: 行程池大小，None 表示依 CPU 核心數
+        """
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[Tuple[str, float], Future] = {}
+        # 已完成的變速音訊路徑，再次使用時不需重新計算雜湊
+        self._rendered: Dict[Tuple[str, float], Path] = {}
+
+    def cached_path(
+        self, song_path: Path, rate: float, digest: Optional[str] = None
+    ) -> Path:
+        """
+        取得變速音訊的快取路徑
+
+        Args:
+            song_path: 原始歌曲路徑
+            rate: 播放速率
+            digest: 歌曲內容雜湊（歌曲庫已計算時傳入，略過重新計算）
+
+        Returns:
+            Path: 快取檔案路徑
+        """
+        digest = digest or BeatAnalysisCache.file_digest(song_path)
+        name = f"{digest}_{int(round(rate * 1000))}_v{self.VERSION}.wav"
+        return self.cache_dir / name
+
+    def render(
+        self, song_path: Path, rate: float, digest: Optional[str] = None
+    ) -> Optional[Path]:
+        """
+        在目前行程取得變速音訊（已快取時直接回傳）
+
+        Args:
+            song_path: 原始歌曲路徑
+            rate: 播放速率
+            digest: 歌曲內容雜湊
+
+        Returns:
+            Path or None: 變速音訊路徑，失敗時為 None
+        """
+        key = (str(song_path), rate)
+        rendered = self._rendered.get(key)
+        if rendered is not None and rendered.exists():
+            return rendered
+
+        try:
+            output = self.cached_path(song_path, rate, digest)
+            if not output.exists():
+                output.parent.mkdir(parents=True, exist_ok=True)
+                render_stretched(str(song_path), str(output), rate)
+            self._rendered[key] = output
+            return output
+        except (OSError, EOFError, ValueError) as e:
+            print(f"產生練習音訊失敗 {song_path.name}: {e}")
+            return None
+
+    def submit(
+        self, song_path: Path, rate: float, digest: Optional[str] = None
+    ) -> Future:
+        """
+        排入行程池計算（同一首歌的同一速率計算中時不重複排入）
+
+        雜湊計算與快取檢查也在工作行程進行，主執行緒不需讀取整首歌。
+
+        Args:
+            song_path: 原始歌曲路徑
+            rate: 播放速率
+            digest: 歌曲內容雜湊
+
+        Returns:
+            Future: 計算工作，結果為變速音訊路徑字串，失敗時為 None
+        """
+        key = (str(song_path), rate)
+        rendered = self._rendered.get(key)
+        if rendered is not None and rendered.exists():
+            job = Future()
+            job.set_result(str(rendered))
+            return job
+
+        job = self._jobs.get(key)
+        if job is not None and not (
+            job.done() and (job.exception() or job.result() is None)
+        ):
+            return job
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        job = self._executor.submit(
+            _render_job, str(self.cache_dir), str(song_path), rate, digest
+        )
+        job.add_done_callback(lambda done: self._remember(key, done))
+        self._jobs[key] = job
+        return job
+
+    def _remember(self, key: Tuple[str, float], job: Future) -> None:
+        """記錄背景計算完成的路徑（於行程池的管理執行緒呼叫）"""
+        if not job.cancelled() and job.exception() is None and job.result():
+            self._rendered[key] = Path(job.result())
+
+    def shutdown(self) -> None:
+        """停止行程池（不等待計算中的工作）"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _render_job(
+    cache_dir: str, song_path: str, rate: float, digest: Optional[str]
+) -> Optional[str]:
+    """行程池工作：取得變速音訊並回傳路徑"""
+    output = PracticeRenderer(Path(cache_dir)).render(Path(song_path), rate, digest)
+    return str(output) if output else None
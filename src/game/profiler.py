@@ -0,0 +1,194 @@
+"""
+影格效能分析器
+以 perf_counter_ns 量測每個影格各階段的耗時，累積至固定大小的直方圖
+"""
+
+import csv
+import json
+from bisect import bisect_left
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, List
+
+NS_PER_MS = 1_000_000
+
+
+class PhaseHistogram:
+    """
+    單一階段的耗時直方圖
+
+    固定寬度分箱，超出上限的樣本歸入最後一箱；
+    記錄時只做整數運算，不配置任何物件。
+    """
+
+    BUCKET_NS = 50_000  # 每箱 0.05ms
+    BUCKET_COUNT = 2000  # 涵蓋 0 ~ 100ms
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKET_COUNT
+        self.sample_count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int) -> None:
+        """記錄一次耗時"""
+        index = elapsed_ns // self.BUCKET_NS
+        if index >= self.BUCKET_COUNT:
+            index = self.BUCKET_COUNT - 1
+        self.counts[index] += 1
+        self.sample_count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def percentile_ms(self, percentile: float) -> float:
+        """
+        取得百分位數耗時（以分箱上緣估計）
+
+        Args:
+            percentile: 百分位數 (0 - 100)
+
+        Returns:
+            float: 耗時（毫秒）
+        """
+        if self.sample_count == 0:
+            return 0.0
+        target = self.sample_count * percentile / 100.0
+        index = bisect_left(list(accumulate(self.counts)), target)
+        return (index + 1) * self.BUCKET_NS / NS_PER_MS
+
+    def mean_ms(self) -> float:
+        """取得平均耗時（毫秒）"""
+        if self.sample_count == 0:
+            return 0.0
+        return self.total_ns / self.sample_count / NS_PER_MS
+
+    def reset(self) -> None:
+        """清除所有樣本"""
+        self.counts = [0] * self.BUCKET_COUNT
+        self.sample_count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+
+class FrameProfiler:
+    """影格效能分析器類別"""
+
+    FRAME_PHASE = "frame"
+    # 垃圾回收停頓（由 gc.callbacks 記錄，已包含在所在影格的耗時中）
+    GC_PHASE = "gc_pause"
+    PHASES = (
+        "events",
+        "update",
+        "draw_background",
+        "draw_loading",
+        "draw_menu",
+        "draw_game",
+        "draw_pause_overlay",
+        "draw_game_over",
+        "draw_overlay",
+        "flip",
+        GC_PHASE,
+        FRAME_PHASE,
+    )
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.overlay_visible = False
+        self.histograms: Dict[str, PhaseHistogram] = {
+            phase: PhaseHistogram() for phase in self.PHASES
+        }
+
+    def record(self, phase: str, elapsed_ns: int) -> None:
+        """
+        記錄階段耗時
+
+        Args:
+            phase: 階段名稱
+            elapsed_ns: 耗時（奈秒）
+        """
+        self.histograms[phase].record(elapsed_ns)
+
+    def toggle_overlay(self) -> bool:
+        """
+        切換效能覆蓋層，顯示時一併啟用量測
+
+        Returns:
+            bool: 覆蓋層是否顯示
+        """
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enabled = True
+        return self.overlay_visible
+
+    def has_samples(self) -> bool:
+        """是否已有任何影格樣本"""
+        return self.histograms[self.FRAME_PHASE].sample_count > 0
+
+    def get_summary(self) -> Dict[str, Dict[str, float]]:
+        """取得各階段的統計摘要（毫秒）"""
+        summary = {}
+        for phase, histogram in self.histograms.items():
+            if histogram.sample_count == 0:
+                continue
+            summary[phase] = {
+                "samples": histogram.sample_count,
+                "mean_ms": round(histogram.mean_ms(), 4),
+                "p50_ms": histogram.percentile_ms(50),
+                "p99_ms": histogram.percentile_ms(99),
+                "max_ms": round(histogram.max_ns / NS_PER_MS, 4),
+            }
+        return summary
+
+    def get_overlay_lines(self, fps: float) -> List[str]:
+        """
+        產生覆蓋層顯示文字
+
+        Args:
+            fps: 目前的影格率
+
+        Returns:
+            List[str]: 文字行
+        """
+        summary = self.get_summary()
+        frame = summary.get(self.FRAME_PHASE)
+        frame_p99 = frame["p99_ms"] if frame else 0.0
+        lines = [f"FPS {fps:.1f}  p99 {frame_p99:.2f}ms"]
+        for phase, stats in summary.items():
+            if phase == self.FRAME_PHASE:
+                continue
+            lines.append(f"{phase} {stats['mean_ms']:.2f} / {stats['p99_ms']:.2f}ms")
+        return lines
+
+    def dump(self, file_path: Path) -> bool:
+        """
+        匯出統計摘要，依副檔名選擇 CSV 或 JSON
+
+        Args:
+            file_path: 匯出檔案路徑
+
+        Returns:
+            bool: 匯出是否成功
+        """
+        summary = self.get_summary()
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(file_path, "w", encoding="utf-8", newline="") as f:
+                if file_path.suffix.lower() == ".csv":
+                    writer = csv.writer(f)
+                    writer.writerow(
+                        ["phase", "samples", "mean_ms", "p50_ms", "p99_ms", "max_ms"]
+                    )
+                    for phase, stats in summary.items():
+                        writer.writerow([phase, *stats.values()])
+                else:
+                    json.dump(summary, f, indent=2, ensure_ascii=False)
+            return True
+        except Exception as e:
+            print(f"匯出效能統計失敗: {e}")
+            return False
+
+    def reset(self) -> None:
+        """清除所有階段的樣本"""
+        for histogram in self.histograms.values():
+            histogram.reset()
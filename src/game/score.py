@@ -5,6 +5,9 @@
 
 from typing import Dict, List, Tuple, Union
 
+from .constants import COMBO_EFFECT_QUEUE_CAPACITY
+from .effect_queue import EffectQueue
+
 
 class Score:
     """計分系統類別"""
@@ -19,7 +22,9 @@ class Score:
     def __init__(self):
         # 分數歷史記錄
         self.score_history: List[Dict] = []
-        self.combo_effects: List[Dict] = []
+        self.combo_effects = EffectQueue(
+            COMBO_EFFECT_QUEUE_CAPACITY, self.COMBO_EFFECT_DURATION
+        )
         self.last_combo_time = 0
 
         self.reset()
@@ -84,7 +89,7 @@ class Score:
     def _trigger_combo_effect(self, current_time: float) -> None:
         """觸發連擊特效"""
         self.last_combo_time = current_time
-        self.combo_effects.append({"time": current_time, "combo": self.combo})
+        self.combo_effects.push(current_time, combo=self.combo)
 
     def _record_score_history(
         self, judgment: str, score: int, current_time: float
@@ -136,10 +141,5 @@ class Score:
         self.combo_effects.clear()
 
     def update_combo_effects(self, current_time: float) -> None:
-        """更新連擊特效，移除過期效果"""
-        self.combo_effects = [
-            effect
-            for effect in self.combo_effects
-            if current_time - effect["time"]
-            < self.COMBO_EFFECT_DURATION  # 2秒後移除特效
-        ]
+        """更新連擊特效，從佇列頭端移除過期效果（2秒後移除）"""
+        self.combo_effects.expire(current_time)
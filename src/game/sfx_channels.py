@@ -0,0 +1,155 @@
+"""
+音效聲道管理
+為各類音效保留固定聲道，聲道用盡時依優先權搶占，同一影格的相同音效只播放一次
+"""
+
+from typing import Dict, List, Optional, Set
+
+import pygame
+
+
+class ChannelGroup:
+    """一個音效類別所保留的聲道"""
+
+    def __init__(self, name: str, channels: List[pygame.mixer.Channel]):
+        self.name = name
+        self.channels = channels
+        # 各聲道目前播放中音效的優先權與開始序號（用於選出最舊的聲音）
+        self.priorities = [0] * len(channels)
+        self.started = [0] * len(channels)
+
+
+class SfxChannelManager:
+    """
+    音效聲道管理器類別
+
+    保留的聲道不會被 Sound.play() 自動選用，因此每類音效的成本有上限，
+    也不會與其他類別搶奪聲道。
+    """
+
+    def __init__(self, categories: Dict[str, int]):
+        """
+        Args:
+            categories: 類別名稱對應保留的聲道數
+        """
+        self.groups: Dict[str, ChannelGroup] = {}
+        self.reserved_count = 0
+        self._sequence = 0
+        self._played_this_frame: Set[str] = set()
+
+        # 統計
+        self.played = 0
+        self.coalesced = 0
+        self.stolen = 0
+        self.dropped = 0
+
+        for name, count in categories.items():
+            self.add_category(name, count)
+
+    def add_category(self, name: str, count: int) -> ChannelGroup:
+        """
+        新增音效類別並保留聲道
+
+        Args:
+            name: 類別名稱
+            count: 保留的聲道數
+
+        Returns:
+            ChannelGroup: 類別的聲道群組
+        """
+        start = self.reserved_count
+        self.reserved_count += count
+        if pygame.mixer.get_num_channels() < self.reserved_count:
+            pygame.mixer.set_num_channels(self.reserved_count)
+        pygame.mixer.set_reserved(self.reserved_count)
+
+        group = ChannelGroup(
+            name, [pygame.mixer.Channel(index) for index in range(start, start + count)]
+        )
+        self.groups[name] = group
+        return group
+
+    def begin_frame(self) -> None:
+        """開始新的影格（重設同影格合併的記錄）"""
+        if self._played_this_frame:
+            self._played_this_frame.clear()
+
+    def play(
+        self,
+        key: str,
+        sound: pygame.mixer.Sound,
+        category: str,
+        priority: int = 0,
+    ) -> Optional[pygame.mixer.Channel]:
+        """
+        在類別的保留聲道播放音效
+
+        Args:
+            key: 音效識別名稱（同影格相同名稱只播放一次）
+            sound: 音效
+            category: 音效類別
+            priority: 優先權，數值越大越重要
+
+        Returns:
+            pygame.mixer.Channel or None: 使用的聲道，合併或捨棄時為 None
+        """
+        if key in self._played_this_frame:
+            self.coalesced += 1
+            return None
+
+        group = self.groups[category]
+        index = self._find_channel(group, priority)
+        if index is None:
+            self.dropped += 1
+            return None
+
+        self._played_this_frame.add(key)
+        self._sequence += 1
+        group.priorities[index] = priority
+        group.started[index] = self._sequence
+        channel = group.channels[index]
+        channel.play(sound)
+        self.played += 1
+        return channel
+
+    def _find_channel(self, group: ChannelGroup, priority: int) -> Optional[int]:
+        """
+        找出可用的聲道：優先使用閒置聲道，否則搶占優先權最低且最舊的聲音
+
+        Returns:
+            Optional[int]: 聲道索引，所有聲音的優先權都較高時為 None
+        """
+        victim = None
+        for index, channel in enumerate(group.channels):
+            if not channel.get_busy():
+                return index
+            if victim is None or (group.priorities[index], group.started[index]) < (
+                group.priorities[victim],
+                group.started[victim],
+            ):
+                victim = index
+
+        if victim is None or group.priorities[victim] > priority:
+            return None
+        self.stolen += 1
+        return victim
+
+    def stop(self) -> None:
+        """停止所有保留聲道"""
+        for group in self.groups.values():
+            for channel in group.channels:
+                channel.stop()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        取得聲道統計
+
+        Returns:
+            Dict[str, int]: 播放、合併、搶占與捨棄次數
+        """
+        return {
+            "played": self.played,
+            "coalesced": self.coalesced,
+            "stolen": self.stolen,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,224 @@
+"""
+程序化歌曲產生器
+依 BPM 以鼓組與貝斯樣式組成長篇歌曲，逐小節串流寫入 WAV，並產生對齊節拍的譜面
+"""
+
+import math
+import random
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.audio_convert import StreamingWavWriter
+
+from .chart import Chart
+from .constants import ARROW_DIRECTIONS
+from .synth import (
+    DEFAULT_SAMPLE_RATE,
+    bass_note,
+    create_hihat,
+    create_kick,
+    create_snare,
+    mix_into,
+)
+
+BEATS_PER_BAR = 4
+STEPS_PER_BAR = 16  # 十六分音符
+
+# 各段落的鼓組樣式（x 表示該十六分音符有敲擊）
+DRUM_PATTERNS: Dict[str, Dict[str, str]] = {
+    "intro": {"kick": "x...x...x...x...", "hat": "..x...x...x...x."},
+    "verse": {
+        "kick": "x.....x...x.....",
+        "snare": "....x.......x...",
+        "hat": "x.x.x.x.x.x.x.x.",
+    },
+    "chorus": {
+        "kick": "x...x..x..x.x...",
+        "snare": "....x.......x..x",
+        "hat": "xxxxxxxxxxxxxxxx",
+    },
+    "break": {"kick": "x...............", "hat": "x...x...x...x..."},
+}
+
+# 各段落的貝斯節奏，每個音符長兩個十六分音符
+BASS_PATTERNS: Dict[str, str] = {
+    "intro": "x.......x.......",
+    "verse": "x..x..x...x..x..",
+    "chorus": "x.xx.x.xx.xx.x.x",
+    "break": "x...............",
+}
+
+# 和弦進行的根音（相對主音的半音數），每小節一個
+PROGRESSIONS = [(0, -4, 3, -2), (0, 5, 3, -2), (0, -2, -4, -5)]
+
+# 歌曲結構：前奏之後重複主歌、副歌、間奏
+INTRO_BARS = 4
+SECTION_CYCLE = (("verse", 8), ("chorus", 8), ("break", 4))
+
+# 產生譜面音符的樂器
+CHART_INSTRUMENTS = ("kick", "snare")
+
+MASTER_GAIN = 0.5
+
+
+class SongGenerator:
+    """程序化歌曲產生器類別"""
+
+    def __init__(
+        self,
+        bpm: float = 120.0,
+        bars: int = 64,
+        seed: int = 0,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        root_frequency: float = 55.0,
+    ):
+        self.bpm = bpm
+        self.bars = bars
+        self.seed = seed
+        self.sample_rate = sample_rate
+        self.root_frequency = root_frequency
+
+        self.random = random.Random(seed)
+        self.progression = self.random.choice(PROGRESSIONS)
+        self.step_seconds = 60.0 / bpm / (STEPS_PER_BAR // BEATS_PER_BAR)
+
+        # 預先合成單次音色，渲染時只做疊加
+        self.one_shots = {
+            "kick": create_kick(sample_rate),
+            "snare": create_snare(sample_rate),
+            "hat": create_hihat(sample_rate),
+        }
+        self._bass_notes: Dict[float, np.ndarray] = {}
+
+    @classmethod
+    def for_duration(
+        cls, bpm: float, minutes: float, seed: int = 0, **kwargs
+    ) -> "SongGenerator":
+        """
+        依目標長度建立產生器
+
+        Args:
+            bpm: 每分鐘拍數
+            minutes: 歌曲長度（分鐘）
+            seed: 亂數種子
+
+        Returns:
+            SongGenerator: 產生器
+        """
+        bar_seconds = 60.0 / bpm * BEATS_PER_BAR
+        bars = max(1, math.ceil(minutes * 60.0 / bar_seconds))
+        return cls(bpm=bpm, bars=bars, seed=seed, **kwargs)
+
+    def sections(self) -> List[str]:
+        """取得每個小節所屬的段落"""
+        sections = ["intro"] * min(INTRO_BARS, self.bars)
+        while len(sections) < self.bars:
+            for name, length in SECTION_CYCLE:
+                sections.extend([name] * length)
+        return sections[: self.bars]
+
+    def _step_frame(self, step_index: int) -> int:
+        """全曲第 step_index 個十六分音符的起始取樣位置"""
+        return int(round(step_index * self.step_seconds * self.sample_rate))
+
+    def _bass(self, semitones: int) -> np.ndarray:
+        """取得貝斯音符（依音高快取）"""
+        frequency = self.root_frequency * 2 ** (semitones / 12)
+        note = self._bass_notes.get(frequency)
+        if note is None:
+            note = bass_note(frequency, self.step_seconds * 2, self.sample_rate)
+            self._bass_notes[frequency] = note
+        return note
+
+    def _bar_events(self, bar: int, section: str) -> List[Tuple[int, np.ndarray]]:
+        """取得小節內的 (十六分音符索引, 音色) 事件"""
+        events = []
+        for instrument, pattern in DRUM_PATTERNS[section].items():
+            sound = self.one_shots[instrument]
+            events.extend(
+                (step, sound) for step, hit in enumerate(pattern) if hit == "x"
+            )
+
+        bass = self._bass(self.progression[bar % len(self.progression)])
+        events.extend(
+            (step, bass)
+            for step, hit in enumerate(BASS_PATTERNS[section])
+            if hit == "x"
+        )
+        return events
+
+    def _chart_notes(self, bar: int, section: str) -> List[float]:
+        """取得小節內產生音符的時間（秒）"""
+        steps = set()
+        for instrument in CHART_INSTRUMENTS:
+            pattern = DRUM_PATTERNS[section].get(instrument, "")
+            steps.update(step for step, hit in enumerate(pattern) if hit == "x")
+        first_step = bar * STEPS_PER_BAR
+        return [(first_step + step) * self.step_seconds for step in sorted(steps)]
+
+    def _pick_direction(self, previous: Optional[str]) -> str:
+        """隨機選擇方向（避免與前一個音符相同）"""
+        choices = [d for d in ARROW_DIRECTIONS if d != previous]
+        return self.random.choice(choices)
+
+    def render(
+        self,
+        wav_path: Path,
+        chart_path: Optional[Path] = None,
+        title: str = "",
+    ) -> Chart:
+        """
+        逐小節渲染歌曲並串流寫入 WAV
+
+        每個小節的緩衝區包含前一小節延續下來的尾音，
+        記憶體用量只與單一小節長度有關。
+
+        Args:
+            wav_path: WAV 輸出路徑
+            chart_path: 譜面輸出路徑（None 時不寫出）
+            title: 歌曲名稱
+
+        Returns:
+            Chart: 對齊節拍的譜面
+        """
+        tail_frames = max(
+            [sound.size for sound in self.one_shots.values()]
+            + [int(self.step_seconds * 2 * self.sample_rate) + 1]
+        )
+        carry = np.zeros(0, dtype=np.float32)
+        notes: List[Tuple[float, str]] = []
+        direction = None
+
+        with StreamingWavWriter(wav_path, self.sample_rate) as writer:
+            for bar, section in enumerate(self.sections()):
+                bar_start = self._step_frame(bar * STEPS_PER_BAR)
+                bar_frames = self._step_frame((bar + 1) * STEPS_PER_BAR) - bar_start
+
+                buffer = np.zeros(bar_frames + tail_frames, dtype=np.float32)
+                buffer[: carry.size] += carry
+                for step, sound in self._bar_events(bar, section):
+                    offset = self._step_frame(bar * STEPS_PER_BAR + step) - bar_start
+                    mix_into(buffer, sound, offset)
+
+                writer.write(buffer[:bar_frames] * MASTER_GAIN)
+                carry = buffer[bar_frames:]
+
+                for time in self._chart_notes(bar, section):
+                    direction = self._pick_direction(direction)
+                    notes.append((time, direction))
+
+            writer.write(carry * MASTER_GAIN)
+        total_frames = self._step_frame(self.bars * STEPS_PER_BAR) + carry.size
+
+        chart = Chart(
+            notes,
+            bpm=self.bpm,
+            duration=total_frames / self.sample_rate,
+            title=title or Path(wav_path).stem,
+            audio_file=Path(wav_path).name,
+        )
+        if chart_path is not None:
+            chart.save(chart_path)
+        return chart
@@ -0,0 +1,384 @@
+"""
+歌曲庫索引
+掃描音樂目錄並擷取長度、取樣率、BPM 與譜面資訊，依檔案大小與修改時間增量更新磁碟索引
+"""
+
+import json
+import os
+import threading
+import wave
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.cache import get_cache_dir
+from utils.persistence import atomic_write, json_encoder
+
+from .beat_analysis import BeatAnalysisCache
+from .chart import CHART_SUFFIX, Chart
+
+# (音訊大小, 音訊修改時間, 譜面修改時間)，譜面不存在時為 0
+FileStamp = Tuple[int, int, int]
+
+
+class SongInfo:
+    """歌曲資訊類別"""
+
+    # 索引以欄位順序存成陣列，大型歌曲庫的索引較小、載入較快
+    FIELDS = (
+        "path",
+        "size",
+        "mtime_ns",
+        "chart_mtime_ns",
+        "title",
+        "duration",
+        "sample_rate",
+        "channels",
+        "bpm",
+        "digest",
+    )
+    __slots__ = FIELDS
+
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        mtime_ns: int,
+        chart_mtime_ns: int = 0,
+        title: str = "",
+        duration: float = 0.0,
+        sample_rate: int = 0,
+        channels: int = 0,
+        bpm: float = 0.0,
+        digest: str = "",
+    ):
+        """
+        Args:
+            path: 音訊檔案絕對路徑
+            size: 檔案大小（位元組）
+            mtime_ns: 檔案修改時間（奈秒）
+            chart_mtime_ns: 譜面檔修改時間（奈秒），沒有譜面時為 0
+            title: 歌曲名稱
+            duration: 長度（秒）
+            sample_rate: 取樣率，無法解析的檔案為 0
+            channels: 聲道數
+            bpm: 速度，未知時為 0
+            digest: 音訊內容雜湊（經過分析時才有）
+        """
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.chart_mtime_ns = chart_mtime_ns
+        self.title = title or Path(path).stem
+        self.duration = duration
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.bpm = bpm
+        self.digest = digest
+
+    @property
+    def stamp(self) -> FileStamp:
+        """用來判斷檔案是否變更的戳記"""
+        return (self.size, self.mtime_ns, self.chart_mtime_ns)
+
+    @property
+    def has_chart(self) -> bool:
+        """是否有預先編寫的譜面"""
+        return self.chart_mtime_ns != 0
+
+    @property
+    def playable(self) -> bool:
+        """音訊是否可解析"""
+        return self.sample_rate > 0
+
+    @property
+    def sort_key(self) -> Tuple[str, str]:
+        """歌曲清單的排序鍵"""
+        return (self.title.lower(), self.path)
+
+    def to_row(self) -> List[Any]:
+        """轉換為依 FIELDS 順序排列的陣列"""
+        return [getattr(self, field) for field in self.FIELDS]
+
+    @classmethod
+    def from_row(cls, row: List[Any]) -> "SongInfo":
+        """從 to_row() 產生的陣列建立歌曲資訊"""
+        return cls(*row)
+
+
+def probe_song(
+    path: str, stamp: FileStamp, analysis_dir: Optional[str] = None
+) -> List[Any]:
+    """
+    擷取單首歌曲的資訊（在工作行程或執行緒中執行）
+
+    長度與取樣率只讀取 WAV 標頭；BPM 優先取自譜面檔，
+    沒有譜面且指定分析快取目錄時才分析音訊（結果同時供遊戲產生譜面使用）。
+
+    Args:
+        path: 音訊檔案路徑
+        stamp: 掃描時的檔案戳記
+        analysis_dir: 分析快取目錄，None 表示不分析
+
+    Returns:
+        List[Any]: SongInfo.to_row() 格式的資訊
+    """
+    size, mtime_ns, chart_mtime_ns = stamp
+    info = SongInfo(path, size, mtime_ns, chart_mtime_ns)
+    try:
+        with wave.open(path, "rb") as wav_file:
+            info.sample_rate = wav_file.getframerate()
+            info.channels = wav_file.getnchannels()
+            info.duration = wav_file.getnframes() / info.sample_rate
+    except (OSError, wave.Error, EOFError, ZeroDivisionError):
+        # 無法解析的檔案仍記錄於索引，檔案未變更前不會重新掃描
+        info.sample_rate = 0
+        return info.to_row()
+
+    if chart_mtime_ns:
+        chart = Chart.load(Chart.sidecar_path(Path(path)))
+        if chart is not None:
+            info.bpm = chart.bpm
+            info.title = chart.title or info.title
+            return info.to_row()
+
+    if analysis_dir is not None:
+        analysis = BeatAnalysisCache(Path(analysis_dir)).analyze(Path(path))
+        if analysis is not None:
+            info.bpm = analysis.bpm
+            info.digest = analysis.digest
+    return info.to_row()
+
+
+class SongLibrary:
+    """
+    歌曲庫類別
+
+    索引以 JSON 存於磁碟，啟動時直接載入即可顯示歌曲清單；
+    重新掃描只需 stat 每個檔案，大小與修改時間未變的歌曲沿用索引內容，
+    其餘交給工作池平行擷取。
+    """
+
+    VERSION = 1
+    INDEX_FILE = "song_index.json"
+    SUPPORTED_SUFFIXES = BeatAnalysisCache.SUPPORTED_SUFFIXES
+    INLINE_SCAN_LIMIT = 4  # 需要擷取的歌曲不超過此數量時不建立工作池
+
+    def __init__(
+        self,
+        index_file: Path,
+        music_dirs: Iterable[Path],
+        analysis_dir: Optional[Path] = None,
+        exclude: Iterable[str] = (),
+    ):
+        """
+        Args:
+            index_file: 索引檔路徑
+            music_dirs: 音樂目錄（會遞迴掃描子目錄）
+            analysis_dir: 分析快取目錄
+            exclude: 不列入歌曲庫的檔名（如選單背景音樂）
+        """
+        self.index_file = Path(index_file)
+        self.music_dirs = [Path(directory).resolve() for directory in music_dirs]
+        self.analysis_dir = analysis_dir
+        self.exclude = set(exclude)
+
+        self.entries: Dict[str, SongInfo] = {}
+        # 可遊玩的歌曲，依名稱排序（掃描完成時整批替換，供其他執行緒讀取）
+        self.songs: List[SongInfo] = []
+        self._scan_lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        library_config: Dict[str, Any],
+        builtin_dir: Path,
+        exclude: Iterable[str] = (),
+    ) -> "SongLibrary":
+        """
+        依歌曲庫配置建立歌曲庫（內建音樂目錄加上 music_dirs），索引放在快取目錄
+
+        Args:
+            library_config: config.json 的 library 區段
+            builtin_dir: 內建音樂目錄
+            exclude: 不列入歌曲庫的檔名
+
+        Returns:
+            SongLibrary: 歌曲庫
+        """
+        music_dirs = [builtin_dir]
+        music_dirs += [
+            Path(directory) for directory in library_config.get("music_dirs", [])
+        ]
+        return cls(
+            get_cache_dir(cls.INDEX_FILE),
+            music_dirs,
+            analysis_dir=get_cache_dir("analysis"),
+            exclude=exclude,
+        )
+
+    def get(self, path: Path) -> Optional[SongInfo]:
+        """取得歌曲資訊"""
+        return self.entries.get(str(Path(path).resolve()))
+
+    def load(self) -> bool:
+        """
+        載入索引
+
+        Returns:
+            bool: 載入是否成功
+        """
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if (
+                data.get("version") != self.VERSION
+                or tuple(data.get("fields", ())) != SongInfo.FIELDS
+            ):
+                return False
+            entries = {row[0]: SongInfo.from_row(row) for row in data["songs"]}
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"載入歌曲索引失敗: {e}")
+            return False
+
+        # 索引依排序順序儲存，載入時不需重新排序
+        self._set_entries(entries, presorted=True)
+        return True
+
+    def save(self) -> bool:
+        """
+        儲存索引
+
+        Returns:
+            bool: 儲存是否成功
+        """
+        data = {
+            "version": self.VERSION,
+            "fields": SongInfo.FIELDS,
+            "songs": [song.to_row() for song in self.entries.values()],
+        }
+        try:
+            atomic_write(self.index_file, json_encoder(data)())
+            return True
+        except OSError as e:
+            print(f"儲存歌曲索引失敗: {e}")
+            return False
+
+    def _set_entries(
+        self, entries: Dict[str, SongInfo], presorted: bool = False
+    ) -> None:
+        """
+        替換索引並重建歌曲清單
+
+        Args:
+            entries: 路徑對應歌曲資訊
+            presorted: entries 是否已依排序鍵排列
+        """
+        if not presorted:
+            ordered = sorted(entries.values(), key=lambda song: song.sort_key)
+            entries = {song.path: song for song in ordered}
+        self.entries = entries
+        self.songs = [song for song in entries.values() if song.playable]
+
+    def _walk(self) -> Dict[str, FileStamp]:
+        """列出所有音樂目錄中的音訊檔與其戳記"""
+        found: Dict[str, FileStamp] = {}
+        for music_dir in self.music_dirs:
+            for root, _, files in os.walk(music_dir):
+                names = set(files)
+                for name in files:
+                    suffix = os.path.splitext(name)[1].lower()
+                    if suffix not in self.SUPPORTED_SUFFIXES or name in self.exclude:
+                        continue
+                    path = os.path.join(root, name)
+                    chart_name = os.path.splitext(name)[0] + CHART_SUFFIX
+                    try:
+                        stat = os.stat(path)
+                        chart_mtime = (
+                            os.stat(os.path.join(root, chart_name)).st_mtime_ns
+                            if chart_name in names
+                            else 0
+                        )
+                    except OSError:
+                        continue
+                    found[path] = (stat.st_size, stat.st_mtime_ns, chart_mtime)
+        return found
+
+    def scan(
+        self,
+        workers: Optional[int] = None,
+        analyze: bool = True,
+        use_processes: bool = True,
+    ) -> Dict[str, int]:
+        """
+        增量掃描音樂目錄並更新索引
+
+        Args:
+            workers: 工作池大小（None 為 CPU 核心數）
+            analyze: 沒有譜面的歌曲是否分析 BPM
+            use_processes: 使用行程池（False 時使用執行緒池，適合在遊戲執行中背景掃描）
+
+        Returns:
+            Dict[str, int]: total（歌曲總數）、scanned（重新擷取數）、
+                removed（移除數）、unchanged（沿用數）
+        """
+        with self._scan_lock:
+            found = self._walk()
+            entries = {}
+            stale = []
+            for path, stamp in found.items():
+                song = self.entries.get(path)
+                if song is not None and song.stamp == stamp:
+                    entries[path] = song
+                else:
+                    stale.append((path, stamp))
+
+            analysis_dir = (
+                str(self.analysis_dir)
+                if analyze and self.analysis_dir is not None
+                else None
+            )
+            for row in self._probe_all(stale, analysis_dir, workers, use_processes):
+                song = SongInfo.from_row(row)
+                entries[song.path] = song
+
+            removed = len(set(self.entries) - set(found))
+            stats = {
+                "total": len(entries),
+                "scanned": len(stale),
+                "removed": removed,
+                "unchanged": len(entries) - len(stale),
+            }
+            self._set_entries(entries)
+            if stale or removed:
+                self.save()
+            return stats
+
+    def _probe_all(
+        self,
+        stale: List[Tuple[str, FileStamp]],
+        analysis_dir: Optional[str],
+        workers: Optional[int],
+        use_processes: bool,
+    ) -> Iterable[List[Any]]:
+        """以工作池平行擷取歌曲資訊（數量很少時直接在目前執行緒處理）"""
+        if not stale:
+            return []
+        paths = [path for path, _ in stale]
+        stamps = [stamp for _, stamp in stale]
+        analysis_dirs = [analysis_dir] * len(stale)
+        if len(stale) <= self.INLINE_SCAN_LIMIT or workers == 1:
+            return list(map(probe_song, paths, stamps, analysis_dirs))
+
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        workers = workers or os.cpu_count() or 1
+        # 行程池以批次傳送工作，降低大量小工作的行程間通訊成本（執行緒池會忽略）
+        chunksize = max(1, len(stale) // (workers * 8))
+        with executor_class(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    probe_song, paths, stamps, analysis_dirs, chunksize=chunksize
+                )
+            )
@@ -0,0 +1,257 @@
+"""
+選歌試聽
+在背景執行緒預先解碼游標附近歌曲的試聽片段，以固定聲道交叉淡入淡出播放
+"""
+
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence, Set
+
+import numpy as np
+import pygame
+
+from utils.asset_cache import AssetCache, sound_bytes
+from utils.audio_convert import WavBlockReader, convert_channels, resample, to_int16
+
+from .song_library import SongInfo
+
+
+def decode_preview(
+    file_path: Path,
+    frequency: int,
+    channels: int,
+    start_ratio: float = 0.3,
+    seconds: float = 12.0,
+    fade_seconds: float = 0.05,
+) -> Optional[bytes]:
+    """
+    解碼歌曲中段的試聽片段為混音器格式
+
+    只讀取片段所需的影格，不解碼整首歌。片段頭尾套用短淡入淡出，循環播放時不會爆音。
+
+    Args:
+        file_path: WAV 檔案路徑
+        frequency: 混音器取樣率
+        channels: 混音器聲道數
+        start_ratio: 片段起點佔歌曲長度的比例（片段超出檔尾時往前移）
+        seconds: 片段長度（秒）
+        fade_seconds: 頭尾淡入淡出長度（秒）
+
+    Returns:
+        bytes or None: 交錯的 16-bit PCM，無法解析時為 None
+    """
+    try:
+        with WavBlockReader(file_path) as reader:
+            if not reader.sample_rate or not reader.frame_count:
+                return None
+            length = min(reader.frame_count, int(seconds * reader.sample_rate))
+            start = min(
+                int(reader.frame_count * start_ratio), reader.frame_count - length
+            )
+            reader.seek(start)
+            samples = reader.read(length)
+            source_rate = reader.sample_rate
+    except (OSError, EOFError, ValueError) as e:
+        print(f"解碼試聽片段失敗: {file_path} ({e})")
+        return None
+
+    samples = resample(convert_channels(samples, channels), source_rate, frequency)
+    fade = min(int(fade_seconds * frequency), samples.shape[0] // 2)
+    if fade:
+        ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)[:, np.newaxis]
+        samples = samples.copy()
+        samples[:fade] *= ramp
+        samples[-fade:] *= ramp[::-1]
+    return to_int16(samples).tobytes()
+
+
+class SongPreview:
+    """
+    選歌試聽服務類別
+
+    主執行緒只負責交出待解碼清單、收取解碼完成的片段與切換聲道，
+    檔案讀取、重新取樣與建立 Sound 都在背景執行緒進行，快速捲動選單時不會卡住影格。
+    游標停留 SETTLE_SECONDS 後才切換試聽，連續捲動時不會反覆重播。
+    """
+
+    PREVIEW_SECONDS = 12.0
+    PREVIEW_START_RATIO = 0.3
+    EDGE_FADE_SECONDS = 0.05
+    CROSSFADE_MS = 400
+    SETTLE_SECONDS = 0.15
+    # 游標前後各預先解碼的歌曲數
+    LOOKAROUND = 2
+    DEFAULT_BUDGET_BYTES = 24 * 1024 * 1024
+
+    def __init__(
+        self,
+        channels: Sequence[pygame.mixer.Channel],
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        volume: float = 1.0,
+    ):
+        """
+        Args:
+            channels: 試聽專用的兩個聲道（交替使用以交叉淡入淡出）
+            budget_bytes: 試聽片段快取的位元組預算
+            volume: 試聽音量 (0.0 - 1.0)
+        """
+        self.channels = list(channels)
+        self.cache = AssetCache("preview", budget_bytes, sound_bytes)
+        frequency, _, mixer_channels = pygame.mixer.get_init()
+        self._mixer_format = (frequency, mixer_channels)
+        self._active = 0
+        self.set_volume(volume)
+
+        # 目前選擇與播放中的歌曲（None 表示隨機模式，不試聽）
+        self.target: Optional[str] = None
+        self.playing: Optional[str] = None
+        self._settle = 0.0
+
+        # 以下欄位由 _lock 保護，與背景執行緒共用
+        self._lock = threading.Condition()
+        self._wanted: List[str] = []
+        self._decoding: Optional[str] = None
+        self._ready: List[tuple] = []
+        self._stopped = False
+        self._failed: Set[str] = set()
+
+        self._thread = threading.Thread(
+            target=self._worker, name="song-preview", daemon=True
+        )
+        self._thread.start()
+
+    def set_volume(self, volume: float) -> None:
+        """
+        設定試聽音量
+
+        Args:
+            volume: 音量值 (0.0 - 1.0)
+        """
+        volume = max(0.0, min(1.0, volume))
+        for channel in self.channels:
+            channel.set_volume(volume)
+
+    def select(self, songs: Sequence[SongInfo], index: Optional[int]) -> None:
+        """
+        移動選歌游標，排程解碼游標附近的片段
+
+        Args:
+            songs: 歌曲清單
+            index: 游標所在的歌曲索引，None 表示不試聽
+        """
+        self.target = None
+        nearby: List[str] = []
+        if index is not None and songs:
+            if songs[index].playable:
+                self.target = songs[index].path
+            # 由近到遠排序，背景執行緒優先解碼游標所在的歌曲
+            for distance in range(self.LOOKAROUND + 1):
+                positions = (
+                    (index + distance, index - distance) if distance else (index,)
+                )
+                for position in positions:
+                    if 0 <= position < len(songs) and songs[position].playable:
+                        nearby.append(songs[position].path)
+        self._settle = self.SETTLE_SECONDS
+
+        with self._lock:
+            self._store_ready()
+            # 重新標記為最近使用，淘汰時優先移除離游標較遠的片段
+            for path in reversed(nearby):
+                self.cache.get(path)
+            self._wanted = [
+                path
+                for path in nearby
+                if path not in self.cache
+                and path != self._decoding
+                and path not in self._failed
+            ]
+            self._lock.notify()
+
+    def update(self, dt: float) -> None:
+        """
+        每個影格呼叫：收取解碼完成的片段，游標停留後切換試聽
+
+        Args:
+            dt: 距上一影格的秒數
+        """
+        if self._ready:
+            with self._lock:
+                self._store_ready()
+
+        if self.target == self.playing:
+            return
+        self._settle -= dt
+        if self._settle > 0:
+            return
+        if self.target is None or self.target in self._failed:
+            self._crossfade(None)
+        elif self.target in self.cache:
+            self._crossfade(self.cache[self.target])
+
+    def stop(self) -> None:
+        """淡出試聽（離開選歌畫面時呼叫）"""
+        self.target = None
+        self._crossfade(None)
+        with self._lock:
+            self._wanted = []
+
+    def close(self) -> None:
+        """停止背景執行緒與所有試聽聲道"""
+        with self._lock:
+            self._stopped = True
+            self._wanted = []
+            self._lock.notify()
+        for channel in self.channels:
+            channel.stop()
+
+    def is_ready(self, path: str) -> bool:
+        """片段是否已解碼完成（已在快取中）"""
+        return path in self.cache
+
+    def _crossfade(self, sound: Optional[pygame.mixer.Sound]) -> None:
+        """淡出目前的聲道，在另一個聲道淡入新的片段"""
+        current = self.channels[self._active]
+        if current.get_busy():
+            current.fadeout(self.CROSSFADE_MS)
+        if sound is not None:
+            self._active = (self._active + 1) % len(self.channels)
+            self.channels[self._active].play(sound, loops=-1, fade_ms=self.CROSSFADE_MS)
+        self.playing = self.target
+
+    def _store_ready(self) -> None:
+        """將解碼完成的片段放入快取（需持有 _lock，只在主執行緒呼叫）"""
+        for path, sound in self._ready:
+            if sound is None:
+                self._failed.add(path)
+            else:
+                self.cache.put(path, sound)
+        self._ready.clear()
+
+    def _worker(self) -> None:
+        """背景執行緒：依序解碼待解碼清單最前面的歌曲"""
+        frequency, channels = self._mixer_format
+        while True:
+            with self._lock:
+                while not self._wanted and not self._stopped:
+                    self._lock.wait()
+                if self._stopped:
+                    return
+                path = self._wanted.pop(0)
+                self._decoding = path
+
+            sound = None
+            pcm = decode_preview(
+                Path(path),
+                frequency,
+                channels,
+                self.PREVIEW_START_RATIO,
+                self.PREVIEW_SECONDS,
+                self.EDGE_FADE_SECONDS,
+            )
+            if pcm is not None:
+                sound = pygame.mixer.Sound(buffer=pcm)
+
+            with self._lock:
+                self._decoding = None
+                self._ready.append((path, sound))
@@ -0,0 +1,218 @@
+"""
+程序化音效合成
+以向量化 NumPy 運算產生振盪器、掃頻、包絡與混音，供缺少音效檔時即時合成
+"""
+
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pygame
+
+from utils.audio_convert import convert_channels, to_int16
+
+DEFAULT_SAMPLE_RATE = 44100
+
+
+def sample_times(duration: float, sample_rate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """取得各取樣點的時間（秒）"""
+    return np.arange(int(duration * sample_rate), dtype=np.float32) / sample_rate
+
+
+def tone(
+    frequency: float,
+    duration: float,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    amplitude: float = 1.0,
+) -> np.ndarray:
+    """
+    正弦波振盪器
+
+    Args:
+        frequency: 頻率 (Hz)
+        duration: 長度（秒）
+        sample_rate: 取樣率
+        amplitude: 振幅
+
+    Returns:
+        np.ndarray: float32 單聲道取樣
+    """
+    t = sample_times(duration, sample_rate)
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def sweep(
+    start_frequency: float,
+    end_frequency: float,
+    duration: float,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    amplitude: float = 1.0,
+) -> np.ndarray:
+    """
+    線性掃頻正弦波（相位為瞬時頻率的積分，掃頻過程連續無跳躍）
+
+    Args:
+        start_frequency: 起始頻率 (Hz)
+        end_frequency: 結束頻率 (Hz)
+        duration: 長度（秒）
+        sample_rate: 取樣率
+        amplitude: 振幅
+
+    Returns:
+        np.ndarray: float32 單聲道取樣
+    """
+    t = sample_times(duration, sample_rate)
+    rate = (end_frequency - start_frequency) / duration
+    phase = 2 * np.pi * (start_frequency * t + 0.5 * rate * t * t)
+    return (amplitude * np.sin(phase)).astype(np.float32)
+
+
+def noise(
+    duration: float,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    amplitude: float = 1.0,
+    seed: int = 0,
+) -> np.ndarray:
+    """白噪音（固定種子，每次產生相同結果）"""
+    rng = np.random.default_rng(seed)
+    frames = int(duration * sample_rate)
+    return rng.uniform(-amplitude, amplitude, frames).astype(np.float32)
+
+
+def fade_out(
+    signal: np.ndarray, duration: float, sample_rate: int = DEFAULT_SAMPLE_RATE
+) -> np.ndarray:
+    """線性淡出尾端（原地修改）"""
+    frames = min(int(duration * sample_rate), signal.size)
+    if frames:
+        signal[-frames:] *= np.linspace(1.0, 0.0, frames, dtype=np.float32)
+    return signal
+
+
+def exponential_decay(
+    signal: np.ndarray, time_constant: float, sample_rate: int = DEFAULT_SAMPLE_RATE
+) -> np.ndarray:
+    """指數衰減包絡（原地修改）"""
+    t = np.arange(signal.size, dtype=np.float32) / sample_rate
+    signal *= np.exp(-t / time_constant)
+    return signal
+
+
+def mix_into(buffer: np.ndarray, signal: np.ndarray, start: int) -> None:
+    """將訊號疊加到緩衝區的指定位置（超出部分截斷）"""
+    if start >= buffer.size:
+        return
+    end = min(start + signal.size, buffer.size)
+    buffer[start:end] += signal[: end - start]
+
+
+def create_perfect_sound(sample_rate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """Perfect音效 - 高音調 (A5)"""
+    return fade_out(tone(880, 0.15, sample_rate), 0.05, sample_rate)
+
+
+def create_good_sound(sample_rate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """Good音效 - 中音調 (E5)"""
+    return fade_out(tone(660, 0.12, sample_rate), 0.04, sample_rate)
+
+
+def create_miss_sound(sample_rate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """Miss音效 - 低音調，從300Hz下降到100Hz"""
+    return fade_out(sweep(300, 100, 0.2, sample_rate, 0.3), 0.02, sample_rate)
+
+
+def create_combo_sound(sample_rate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """Combo音效 - 從440Hz上升到880Hz"""
+    return fade_out(sweep(440, 880, 0.25, sample_rate, 0.5), 0.02, sample_rate)
+
+
+def create_background_music(sample_rate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """背景音樂 - 4秒循環的鼓點與貝斯線"""
+    duration = 4.0
+    buffer = np.zeros(int(duration * sample_rate), dtype=np.float32)
+
+    # 每0.5秒一拍的低頻鼓點（約4.5ms 的短促敲擊）
+    kick = exponential_decay(tone(60, 0.0045, sample_rate, 0.3), 0.0009, sample_rate)
+    beat_interval = int(0.5 * sample_rate)
+    for start in range(0, buffer.size, beat_interval):
+        mix_into(buffer, kick, start)
+
+    # 貝斯線 A3, A3, E3, A3
+    note_duration = duration / 4
+    for index, frequency in enumerate((220, 220, 165, 220)):
+        note = tone(frequency, note_duration, sample_rate, 0.1)
+        mix_into(buffer, note, int(index * note_duration * sample_rate))
+
+    return buffer
+
+
+def create_kick(sample_rate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """大鼓 - 150Hz 快速下降到 45Hz 的掃頻加指數衰減"""
+    return exponential_decay(sweep(150, 45, 0.3, sample_rate, 0.9), 0.08, sample_rate)
+
+
+def create_snare(sample_rate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """小鼓 - 噪音加 190Hz 音體"""
+    body = tone(190, 0.2, sample_rate, 0.3)
+    body += noise(0.2, sample_rate, 0.5, seed=1)
+    return exponential_decay(body, 0.05, sample_rate)
+
+
+def create_hihat(sample_rate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """腳踏鈸 - 以一階差分濾除低頻的短促噪音"""
+    raw = noise(0.06, sample_rate, 0.3, seed=2)
+    hat = np.empty_like(raw)
+    hat[0] = raw[0]
+    np.subtract(raw[1:], raw[:-1], out=hat[1:])
+    return exponential_decay(hat, 0.012, sample_rate)
+
+
+def bass_note(
+    frequency: float, duration: float, sample_rate: int = DEFAULT_SAMPLE_RATE
+) -> np.ndarray:
+    """貝斯音符 - 軟削波的正弦波（增加泛音），結尾淡出避免爆音"""
+    note = np.tanh(3.0 * tone(frequency, duration, sample_rate)) * 0.35
+    note = exponential_decay(note.astype(np.float32), duration * 0.8, sample_rate)
+    return fade_out(note, min(0.02, duration / 4), sample_rate)
+
+
+SFX_GENERATORS: Dict[str, Callable[[int], np.ndarray]] = {
+    "perfect": create_perfect_sound,
+    "good": create_good_sound,
+    "miss": create_miss_sound,
+    "combo": create_combo_sound,
+}
+
+
+def to_sound(samples: np.ndarray) -> Optional[pygame.mixer.Sound]:
+    """
+    將單聲道浮點取樣轉為目前混音器格式的音效
+
+    Args:
+        samples: float32 單聲道取樣（應以混音器取樣率產生）
+
+    Returns:
+        pygame.mixer.Sound or None: 音效，混音器未初始化時為 None
+    """
+    mixer_format = pygame.mixer.get_init()
+    if not mixer_format:
+        return None
+    channels = mixer_format[2]
+    pcm = to_int16(convert_channels(samples.reshape(-1, 1), channels))
+    return pygame.mixer.Sound(buffer=pcm.tobytes())
+
+
+def synthesize_sfx(name: str) -> Optional[pygame.mixer.Sound]:
+    """
+    以目前混音器的取樣率合成音效
+
+    Args:
+        name: 音效名稱（SFX_GENERATORS 的鍵）
+
+    Returns:
+        pygame.mixer.Sound or None: 音效，沒有對應的合成器時為 None
+    """
+    generator = SFX_GENERATORS.get(name)
+    mixer_format = pygame.mixer.get_init()
+    if generator is None or not mixer_format:
+        return None
+    return to_sound(generator(mixer_format[0]))
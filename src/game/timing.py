@@ -13,21 +13,32 @@ from .constants import (
     MISS_SCORE,
     JUDGMENT_LINE_Y,
     FEEDBACK_FADE_SECONDS,
+    FEEDBACK_QUEUE_CAPACITY,
     JUDGMENT_COOLDOWN_SECONDS,
 )
+from .effect_queue import EffectQueue
 
 
 class Timing:
     """時機判定系統類別"""
 
+    JUDGMENT_COLORS = {
+        "PERFECT": (255, 215, 0),  # 金色
+        "GOOD": (0, 255, 0),  # 綠色
+        "MISS": (255, 0, 0),  # 紅色
+        "MISS_FAR": (128, 0, 0),  # 深紅色
+    }
+
     def __init__(self):
         self.judgment_line_y = JUDGMENT_LINE_Y  # 判定線Y座標
         self.last_judgment_time = {}  # 記錄上次判定時間，防止重複判定
         self.cooldown_time = JUDGMENT_COOLDOWN_SECONDS  # 判定冷卻時間（秒）
 
         # 判定回饋效果
-        self.feedback_messages = []
         self.feedback_duration = FEEDBACK_FADE_SECONDS  # 回饋顯示時間（秒）
+        self.feedback_messages = EffectQueue(
+            FEEDBACK_QUEUE_CAPACITY, self.feedback_duration
+        )
 
     def check_timing(
         self, arrow_y: float, current_time: float, direction: str
@@ -72,31 +83,19 @@ class Timing:
 
     def add_feedback(self, judgment: str, current_time: float) -> None:
         """添加判定回饋訊息"""
-        self.feedback_messages.append(
-            {
-                "text": judgment,
-                "time": current_time,
-                "color": self._get_judgment_color(judgment),
-            }
+        self.feedback_messages.push(
+            current_time,
+            text=judgment,
+            color=self._get_judgment_color(judgment),
         )
 
     def _get_judgment_color(self, judgment: str) -> Tuple[int, int, int]:
         """取得判定等級對應的顏色"""
-        colors = {
-            "PERFECT": (255, 215, 0),  # 金色
-            "GOOD": (0, 255, 0),  # 綠色
-            "MISS": (255, 0, 0),  # 紅色
-            "MISS_FAR": (128, 0, 0),  # 深紅色
-        }
-        return colors.get(judgment, (255, 255, 255))
+        return self.JUDGMENT_COLORS.get(judgment, (255, 255, 255))
 
     def update_feedback(self, current_time: float) -> None:
-        """更新回饋訊息，移除過期的訊息"""
-        self.feedback_messages = [
-            msg
-            for msg in self.feedback_messages
-            if current_time - msg["time"] < self.feedback_duration
-        ]
+        """更新回饋訊息，從佇列頭端移除過期的訊息"""
+        self.feedback_messages.expire(current_time)
 
     def should_remove_arrow(self, arrow_y: float, arrow_hit: bool) -> bool:
         """
@@ -0,0 +1,246 @@
+"""
+資源包
+將圖片（原始像素）與音效（混音器格式 PCM）打包成單一索引檔案，
+執行時以 mmap 映射並直接從緩衝區建立 Surface 與 Sound，略過 PNG/WAV 解碼
+"""
+
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pygame
+
+from .persistence import atomic_output
+
+# 資源包檔案格式：
+#   標頭 (MAGIC, VERSION, 索引長度) + JSON 索引 + 對齊的資料區塊
+#   索引中的 offset 為相對資料區起點（索引結尾向上對齊）的位移
+BUNDLE_MAGIC = b"DGBUNDLE"
+BUNDLE_VERSION = 1
+HEADER = struct.Struct("<8sII")
+ALIGNMENT = 64
+
+# 與 convert_alpha() 常見的顯示格式 (ARGB8888) 在小端記憶體中的排列相同
+IMAGE_FORMAT = "BGRA"
+
+
+def _align(offset: int) -> int:
+    """將位移向上對齊到 ALIGNMENT"""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _source_signature(source_path: Optional[Path]) -> Optional[List[int]]:
+    """取得來源檔案的 (大小, 修改時間)，用於判斷資源包是否過期"""
+    if source_path is None:
+        return None
+    try:
+        stat = source_path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class AssetBundleWriter:
+    """資源包建置器類別"""
+
+    def __init__(self, mixer_format: Optional[Tuple[int, int, int]] = None):
+        self.mixer_format = mixer_format
+        self._images: List[Tuple[str, bytes, Tuple[int, int], Any]] = []
+        self._sounds: List[Tuple[str, bytes, Any]] = []
+
+    def add_image(
+        self, key: str, surface: pygame.Surface, source_path: Optional[Path] = None
+    ) -> None:
+        """
+        加入圖片
+
+        Args:
+            key: 資源鍵（與 AssetLoader 的快取鍵相同）
+            surface: 圖片表面
+            source_path: 來源檔案路徑
+        """
+        data = pygame.image.tobytes(surface, IMAGE_FORMAT)
+        self._images.append(
+            (key, data, surface.get_size(), _source_signature(source_path))
+        )
+
+    def add_sound(
+        self, key: str, sound: pygame.mixer.Sound, source_path: Optional[Path] = None
+    ) -> None:
+        """
+        加入音效（以目前混音器格式的 PCM 儲存）
+
+        Args:
+            key: 資源鍵
+            sound: 音效
+            source_path: 來源檔案路徑
+        """
+        self._sounds.append((key, sound.get_raw(), _source_signature(source_path)))
+
+    def write(self, file_path: Path) -> bool:
+        """
+        寫出資源包
+
+        Args:
+            file_path: 輸出檔案路徑
+
+        Returns:
+            bool: 寫出是否成功
+        """
+        index: Dict[str, Any] = {
+            "mixer": list(self.mixer_format) if self.mixer_format else None,
+            "images": {},
+            "sounds": {},
+        }
+        blobs: List[bytes] = []
+
+        offset = 0
+        for key, data, size, source in self._images:
+            index["images"][key] = {
+                "offset": offset,
+                "length": len(data),
+                "size": list(size),
+                "format": IMAGE_FORMAT,
+                "source": source,
+            }
+            blobs.append(data)
+            offset = _align(offset + len(data))
+        for key, data, source in self._sounds:
+            index["sounds"][key] = {
+                "offset": offset,
+                "length": len(data),
+                "source": source,
+            }
+            blobs.append(data)
+            offset = _align(offset + len(data))
+
+        encoded = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        data_start = _align(HEADER.size + len(encoded))
+
+        try:
+            with atomic_output(file_path) as temp_path, open(temp_path, "wb") as f:
+                f.write(HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(encoded)))
+                f.write(encoded)
+                position = HEADER.size + len(encoded)
+                for blob in blobs:
+                    aligned = data_start + _align(position - data_start)
+                    f.write(b"\0" * (aligned - position))
+                    f.write(blob)
+                    position = aligned + len(blob)
+            return True
+        except OSError as e:
+            print(f"寫出資源包失敗: {e}")
+            return False
+
+
+class AssetBundle:
+    """
+    唯讀資源包類別
+
+    以 mmap 映射整個檔案，讀取資源時只做切片，
+    由作業系統依需求分頁載入，不會一次讀入全部內容。
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        mapping: mmap.mmap,
+        index: Dict[str, Any],
+        data_start: int,
+    ):
+        self.file_path = file_path
+        self._mapping = mapping
+        self._view = memoryview(mapping)
+        self._data_start = data_start
+        self.images: Dict[str, Dict[str, Any]] = index.get("images", {})
+        self.sounds: Dict[str, Dict[str, Any]] = index.get("sounds", {})
+        mixer_format = index.get("mixer")
+        self.mixer_format = tuple(mixer_format) if mixer_format else None
+
+    @classmethod
+    def open(cls, file_path: Path) -> Optional["AssetBundle"]:
+        """
+        開啟資源包
+
+        Args:
+            file_path: 資源包路徑
+
+        Returns:
+            AssetBundle or None: 資源包，檔案不存在或格式錯誤時為 None
+        """
+        if not file_path.exists():
+            return None
+        try:
+            with open(file_path, "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_length = HEADER.unpack_from(mapping, 0)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                mapping.close()
+                print(f"資源包格式不符: {file_path}")
+                return None
+            index = json.loads(mapping[HEADER.size : HEADER.size + index_length])
+            return cls(file_path, mapping, index, _align(HEADER.size + index_length))
+        except (OSError, ValueError, struct.error) as e:
+            print(f"開啟資源包失敗: {e}")
+            return None
+
+    def _is_fresh(self, entry: Dict[str, Any], source_path: Optional[Path]) -> bool:
+        """來源檔案不存在（僅發佈資源包）或未變更時視為有效"""
+        if source_path is None or entry.get("source") is None:
+            return True
+        signature = _source_signature(source_path)
+        return signature is None or signature == entry["source"]
+
+    def get_image(
+        self, key: str, source_path: Optional[Path] = None
+    ) -> Optional[pygame.Surface]:
+        """
+        從資源包建立圖片表面（尚未轉換為顯示格式）
+
+        回傳的表面直接參照映射的記憶體，呼叫端應以 convert_alpha() 複製。
+
+        Args:
+            key: 資源鍵
+            source_path: 來源檔案路徑，用於檢查資源包是否過期
+
+        Returns:
+            pygame.Surface or None: 圖片表面，不在資源包中或已過期時為 None
+        """
+        entry = self.images.get(key)
+        if entry is None or not self._is_fresh(entry, source_path):
+            return None
+        offset = self._data_start + entry["offset"]
+        data = self._view[offset : offset + entry["length"]]
+        return pygame.image.frombuffer(data, tuple(entry["size"]), entry["format"])
+
+    def get_sound(
+        self, key: str, source_path: Optional[Path] = None
+    ) -> Optional[pygame.mixer.Sound]:
+        """
+        從資源包建立音效
+
+        Args:
+            key: 資源鍵
+            source_path: 來源檔案路徑，用於檢查資源包是否過期
+
+        Returns:
+            pygame.mixer.Sound or None: 音效，不在資源包中、已過期
+            或混音器格式與建置時不同時為 None
+        """
+        entry = self.sounds.get(key)
+        if entry is None or not self._is_fresh(entry, source_path):
+            return None
+        if self.mixer_format != pygame.mixer.get_init():
+            return None
+        offset = self._data_start + entry["offset"]
+        return pygame.mixer.Sound(buffer=self._view[offset : offset + entry["length"]])
+
+    def close(self) -> None:
+        """關閉資源包（仍被未轉換的表面參照時交由垃圾回收處理）"""
+        try:
+            self._view.release()
+            self._mapping.close()
+        except BufferError:
+            pass
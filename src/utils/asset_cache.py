@@ -0,0 +1,186 @@
+"""
+資源快取
+依位元組預算管理已載入資源的 LRU 快取，支援釘選常駐資源與命中率統計
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+import pygame
+
+BYTES_PER_MB = 1024 * 1024
+
+# pygame 不提供字體佔用的記憶體，以固定估計值計算
+FONT_ESTIMATED_BYTES = 256 * 1024
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """圖片表面的像素資料大小"""
+    return surface.get_pitch() * surface.get_height()
+
+
+def sound_bytes(sound: pygame.mixer.Sound) -> int:
+    """音效的 PCM 資料大小（依目前混音器格式計算，不複製資料）"""
+    mixer_format = pygame.mixer.get_init()
+    if not mixer_format:
+        return 0
+    frequency, size, channels = mixer_format
+    frames = int(round(sound.get_length() * frequency))
+    return frames * channels * (abs(size) // 8)
+
+
+def font_bytes(font: pygame.font.Font) -> int:
+    """字體的估計記憶體大小"""
+    return FONT_ESTIMATED_BYTES
+
+
+class AssetCache:
+    """
+    位元組預算 LRU 快取
+
+    以 OrderedDict 維護使用順序，超出預算時從最久未使用的項目開始淘汰，
+    釘選的項目不會被淘汰（全部都是釘選項目時允許超出預算）。
+    預算為 0 表示不限制。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        budget_bytes: int = 0,
+        size_of: Callable[[Any], int] = lambda value: 0,
+    ):
+        self.name = name
+        self.budget_bytes = budget_bytes
+        self.size_of = size_of
+
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self.pinned: Set[Hashable] = set()
+        self.total_bytes = 0
+
+        # 統計
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        取得快取項目並標記為最近使用
+
+        Args:
+            key: 快取鍵
+            default: 未命中時的回傳值
+
+        Returns:
+            Any: 快取的資源
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, pin: bool = False) -> None:
+        """
+        加入快取項目，超出預算時淘汰最久未使用的項目
+
+        Args:
+            key: 快取鍵
+            value: 資源
+            pin: 是否釘選（不會被淘汰）
+        """
+        if key in self._entries:
+            self.total_bytes -= self._sizes[key]
+        size = self.size_of(value)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._sizes[key] = size
+        self.total_bytes += size
+        if pin:
+            self.pinned.add(key)
+        self._evict()
+
+    def pin(self, key: Hashable) -> None:
+        """釘選項目（可在載入前先行釘選）"""
+        self.pinned.add(key)
+
+    def unpin(self, key: Hashable) -> None:
+        """取消釘選，超出預算時立即淘汰"""
+        self.pinned.discard(key)
+        self._evict()
+
+    def discard(self, key: Hashable) -> None:
+        """移除項目（不計入淘汰次數）"""
+        if key in self._entries:
+            del self._entries[key]
+            self.total_bytes -= self._sizes.pop(key)
+
+    def set_budget(self, budget_bytes: int) -> None:
+        """變更預算並依新預算淘汰"""
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def _evict(self) -> None:
+        """從最久未使用的一端淘汰未釘選的項目，直到符合預算"""
+        if not self.budget_bytes or self.total_bytes <= self.budget_bytes:
+            return
+        for key in list(self._entries):
+            if self.total_bytes <= self.budget_bytes:
+                break
+            if key in self.pinned:
+                continue
+            del self._entries[key]
+            self.total_bytes -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """清除所有項目與釘選（保留統計）"""
+        self._entries.clear()
+        self._sizes.clear()
+        self.pinned.clear()
+        self.total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        取得快取統計
+
+        Returns:
+            Dict[str, Any]: 項目數、位元組數、預算、命中與淘汰次數
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "pinned": len(self.pinned & self._entries.keys()),
+            "bytes": self.total_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: Hashable) -> Any:
+        """讀取項目（不影響使用順序與統計）"""
+        return self._entries[key]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.put(key, value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def values(self):
+        """走訪所有快取的資源（不影響使用順序與統計）"""
+        return self._entries.values()
+
+
+def budget_from_mb(megabytes: Optional[float]) -> int:
+    """將設定中的 MB 預算轉換為位元組（0 或未設定表示不限制）"""
+    if not megabytes:
+        return 0
+    return int(megabytes * BYTES_PER_MB)
@@ -5,24 +5,130 @@
 
 import pygame
 import os
-from typing import Dict, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
+from .asset_bundle import AssetBundle
+from .asset_cache import (
+    AssetCache,
+    budget_from_mb,
+    font_bytes,
+    sound_bytes,
+    surface_bytes,
+)
+from .audio_convert import AudioConverter
+from .cache import get_cache_dir
+from .font_cache import FontPathCache
+
 
 class AssetLoader:
     """資源載入器類別"""
 
-    def __init__(self, base_path: str = "src/assets"):
+    CJK_FONT_PATHS = [
+        "/System/Library/Fonts/PingFang.ttc",
+        "/System/Library/Fonts/STHeiti Medium.ttc",
+        "/System/Library/Fonts/Hiragino Sans GB.ttc",
+        "C:\\Windows\\Fonts\\msjh.ttc",
+        "C:\\Windows\\Fonts\\msyh.ttc",
+        "C:\\Windows\\Fonts\\simhei.ttf",
+        "C:\\Windows\\Fonts\\simsun.ttc",
+        "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+        "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
+        "/usr/share/fonts/opentype/noto/NotoSansTC-Regular.otf",
+        "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
+    ]
+
+    FALLBACK_FONT_NAMES = [
+        "notosanscjk",
+        "pingfangtc",
+        "pingfanghk",
+        "microsoftjhenghei",
+        "stheitimedium",
+        "stheitilight",
+        "microsoftyahei",
+        "notosanssc",
+        "notosanstc",
+        "notosansmonoCJK",
+        "wenquanyi",
+        "droidsansfallback",
+        "heiti",
+        "simhei",
+    ]
+
+    FONT_CACHE_FILE = "font_cache.json"
+    AUDIO_CACHE_DIR = "audio"
+
+    # 混音器預設格式（可由 config.json 的 audio 區段覆寫）
+    DEFAULT_MIXER_FREQUENCY = 44100
+    DEFAULT_MIXER_CHANNELS = 2
+    DEFAULT_MIXER_BUFFER = 512
+    BUNDLE_FILE = "assets.bundle"
+
+    def __init__(
+        self,
+        base_path: str = "src/assets",
+        font_cache_file: Optional[Path] = None,
+        bundle_file: Optional[Path] = None,
+        cache_config: Optional[Dict[str, Any]] = None,
+        audio_config: Optional[Dict[str, Any]] = None,
+    ):
         self.base_path = Path(base_path)
-        self.loaded_images: Dict[str, pygame.Surface] = {}
-        self.loaded_sounds: Dict[str, pygame.mixer.Sound] = {}
-        self.loaded_fonts: Dict[str, pygame.font.Font] = {}
+
+        # 依位元組預算管理的 LRU 快取（預算見 config.json 的 assets 區段）
+        cache_config = cache_config or {}
+        self.loaded_images = AssetCache(
+            "images",
+            budget_from_mb(cache_config.get("image_cache_mb")),
+            surface_bytes,
+        )
+        self.loaded_sounds = AssetCache(
+            "sounds",
+            budget_from_mb(cache_config.get("sound_cache_mb")),
+            sound_bytes,
+        )
+        self.loaded_fonts = AssetCache(
+            "fonts",
+            budget_from_mb(cache_config.get("font_cache_mb")),
+            font_bytes,
+        )
+        self.master_volume: Optional[float] = None
+
+        # 使用預設靜音音效的快取鍵（檔案缺少或無法解碼）
+        self.fallback_sounds: Set[str] = set()
+
+        # 系統字體搜尋會填入 pygame 的全域字體表，背景載入時需序列化
+        self._font_lock = threading.Lock()
+
+        # 回退字體路徑快取，第二次啟動起略過系統字體掃描
+        if font_cache_file is None:
+            font_cache_file = get_cache_dir() / self.FONT_CACHE_FILE
+        self.font_cache = FontPathCache(
+            font_cache_file, self.CJK_FONT_PATHS + self.FALLBACK_FONT_NAMES
+        )
+        self._fallback_font_path: Optional[str] = None
+        self._fallback_font_resolved = False
 
         # 初始化pygame mixer
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+        audio_config = audio_config or {}
+        pygame.mixer.init(
+            frequency=audio_config.get("frequency", self.DEFAULT_MIXER_FREQUENCY),
+            size=-16,
+            channels=audio_config.get("channels", self.DEFAULT_MIXER_CHANNELS),
+            buffer=audio_config.get("buffer", self.DEFAULT_MIXER_BUFFER),
+        )
+
+        # 音效一次轉換為混音器格式，結果快取於磁碟
+        self.audio_converter = AudioConverter(get_cache_dir(self.AUDIO_CACHE_DIR))
+
+        # 預先轉換的資源包（由 scripts/build_asset_bundle.py 建置），存在時優先使用
+        if bundle_file is None:
+            bundle_file = self.base_path / self.BUNDLE_FILE
+        self.bundle = AssetBundle.open(bundle_file)
 
     def load_image(
-        self, filename: str, subfolder: str = ""
+        self, filename: str, subfolder: str = "", pin: bool = False
     ) -> Optional[pygame.Surface]:
         """
         載入圖片資源
@@ -30,34 +136,73 @@ class AssetLoader:
         Args:
             filename: 檔案名稱
             subfolder: 子資料夾名稱
+            pin: 是否釘選於快取（常駐資源不會被淘汰）
 
         Returns:
             pygame.Surface or None: 載入的圖片表面
         """
-        cache_key = f"{subfolder}/{filename}" if subfolder else filename
+        cache_key = self._make_key(filename, subfolder)
+
+        if pin:
+            self.loaded_images.pin(cache_key)
+
+        surface = self.loaded_images.get(cache_key)
+        if surface is not None:
+            return surface
+
+        surface = self._finish_image(*self._decode_image(filename, subfolder))
+        self.loaded_images.put(cache_key, surface)
+        return surface
+
+    def _make_key(self, filename: str, subfolder: str) -> str:
+        """產生資源快取鍵"""
+        return f"{subfolder}/{filename}" if subfolder else filename
+
+    def _decode_image(
+        self, filename: str, subfolder: str = ""
+    ) -> Tuple[pygame.Surface, bool]:
+        """
+        解碼圖片檔案（不需顯示裝置，可在背景執行緒執行）
 
-        if cache_key in self.loaded_images:
-            return self.loaded_images[cache_key]
+        Args:
+            filename: 檔案名稱
+            subfolder: 子資料夾名稱
 
+        Returns:
+            Tuple[pygame.Surface, bool]: (圖片表面, 是否需轉換為顯示格式)
+        """
         try:
             file_path = self.base_path / "images"
             if subfolder:
                 file_path = file_path / subfolder
             file_path = file_path / filename
 
+            if self.bundle is not None:
+                surface = self.bundle.get_image(
+                    self._make_key(filename, subfolder), file_path
+                )
+                if surface is not None:
+                    return surface, True
+
             if not file_path.exists():
                 # 建立預設圖片
-                surface = self._create_default_image(filename)
-            else:
-                surface = pygame.image.load(str(file_path)).convert_alpha()
-
-            self.loaded_images[cache_key] = surface
-            return surface
+                return self._create_default_image(filename), False
+            return pygame.image.load(str(file_path)), True
 
         except Exception as e:
             print(f"載入圖片失敗 {filename}: {e}")
-            surface = self._create_default_image(filename)
-            self.loaded_images[cache_key] = surface
+            return self._create_default_image(filename), False
+
+    def _finish_image(
+        self, surface: pygame.Surface, needs_convert: bool
+    ) -> pygame.Surface:
+        """將解碼後的圖片轉換為顯示格式（須在主執行緒執行）"""
+        if not needs_convert:
+            return surface
+        try:
+            return surface.convert_alpha()
+        except pygame.error as e:
+            print(f"轉換圖片格式失敗: {e}")
             return surface
 
     def _create_default_image(self, filename: str) -> pygame.Surface:
@@ -86,53 +231,110 @@ class AssetLoader:
 
         return surface
 
-    def load_sound(self, filename: str, subfolder: str = "") -> pygame.mixer.Sound:
+    def load_sound(
+        self, filename: str, subfolder: str = "", pin: bool = False
+    ) -> pygame.mixer.Sound:
         """
         載入音效資源
 
         Args:
             filename: 檔案名稱
             subfolder: 子資料夾名稱
+            pin: 是否釘選於快取（常駐資源不會被淘汰）
 
         Returns:
             pygame.mixer.Sound or None: 載入的音效
         """
-        cache_key = f"{subfolder}/{filename}" if subfolder else filename
+        cache_key = self._make_key(filename, subfolder)
 
-        if cache_key in self.loaded_sounds:
-            return self.loaded_sounds[cache_key]
+        if pin:
+            self.loaded_sounds.pin(cache_key)
 
+        sound = self.loaded_sounds.get(cache_key)
+        if sound is not None:
+            return sound
+
+        sound = self._decode_sound(filename, subfolder)
+        self._cache_sound(cache_key, sound)
+        return sound
+
+    def _cache_sound(self, cache_key: str, sound: pygame.mixer.Sound) -> None:
+        """放入音效快取，並套用目前的主音量（被淘汰後重新載入時保持一致）"""
+        if self.master_volume is not None:
+            sound.set_volume(self.master_volume)
+        self.loaded_sounds.put(cache_key, sound)
+
+    def _decode_sound(self, filename: str, subfolder: str = "") -> pygame.mixer.Sound:
+        """解碼音效檔案（可在背景執行緒執行）"""
         try:
             file_path = self.base_path / "sounds"
             if subfolder:
                 file_path = file_path / subfolder
             file_path = file_path / filename
 
+            if self.bundle is not None:
+                sound = self.bundle.get_sound(
+                    self._make_key(filename, subfolder), file_path
+                )
+                if sound is not None:
+                    return sound
+
             if not file_path.exists():
                 # 建立預設音效（靜音）
-                sound = self._create_default_sound()
-            else:
-                sound = pygame.mixer.Sound(str(file_path))
+                return self._missing_sound(filename, subfolder)
 
-            self.loaded_sounds[cache_key] = sound
-            return sound
+            sound = self.audio_converter.load_sound(file_path)
+            if sound is not None:
+                return sound
+            return pygame.mixer.Sound(str(file_path))
 
         except Exception as e:
             print(f"載入音效失敗 {filename}: {e}")
-            sound = self._create_default_sound()
-            self.loaded_sounds[cache_key] = sound
-            return sound
+            return self._missing_sound(filename, subfolder)
+
+    def _missing_sound(self, filename: str, subfolder: str) -> pygame.mixer.Sound:
+        """記錄無法載入的音效並回傳預設音效"""
+        self.fallback_sounds.add(self._make_key(filename, subfolder))
+        return self._create_default_sound()
+
+    def is_fallback_sound(self, filename: str, subfolder: str = "") -> bool:
+        """
+        音效是否因檔案缺少或無法解碼而使用預設的靜音音效
+
+        Args:
+            filename: 檔案名稱
+            subfolder: 子資料夾名稱
+
+        Returns:
+            bool: 是否為預設音效
+        """
+        return self._make_key(filename, subfolder) in self.fallback_sounds
+
+    def replace_sound(
+        self, filename: str, subfolder: str, sound: pygame.mixer.Sound
+    ) -> None:
+        """
+        以其他來源（如程序化合成）的音效取代快取中的項目
+
+        Args:
+            filename: 檔案名稱
+            subfolder: 子資料夾名稱
+            sound: 音效
+        """
+        cache_key = self._make_key(filename, subfolder)
+        self.fallback_sounds.discard(cache_key)
+        self._cache_sound(cache_key, sound)
 
     def _create_default_sound(self) -> pygame.mixer.Sound:
         """建立預設音效（無聲音效）"""
         try:
-            # 建立空的音效資料
-            sample_rate = 22050
+            # 依實際的混音器格式建立空的音效資料
+            sample_rate, size, channels = pygame.mixer.get_init()
             duration = 0.1  # 0.1秒
             samples = int(sample_rate * duration)
 
             # 建立無聲的bytearray
-            sound_data = bytearray(samples * 2)  # 16-bit音訊
+            sound_data = bytearray(samples * channels * (abs(size) // 8))
 
             # 使用bytearray直接建立音效
             sound = pygame.mixer.Sound(buffer=sound_data)
@@ -143,7 +345,7 @@ class AssetLoader:
             return pygame.mixer.Sound(buffer=bytearray(100))
 
     def load_font(
-        self, filename: Optional[str] = None, size: int = 24
+        self, filename: Optional[str] = None, size: int = 24, pin: bool = False
     ) -> pygame.font.Font:
         """
         載入字體
@@ -151,95 +353,105 @@ class AssetLoader:
         Args:
             filename: 字體檔案名稱，為None時使用預設字體
             size: 字體大小
+            pin: 是否釘選於快取（常駐資源不會被淘汰）
 
         Returns:
             pygame.font.Font: 載入的字體
         """
-        cache_key = f"{filename}_{size}"
+        cache_key = self._make_font_key(filename, size)
+
+        if pin:
+            self.loaded_fonts.pin(cache_key)
+
+        font = self.loaded_fonts.get(cache_key)
+        if font is not None:
+            return font
+
+        font = self._create_font(filename, size)
+        self.loaded_fonts.put(cache_key, font)
+        return font
 
-        if cache_key in self.loaded_fonts:
-            return self.loaded_fonts[cache_key]
+    def _make_font_key(self, filename: Optional[str], size: int) -> str:
+        """產生字體快取鍵"""
+        return f"{filename}_{size}"
 
+    def _create_font(self, filename: Optional[str], size: int) -> pygame.font.Font:
+        """建立字體（可在背景執行緒執行）"""
         try:
             if filename:
                 file_path = self.base_path / "fonts" / filename
                 if file_path.exists():
-                    font = pygame.font.Font(str(file_path), size)
-                else:
-                    # 如果指定的字體檔案不存在，嘗試載入系統字體
-                    font = self._load_fallback_font(size)
-            else:
-                # 未指定字體，載入支援中文的系統字體
-                font = self._load_fallback_font(size)
-
-            self.loaded_fonts[cache_key] = font
-            return font
+                    return pygame.font.Font(str(file_path), size)
+                # 如果指定的字體檔案不存在，嘗試載入系統字體
+                return self._load_fallback_font(size)
+            # 未指定字體，載入支援中文的系統字體
+            return self._load_fallback_font(size)
 
         except Exception as e:
             print(f"載入字體失敗 {filename}: {e}")
-            font = self._load_fallback_font(size)
-            self.loaded_fonts[cache_key] = font
-            return font
+            return self._load_fallback_font(size)
 
     def _load_fallback_font(self, size: int) -> pygame.font.Font:
         """載入支援中文的回退系統字體"""
-        cjk_font_paths = [
-            "/System/Library/Fonts/PingFang.ttc",
-            "/System/Library/Fonts/STHeiti Medium.ttc",
-            "/System/Library/Fonts/Hiragino Sans GB.ttc",
-            "C:\\Windows\\Fonts\\msjh.ttc",
-            "C:\\Windows\\Fonts\\msyh.ttc",
-            "C:\\Windows\\Fonts\\simhei.ttf",
-            "C:\\Windows\\Fonts\\simsun.ttc",
-            "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
-            "/usr/share/fonts/opentype/noto/NotoSansTC-Regular.otf",
-            "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-        ]
+        with self._font_lock:
+            return self._search_fallback_font(size)
 
-        for font_path in cjk_font_paths:
+    def _search_fallback_font(self, size: int) -> pygame.font.Font:
+        """以解析出的回退字體路徑建立字體，失敗時使用 pygame 預設字體"""
+        font_path = self._resolve_fallback_font_path()
+        if font_path:
             try:
-                path_obj = Path(font_path)
-                if path_obj.exists():
-                    font = pygame.font.Font(str(path_obj), size)
-                    return font
-            except Exception:
-                pass
+                return pygame.font.Font(font_path, size)
+            except Exception as e:
+                print(f"載入回退字體失敗: {e}")
+        return pygame.font.Font(None, size)
 
-        fallback_fonts = [
-            "notosanscjk",
-            "pingfangtc",
-            "pingfanghk",
-            "microsoftjhenghei",
-            "stheitimedium",
-            "stheitilight",
-            "microsoftyahei",
-            "notosanssc",
-            "notosanstc",
-            "notosansmonoCJK",
-            "wenquanyi",
-            "droidsansfallback",
-            "heiti",
-            "simhei",
-        ]
+    def _resolve_fallback_font_path(self) -> Optional[str]:
+        """
+        取得回退字體路徑，優先使用記憶體與磁碟快取
 
-        for font_name in fallback_fonts:
-            try:
-                font = pygame.font.SysFont(font_name, size)
-                if font:
-                    return font
-            except Exception:
-                pass
+        Returns:
+            Optional[str]: 字體路徑，None 表示使用 pygame 預設字體
+        """
+        if self._fallback_font_resolved:
+            return self._fallback_font_path
+
+        hit, font_path = self.font_cache.load()
+        if not hit:
+            font_path = self._discover_fallback_font_path()
+            self.font_cache.save(font_path)
+
+        self._fallback_font_path = font_path
+        self._fallback_font_resolved = True
+        return font_path
+
+    def _discover_fallback_font_path(self) -> Optional[str]:
+        """依序搜尋字體檔案路徑與系統字體（成本高，結果會寫入快取）"""
+        for font_path in self.CJK_FONT_PATHS:
+            if Path(font_path).exists():
+                return font_path
 
-        for font_name in fallback_fonts:
+        for font_name in self.FALLBACK_FONT_NAMES:
             try:
                 font_path = pygame.font.match_font(font_name)
                 if font_path:
-                    return pygame.font.Font(font_path, size)
+                    return font_path
             except Exception:
                 pass
 
-        return pygame.font.Font(None, size)
+        return None
+
+    def create_preloader(self, max_workers: int = 4) -> "AssetPreloader":
+        """
+        建立背景資源預載器
+
+        Args:
+            max_workers: 解碼工作執行緒數
+
+        Returns:
+            AssetPreloader: 預載器
+        """
+        return AssetPreloader(self, max_workers)
 
     def set_master_volume(self, volume: float) -> None:
         """
@@ -248,14 +460,130 @@ class AssetLoader:
         Args:
             volume: 音量值 (0.0 - 1.0)
         """
+        self.master_volume = volume
         pygame.mixer.music.set_volume(volume)
         for sound in self.loaded_sounds.values():
             if sound:
                 sound.set_volume(volume)
 
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        取得各資源快取的統計
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 以快取名稱為鍵的統計資料
+        """
+        return {
+            cache.name: cache.get_stats()
+            for cache in (self.loaded_images, self.loaded_sounds, self.loaded_fonts)
+        }
+
     def cleanup(self) -> None:
         """清理已載入的資源"""
         self.loaded_images.clear()
         self.loaded_sounds.clear()
         self.loaded_fonts.clear()
+        if self.bundle is not None:
+            self.bundle.close()
+            self.bundle = None
         pygame.mixer.quit()
+
+
+class AssetPreloader:
+    """
+    背景資源預載器
+
+    在工作執行緒池中解碼圖片、音效與字體，主執行緒每個影格呼叫 poll()
+    將完成的資源轉換為顯示格式並放入 AssetLoader 快取，期間可持續繪製載入畫面。
+    """
+
+    def __init__(self, asset_loader: AssetLoader, max_workers: int = 4):
+        self.asset_loader = asset_loader
+        self.max_workers = max_workers
+        self._jobs: List[Tuple[str, tuple]] = []
+        self._pending: List[Tuple[str, tuple, Future]] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.completed = 0
+
+    def add_image(self, filename: str, subfolder: str = "") -> None:
+        """加入圖片載入工作"""
+        self._jobs.append(("image", (filename, subfolder)))
+
+    def add_sound(self, filename: str, subfolder: str = "") -> None:
+        """加入音效載入工作"""
+        self._jobs.append(("sound", (filename, subfolder)))
+
+    def add_font(self, filename: Optional[str] = None, size: int = 24) -> None:
+        """加入字體載入工作"""
+        self._jobs.append(("font", (filename, size)))
+
+    @property
+    def total(self) -> int:
+        """工作總數"""
+        return len(self._jobs)
+
+    @property
+    def progress(self) -> float:
+        """完成比例 (0.0 - 1.0)"""
+        if not self._jobs:
+            return 1.0
+        return self.completed / len(self._jobs)
+
+    def is_done(self) -> bool:
+        """所有資源是否都已載入快取"""
+        return self.completed == len(self._jobs)
+
+    def start(self) -> None:
+        """開始在背景解碼所有資源"""
+        loader = self.asset_loader
+        decoders = {
+            "image": loader._decode_image,
+            "sound": loader._decode_sound,
+            "font": loader._create_font,
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="asset-loader"
+        )
+        self._pending = [
+            (kind, args, self._executor.submit(decoders[kind], *args))
+            for kind, args in self._jobs
+        ]
+
+    def poll(self) -> float:
+        """
+        將已解碼完成的資源放入快取（須在主執行緒呼叫）
+
+        Returns:
+            float: 完成比例
+        """
+        still_pending = []
+        for kind, args, future in self._pending:
+            if future.done():
+                self._store(kind, args, future.result())
+            else:
+                still_pending.append((kind, args, future))
+        self._pending = still_pending
+
+        if not self._pending and self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        return self.progress
+
+    def wait(self) -> None:
+        """阻塞直到全部資源載入完成"""
+        for _, _, future in self._pending:
+            future.result()
+        self.poll()
+
+    def _store(self, kind: str, args: tuple, result) -> None:
+        """將解碼結果放入對應的快取"""
+        loader = self.asset_loader
+        if kind == "image":
+            loader.loaded_images.put(
+                loader._make_key(*args), loader._finish_image(*result)
+            )
+        elif kind == "sound":
+            loader._cache_sound(loader._make_key(*args), result)
+        else:
+            loader.loaded_fonts.put(loader._make_font_key(*args), result)
+        self.completed += 1
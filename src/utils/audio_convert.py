@@ -0,0 +1,342 @@
+"""
+音訊格式轉換
+以 NumPy 將 WAV 音效一次性重新取樣並轉換聲道為混音器格式，結果快取於磁碟
+"""
+
+import hashlib
+import wave
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from .persistence import atomic_write
+
+# 混音器固定使用有號 16-bit 取樣
+MIXER_SAMPLE_SIZE = -16
+INT16_MAX = 32767
+
+
+def decode_pcm(data: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """
+    將交錯的 PCM 位元組解碼為浮點取樣
+
+    Args:
+        data: PCM 資料
+        sample_width: 每個取樣的位元組數（1 - 4）
+        channels: 聲道數
+
+    Returns:
+        np.ndarray: float32 取樣陣列 [影格數, 聲道數]，範圍 -1.0 ~ 1.0
+    """
+    if sample_width == 1:
+        # 8-bit WAV 為無號整數
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif sample_width == 2:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768
+    elif sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        values = (
+            raw[:, 0].astype(np.int32)
+            | (raw[:, 1].astype(np.int32) << 8)
+            | (raw[:, 2].astype(np.int32) << 16)
+        )
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        samples = values.astype(np.float32) / 8388608
+    elif sample_width == 4:
+        samples = np.frombuffer(data, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"不支援的取樣寬度: {sample_width * 8} bit")
+
+    return samples.reshape(-1, channels)
+
+
+def read_wav(file_path: Path) -> Tuple[np.ndarray, int]:
+    """
+    讀取 PCM WAV 檔案
+
+    Args:
+        file_path: WAV 檔案路徑
+
+    Returns:
+        Tuple[np.ndarray, int]: (float32 取樣陣列 [影格數, 聲道數], 取樣率)，
+            取樣值範圍 -1.0 ~ 1.0
+    """
+    with wave.open(str(file_path), "rb") as wav_file:
+        channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        rate = wav_file.getframerate()
+        data = wav_file.readframes(wav_file.getnframes())
+
+    return decode_pcm(data, sample_width, channels), rate
+
+
+class WavBlockReader:
+    """
+    分塊讀取 WAV 檔案
+
+    每次只解碼固定影格數的區塊，長篇歌曲的分析不需將整首歌載入記憶體。
+    """
+
+    BLOCK_FRAMES = 65536
+
+    def __init__(self, file_path: Path, block_frames: int = BLOCK_FRAMES):
+        self.block_frames = block_frames
+        self._wav = wave.open(str(file_path), "rb")
+        self.channels = self._wav.getnchannels()
+        self.sample_width = self._wav.getsampwidth()
+        self.sample_rate = self._wav.getframerate()
+        self.frame_count = self._wav.getnframes()
+
+    @property
+    def duration(self) -> float:
+        """音訊長度（秒）"""
+        return self.frame_count / self.sample_rate if self.sample_rate else 0.0
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        """
+        依序產生取樣區塊
+
+        Returns:
+            Iterator[np.ndarray]: float32 取樣陣列 [影格數, 聲道數]
+        """
+        while True:
+            data = self._wav.readframes(self.block_frames)
+            if not data:
+                return
+            yield decode_pcm(data, self.sample_width, self.channels)
+
+    def seek(self, frame: int) -> None:
+        """
+        移動到指定影格
+
+        Args:
+            frame: 影格位置（超出範圍時限制於檔案內）
+        """
+        self._wav.setpos(max(0, min(frame, self.frame_count)))
+
+    def read(self, frames: int) -> np.ndarray:
+        """
+        從目前位置讀取指定影格數
+
+        Args:
+            frames: 影格數
+
+        Returns:
+            np.ndarray: float32 取樣陣列 [影格數, 聲道數]，到檔尾時可能較短
+        """
+        data = self._wav.readframes(frames)
+        return decode_pcm(data, self.sample_width, self.channels)
+
+    def close(self) -> None:
+        """關閉檔案"""
+        self._wav.close()
+
+    def __enter__(self) -> "WavBlockReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def convert_channels(samples: np.ndarray, channels: int) -> np.ndarray:
+    """
+    轉換聲道數（單聲道複製到各聲道，多聲道縮混為單聲道後再展開）
+
+    Args:
+        samples: 取樣陣列 [影格數, 聲道數]
+        channels: 目標聲道數
+
+    Returns:
+        np.ndarray: 取樣陣列 [影格數, 目標聲道數]
+    """
+    source_channels = samples.shape[1]
+    if source_channels == channels:
+        return samples
+    mono = samples if source_channels == 1 else samples.mean(axis=1, keepdims=True)
+    return np.repeat(mono, channels, axis=1)
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """
+    以線性內插重新取樣
+
+    Args:
+        samples: 取樣陣列 [影格數, 聲道數]
+        source_rate: 原取樣率
+        target_rate: 目標取樣率
+
+    Returns:
+        np.ndarray: 重新取樣後的陣列
+    """
+    if source_rate == target_rate or samples.shape[0] == 0:
+        return samples
+    frame_count = int(round(samples.shape[0] * target_rate / source_rate))
+    positions = np.arange(frame_count, dtype=np.float64) * (source_rate / target_rate)
+    source_positions = np.arange(samples.shape[0], dtype=np.float64)
+    result = np.empty((frame_count, samples.shape[1]), dtype=np.float32)
+    for channel in range(samples.shape[1]):
+        result[:, channel] = np.interp(positions, source_positions, samples[:, channel])
+    return result
+
+
+def to_int16(samples: np.ndarray) -> np.ndarray:
+    """將 -1.0 ~ 1.0 的浮點取樣轉為交錯的 16-bit 整數"""
+    return (np.clip(samples, -1.0, 1.0) * INT16_MAX).astype("<i2")
+
+
+class StreamingWavWriter:
+    """
+    串流 WAV 寫入器
+
+    取樣先放入預先配置的固定大小區塊，區塊滿時才寫入檔案，
+    記憶體用量與總長度無關；標頭的長度欄位於關閉時由 wave 模組回填。
+    """
+
+    CHUNK_FRAMES = 16384
+
+    def __init__(
+        self,
+        file_path: Path,
+        sample_rate: int,
+        channels: int = 1,
+        chunk_frames: int = CHUNK_FRAMES,
+    ):
+        self.file_path = Path(file_path)
+        self.channels = channels
+        self.frames_written = 0
+        self._chunk = np.empty((chunk_frames, channels), dtype="<i2")
+        self._filled = 0
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._wav = wave.open(str(self.file_path), "wb")
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+
+    def write(self, samples: np.ndarray) -> None:
+        """
+        寫入浮點取樣（-1.0 ~ 1.0）
+
+        Args:
+            samples: 單聲道一維陣列，或 [影格數, 聲道數] 陣列
+        """
+        samples = convert_channels(samples.reshape(samples.shape[0], -1), self.channels)
+        position = 0
+        total = samples.shape[0]
+        capacity = self._chunk.shape[0]
+        while position < total:
+            count = min(capacity - self._filled, total - position)
+            block = samples[position : position + count]
+            self._chunk[self._filled : self._filled + count] = to_int16(block)
+            self._filled += count
+            position += count
+            if self._filled == capacity:
+                self._flush()
+
+    def _flush(self) -> None:
+        """將目前區塊寫入檔案"""
+        if self._filled:
+            self._wav.writeframes(self._chunk[: self._filled].tobytes())
+            self.frames_written += self._filled
+            self._filled = 0
+
+    def close(self) -> None:
+        """寫入剩餘取樣並關閉檔案"""
+        self._flush()
+        self._wav.close()
+
+    def __enter__(self) -> "StreamingWavWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AudioConverter:
+    """
+    音效格式轉換器類別
+
+    轉換結果以「來源內容雜湊 + 目標格式」為鍵存成原始 PCM 檔，
+    之後載入只需讀檔並建立 Sound，不需重新解碼與重新取樣。
+    """
+
+    SUPPORTED_SUFFIXES = (".wav",)
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_path(self, data: bytes, frequency: int, channels: int) -> Path:
+        """取得轉換結果的快取路徑"""
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return self.cache_dir / f"{digest}-{frequency}hz-{channels}ch-s16.pcm"
+
+    def convert_file(self, file_path: Path, frequency: int, channels: int) -> bytes:
+        """
+        將 WAV 檔案轉換為指定格式的交錯 16-bit PCM
+
+        Args:
+            file_path: WAV 檔案路徑
+            frequency: 目標取樣率
+            channels: 目標聲道數
+
+        Returns:
+            bytes: PCM 資料
+        """
+        data = file_path.read_bytes()
+        cache_path = None
+        if self.cache_dir is not None:
+            cache_path = self._cache_path(data, frequency, channels)
+            try:
+                pcm = cache_path.read_bytes()
+                self.hits += 1
+                return pcm
+            except OSError:
+                pass
+
+        self.misses += 1
+        samples, rate = read_wav(file_path)
+        samples = resample(convert_channels(samples, channels), rate, frequency)
+        pcm = to_int16(samples).tobytes()
+
+        if cache_path is not None:
+            self._write_cache(cache_path, pcm)
+        return pcm
+
+    def _write_cache(self, cache_path: Path, pcm: bytes) -> None:
+        """寫入快取"""
+        try:
+            atomic_write(cache_path, pcm)
+        except OSError as e:
+            print(f"寫入音訊快取失敗: {e}")
+
+    def load_sound(self, file_path: Path) -> Optional[pygame.mixer.Sound]:
+        """
+        以目前的混音器格式載入音效
+
+        Args:
+            file_path: 音效檔案路徑
+
+        Returns:
+            pygame.mixer.Sound or None: 音效，
+                格式不支援或無法解析時為 None（交由 SDL 載入）
+        """
+        mixer_format = pygame.mixer.get_init()
+        if (
+            not mixer_format
+            or mixer_format[1] != MIXER_SAMPLE_SIZE
+            or file_path.suffix.lower() not in self.SUPPORTED_SUFFIXES
+        ):
+            return None
+        frequency, _, channels = mixer_format
+        try:
+            pcm = self.convert_file(file_path, frequency, channels)
+        except (wave.Error, EOFError, ValueError):
+            # 非 PCM 編碼或損毀的檔案
+            return None
+        if not pcm:
+            return None
+        return pygame.mixer.Sound(buffer=pcm)
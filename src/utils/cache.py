@@ -0,0 +1,36 @@
+"""
+快取目錄管理
+決定各平台存放可重建快取檔案的位置
+"""
+
+import os
+import sys
+from pathlib import Path
+
+APP_NAME = "dance-game"
+CACHE_DIR_ENV = "DANCE_GAME_CACHE_DIR"
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """
+    取得快取目錄（不會自動建立）
+
+    可用環境變數 DANCE_GAME_CACHE_DIR 覆寫，例如在唯讀系統上指向可寫入的位置。
+
+    Args:
+        *parts: 子目錄名稱
+
+    Returns:
+        Path: 快取目錄路徑
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        base = Path(override)
+    elif sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home())) / APP_NAME / "Cache"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches" / APP_NAME
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / APP_NAME
+
+    return base.joinpath(*parts)
@@ -3,18 +3,58 @@
 管理遊戲配置和設定
 """
 
+import copy
 import json
 import os
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Set
 from pathlib import Path
 
+import pygame
 
-class Config:
-    """配置管理器類別"""
+from .persistence import BackgroundWriter, atomic_write, get_writer, json_encoder
+from .settings import Settings
+
+# 配置變更的訂閱者：接收變更後區段的設定物件（如 AudioSettings）
+ConfigCallback = Callable[[Any], None]
 
-    def __init__(self, config_file: str = "config.json"):
+
+class Config:
+    """
+    配置管理器類別
+
+    config 為驗證後的配置字典（讀寫檔案用）；settings 為由它編譯的不可變設定快照，
+    遊戲中讀取設定應使用 settings 的屬性。
+    """
+
+    # 數值設定的有效範圍（含端點）
+    VALUE_RANGES = {
+        "display.fps": (1, 1000),
+        "audio.master_volume": (0.0, 1.0),
+        "audio.sfx_volume": (0.0, 1.0),
+        "audio.music_volume": (0.0, 1.0),
+    }
+    KEY_BINDINGS_PATH = "controls.key_bindings"
+    # 清單設定的元素型別
+    LIST_ITEM_TYPES = {
+        "library.music_dirs": (str,),
+        "practice.rates": (int, float),
+    }
+
+    def __init__(
+        self,
+        config_file: str = "config.json",
+        writer: Optional[BackgroundWriter] = None,
+    ):
+        """
+        Args:
+            config_file: 配置檔路徑
+            writer: 儲存配置用的背景寫入器，None 時使用共用的寫入器
+        """
         self.config_file = Path(config_file)
+        self.writer = writer or get_writer()
         self.config: Dict[str, Any] = {}
+        self.settings: Settings
+        self._subscribers: Dict[str, List[ConfigCallback]] = {}
 
         # 預設配置
         self.default_config = {
@@ -29,6 +69,9 @@ class Config:
                 "sfx_volume": 0.8,
                 "music_volume": 0.6,
                 "enabled": True,
+                "frequency": 44100,
+                "channels": 2,
+                "buffer": 512,
             },
             "gameplay": {
                 "default_difficulty": "EASY",
@@ -45,6 +88,26 @@ class Config:
                     "START": "K_RETURN",
                 }
             },
+            "assets": {
+                "image_cache_mb": 64,
+                "sound_cache_mb": 64,
+                "font_cache_mb": 4,
+                "preview_cache_mb": 24,
+                "keysound_cache_mb": 32,
+            },
+            "library": {
+                "music_dirs": [],
+                "scan_workers": 0,
+            },
+            "practice": {
+                "rates": [0.9, 0.75],
+                "workers": 1,
+            },
+            "performance": {
+                "profiler_enabled": False,
+                "profiler_dump_path": "profiles/frame_profile.json",
+                "gc_safe_points": True,
+            },
         }
 
         self.load_config()
@@ -56,55 +119,225 @@ class Config:
                 with open(self.config_file, "r", encoding="utf-8") as f:
                     loaded_config = json.load(f)
 
-                # 合併載入的配置與預設配置
-                self.config = self._deep_merge(
-                    self.default_config.copy(), loaded_config
-                )
+                # 驗證並合併載入的配置與預設配置
+                self.config = self.validate(loaded_config)
             else:
-                # 如果配置檔案不存在，使用預設配置
-                self.config = self.default_config.copy()
+                # 如果配置檔案不存在，使用預設配置（由背景寫入器建立檔案）
+                self.config = copy.deepcopy(self.default_config)
                 self.save_config()
 
         except Exception as e:
             print(f"載入配置失敗，使用預設配置: {e}")
-            self.config = self.default_config.copy()
+            self.config = copy.deepcopy(self.default_config)
+        self.settings = Settings.from_config(self.config)
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """
+        讀取並驗證配置檔案，不套用（供背景執行緒重新載入）
+
+        無效的值保留目前的設定。
+
+        Returns:
+            Dict[str, Any] or None: 驗證後的完整配置，檔案不存在或無法解析時為 None
+        """
+        try:
+            with open(self.config_file, "r", encoding="utf-8") as f:
+                loaded_config = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"重新載入配置失敗: {e}")
+            return None
+        if not isinstance(loaded_config, dict):
+            print("重新載入配置失敗: 最上層必須是物件")
+            return None
+        return self.validate(loaded_config, fallback=self.config)
+
+    def validate(
+        self, loaded: Dict[str, Any], fallback: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        以預設配置為基礎驗證並合併載入的配置
+
+        型別與預設值不同、超出範圍或無效的按鍵名稱會回報並改用 fallback 中的值
+        （未指定時為預設值）；檔案中沒有的鍵使用預設值，預設配置沒有的鍵原樣保留。
+
+        Args:
+            loaded: 從檔案載入的配置
+            fallback: 無效值改用的配置（重新載入時為目前的配置）
+
+        Returns:
+            Dict[str, Any]: 驗證後的完整配置（不與預設配置共用物件）
+        """
+        config = self._validated(
+            "", self.default_config, loaded, fallback or self.default_config
+        )
+        bindings = config["controls"]["key_bindings"]
+        if len(set(bindings.values())) != len(bindings):
+            print(f"配置 {self.KEY_BINDINGS_PATH} 有重複的按鍵，保留原本的設定")
+            fallback_controls = (fallback or self.default_config)["controls"]
+            config["controls"]["key_bindings"] = copy.deepcopy(
+                fallback_controls["key_bindings"]
+            )
+        return config
+
+    def _validated(self, key_path: str, default: Any, value: Any, fallback: Any) -> Any:
+        """遞迴驗證單一配置值"""
+        if isinstance(default, dict):
+            if not isinstance(value, dict):
+                print(f"配置 {key_path} 必須是物件，保留原本的設定")
+                return copy.deepcopy(fallback)
+            result = copy.deepcopy(default)
+            fallback = fallback if isinstance(fallback, dict) else default
+            for key, item in value.items():
+                path = f"{key_path}.{key}" if key_path else key
+                if key in default:
+                    result[key] = self._validated(
+                        path, default[key], item, fallback.get(key, default[key])
+                    )
+                elif key_path == self.KEY_BINDINGS_PATH:
+                    # 預設配置沒有的動作同樣必須是有效的按鍵名稱
+                    if self._is_valid(path, "", item):
+                        result[key] = item
+                    elif key in fallback:
+                        print(f"配置 {path} 的值無效，保留原本的設定: {item!r}")
+                        result[key] = fallback[key]
+                    else:
+                        print(f"配置 {path} 的值無效，略過: {item!r}")
+                else:
+                    result[key] = copy.deepcopy(item)
+            return result
+
+        if not self._is_valid(key_path, default, value):
+            print(f"配置 {key_path} 的值無效，保留原本的設定: {value!r}")
+            return copy.deepcopy(fallback)
+        return copy.deepcopy(value)
+
+    def _is_valid(self, key_path: str, default: Any, value: Any) -> bool:
+        """檢查值的型別、範圍與按鍵名稱"""
+        if isinstance(default, bool):
+            valid = isinstance(value, bool)
+        elif isinstance(default, int):
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        elif isinstance(default, float):
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        else:
+            valid = isinstance(value, type(default))
+        if not valid:
+            return False
+
+        if key_path in self.LIST_ITEM_TYPES:
+            item_types = self.LIST_ITEM_TYPES[key_path]
+            return all(
+                isinstance(item, item_types) and not isinstance(item, bool)
+                for item in value
+            )
+        if key_path in self.VALUE_RANGES:
+            low, high = self.VALUE_RANGES[key_path]
+            return low <= value <= high
+        if key_path.startswith(self.KEY_BINDINGS_PATH + "."):
+            return value.startswith("K_") and isinstance(
+                getattr(pygame, value, None), int
+            )
+        return True
+
+    @staticmethod
+    def diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Set[str]]:
+        """
+        比較兩份配置
+
+        Args:
+            old: 原本的配置
+            new: 新的配置
+
+        Returns:
+            Dict[str, Set[str]]: 有變更的區段對應其中變更的鍵
+        """
+        changed: Dict[str, Set[str]] = {}
+        for section in old.keys() | new.keys():
+            old_section, new_section = old.get(section), new.get(section)
+            if old_section == new_section:
+                continue
+            if isinstance(old_section, dict) and isinstance(new_section, dict):
+                changed[section] = {
+                    key
+                    for key in old_section.keys() | new_section.keys()
+                    if old_section.get(key) != new_section.get(key)
+                }
+            else:
+                changed[section] = set()
+        return changed
+
+    def subscribe(self, section: str, callback: ConfigCallback) -> None:
+        """
+        訂閱配置區段的變更
+
+        Args:
+            section: 區段名稱（如 'audio'）
+            callback: 區段變更時以新的區段設定物件呼叫
+        """
+        self._subscribers.setdefault(section, []).append(callback)
+
+    def apply(
+        self,
+        new_config: Dict[str, Any],
+        changed: Optional[Dict[str, Set[str]]] = None,
+        settings: Optional[Settings] = None,
+    ) -> List[str]:
+        """
+        套用新的配置並通知變更區段的訂閱者（在主執行緒呼叫）
+
+        Args:
+            new_config: 驗證後的完整配置
+            changed: 變更的區段，None 時重新比較
+            settings: 已由新配置編譯的設定快照，None 時重新編譯
+
+        Returns:
+            List[str]: 有變更的區段
+        """
+        if changed is None:
+            changed = self.diff(self.config, new_config)
+        self.config = new_config
+        self.settings = settings or Settings.from_config(new_config)
+        for section in sorted(changed):
+            for callback in self._subscribers.get(section, []):
+                try:
+                    callback(getattr(self.settings, section))
+                except Exception as e:
+                    print(f"套用配置 {section} 失敗: {e}")
+        return sorted(changed)
 
     def save_config(self) -> bool:
         """
-        儲存配置到檔案
+        排入儲存配置（背景執行緒原子寫入，短時間內多次儲存只寫入一次）
+
+        self.config 在套用新配置時整份替換、不會原地修改，可直接交給寫入器在背景編碼。
 
         Returns:
-            bool: 儲存是否成功
+            bool: 是否成功排入
         """
         try:
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            self.writer.submit(self.config_file, json_encoder(self.config, indent=2))
             return True
         except Exception as e:
             print(f"儲存配置失敗: {e}")
             return False
 
-    def _deep_merge(self, base: Dict, update: Dict) -> Dict:
+    def flush(self, timeout: Optional[float] = None) -> bool:
         """
-        深度合併兩個字典
+        立即寫入排入的配置並等待完成
 
         Args:
-            base: 基礎字典
-            update: 更新字典
+            timeout: 最長等待時間（秒），None 為無限等待
 
         Returns:
-            Dict: 合併後的字典
+            bool: 是否在時限內寫入完成
         """
-        for key, value in update.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                base[key] = self._deep_merge(base[key], value)
-            else:
-                base[key] = value
-        return base
+        return self.writer.flush(timeout)
 
     def get(self, key_path: str, default: Any = None) -> Any:
         """
-        取得配置值
+        取得配置值（每次呼叫都會逐層查詢，遊戲中請改用 settings 的屬性）
 
         Args:
             key_path: 配置鍵路徑（如 'audio.master_volume'）
@@ -125,14 +358,15 @@ class Config:
 
     def set(self, key_path: str, value: Any) -> None:
         """
-        設定配置值
+        設定配置值（經過驗證後套用，並通知變更區段的訂閱者）
 
         Args:
             key_path: 配置鍵路徑（如 'audio.master_volume'）
             value: 要設定的值
         """
         keys = key_path.split(".")
-        config = self.config
+        updated = copy.deepcopy(self.config)
+        config = updated
 
         # 導航到目標位置
         for key in keys[:-1]:
@@ -142,6 +376,7 @@ class Config:
 
         # 設定值
         config[keys[-1]] = value
+        self.apply(self.validate(updated, fallback=self.config))
 
     def get_display_config(self) -> Dict[str, Any]:
         """取得顯示配置"""
@@ -159,9 +394,25 @@ class Config:
         """取得控制配置"""
         return self.get("controls", {})
 
+    def get_assets_config(self) -> Dict[str, Any]:
+        """取得資源快取配置"""
+        return self.get("assets", {})
+
+    def get_library_config(self) -> Dict[str, Any]:
+        """取得歌曲庫配置"""
+        return self.get("library", {})
+
+    def get_practice_config(self) -> Dict[str, Any]:
+        """取得練習模式配置"""
+        return self.get("practice", {})
+
+    def get_performance_config(self) -> Dict[str, Any]:
+        """取得效能分析配置"""
+        return self.get("performance", {})
+
     def reset_to_default(self) -> None:
         """重置為預設配置"""
-        self.config = self.default_config.copy()
+        self.apply(copy.deepcopy(self.default_config))
         self.save_config()
 
     def export_config(self, file_path: str) -> bool:
@@ -175,8 +426,7 @@ class Config:
             bool: 匯出是否成功
         """
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            atomic_write(Path(file_path), json_encoder(self.config, indent=2)())
             return True
         except Exception as e:
             print(f"匯出配置失敗: {e}")
@@ -196,7 +446,7 @@ class Config:
             with open(file_path, "r", encoding="utf-8") as f:
                 imported_config = json.load(f)
 
-            self.config = self._deep_merge(self.default_config.copy(), imported_config)
+            self.apply(self.validate(imported_config))
             return self.save_config()
         except Exception as e:
             print(f"匯入配置失敗: {e}")
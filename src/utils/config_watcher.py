@@ -0,0 +1,222 @@
+"""
+配置檔監看
+在背景執行緒監看配置檔（Linux 以 inotify，其他平台輪詢修改時間），變更時重新讀取並驗證，
+主執行緒每個影格只需收取結果並通知訂閱者
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .config import Config
+from .settings import Settings
+
+FileStamp = Tuple[int, int, int]
+# 重新載入的結果：（讀取時的配置, 驗證後的新配置, 變更的區段, 編譯後的設定快照）
+PendingReload = Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Set[str]], Settings]
+
+
+class InotifyWatch:
+    """
+    以 ctypes 呼叫 libc 的 inotify 監看目錄
+
+    監看目錄而非檔案本身，編輯器以「寫入暫存檔再更名」儲存時也能收到事件。
+    不支援 inotify 的平台建立時會拋出 OSError 或 AttributeError。
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    EVENT_HEADER = struct.Struct("iIII")
+    READ_SIZE = 64 * 1024
+
+    def __init__(self, directory: Path):
+        """
+        Args:
+            directory: 要監看的目錄
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失敗")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch 失敗: {directory}")
+
+    def read_names(self) -> List[str]:
+        """
+        讀取目前所有事件
+
+        Returns:
+            List[str]: 有變動的檔名
+        """
+        try:
+            data = os.read(self.fd, self.READ_SIZE)
+        except BlockingIOError:
+            return []
+        names = []
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            _, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            names.append(os.fsdecode(name))
+            offset += length
+        return names
+
+    def close(self) -> None:
+        """關閉 inotify"""
+        os.close(self.fd)
+
+
+class ConfigWatcher:
+    """
+    配置檔監看類別
+
+    讀檔、解析、驗證與編譯設定快照都在背景執行緒完成，結果連同與當時配置的差異放入佇列；
+    主執行緒的 poll() 只交換佇列並通知有變更區段的訂閱者，不會卡住影格。
+    連續多次變更只套用最後一次。
+    """
+
+    POLL_SECONDS = 1.0
+    # 收到事件後等待檔案寫完的時間，期間的後續事件合併為一次重新載入
+    DEBOUNCE_SECONDS = 0.1
+
+    def __init__(self, config: Config, use_inotify: bool = True):
+        """
+        Args:
+            config: 要監看並更新的配置
+            use_inotify: 是否優先使用 inotify（False 時一律輪詢）
+        """
+        self.config = config
+        self.use_inotify = use_inotify
+        self.mode: Optional[str] = None  # "inotify" 或 "poll"，執行緒啟動後決定
+        self.reloads = 0
+
+        # 以下欄位由 _lock 保護，與背景執行緒共用
+        self._lock = threading.Lock()
+        self._ready: List[PendingReload] = []
+
+        # 停止時寫入喚醒管線，中斷等待 inotify 事件的 select
+        self._stop_event = threading.Event()
+        self._wake_read = self._wake_write = -1
+        self._started = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """啟動背景監看執行緒，並等待監看建立完成"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._started.clear()
+        self._wake_read, self._wake_write = os.pipe()
+        self._thread = threading.Thread(
+            target=self._run, name="config-watcher", daemon=True
+        )
+        self._thread.start()
+        self._started.wait()
+
+    def stop(self) -> None:
+        """停止背景監看執行緒"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        os.write(self._wake_write, b"\0")
+        self._thread.join()
+        self._thread = None
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+    def poll(self) -> List[str]:
+        """
+        套用背景執行緒重新載入的配置（每個影格於主執行緒呼叫）
+
+        Returns:
+            List[str]: 有變更並已通知訂閱者的區段
+        """
+        if not self._ready:
+            return []
+        with self._lock:
+            base, new_config, changed, settings = self._ready[-1]
+            self._ready.clear()
+        # 重新載入後主執行緒又修改過配置時重新比較
+        if self.config.config is not base:
+            return self.config.apply(new_config, settings=settings)
+        return self.config.apply(new_config, changed, settings)
+
+    def _stamp(self) -> Optional[FileStamp]:
+        """取得配置檔的修改時間、大小與 inode（不存在時為 None）"""
+        try:
+            stat = os.stat(self.config.config_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _run(self) -> None:
+        """背景執行緒：等待變更並重新載入"""
+        watch = None
+        if self.use_inotify:
+            try:
+                watch = InotifyWatch(self.config.config_file.resolve().parent)
+            except (OSError, AttributeError) as e:
+                print(f"無法使用 inotify，改為輪詢配置檔: {e}")
+        self.mode = "inotify" if watch else "poll"
+        stamp = self._stamp()
+        self._started.set()
+
+        try:
+            while not self._stop_event.is_set():
+                if watch is not None:
+                    if not self._wait_for_event(watch):
+                        continue
+                elif self._stop_event.wait(self.POLL_SECONDS):
+                    break
+                new_stamp = self._stamp()
+                if new_stamp is None or new_stamp == stamp:
+                    continue
+                stamp = new_stamp
+                self._reload()
+        finally:
+            if watch is not None:
+                watch.close()
+
+    def _wait_for_event(self, watch: InotifyWatch) -> bool:
+        """等待配置檔的 inotify 事件，並合併短時間內的後續事件"""
+        name = self.config.config_file.name
+        readable, _, _ = select.select([watch.fd, self._wake_read], [], [])
+        if self._wake_read in readable or name not in watch.read_names():
+            return False
+        while True:
+            readable, _, _ = select.select(
+                [watch.fd, self._wake_read], [], [], self.DEBOUNCE_SECONDS
+            )
+            if self._wake_read in readable:
+                return False
+            if not readable:
+                return True
+            watch.read_names()
+
+    def _reload(self) -> None:
+        """讀取並驗證配置檔，有差異時放入佇列（失敗時保留目前的配置，繼續監看）"""
+        base = self.config.config
+        try:
+            new_config = self.config.read()
+            if new_config is None:
+                return
+            changed = Config.diff(base, new_config)
+            if not changed:
+                return
+            settings = Settings.from_config(new_config)
+        except Exception as e:
+            print(f"重新載入配置失敗: {e}")
+            return
+        with self._lock:
+            self._ready.append((base, new_config, changed, settings))
+        self.reloads += 1
@@ -0,0 +1,119 @@
+"""
+字體路徑快取
+將回退字體的搜尋結果存到磁碟，之後啟動時略過系統字體掃描
+"""
+
+import hashlib
+import json
+import os
+import platform
+import sys
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import pygame
+
+# 各平台字體設定與字體目錄，任一目錄的修改時間改變即視為快取失效
+FONT_CONFIG_DIRS = {
+    "win32": [Path(os.environ.get("WINDIR", "C:\\Windows")) / "Fonts"],
+    "darwin": [
+        Path("/System/Library/Fonts"),
+        Path("/Library/Fonts"),
+        Path.home() / "Library" / "Fonts",
+    ],
+    "linux": [
+        Path("/etc/fonts"),
+        Path("/etc/fonts/conf.d"),
+        Path("/usr/share/fonts"),
+        Path("/usr/local/share/fonts"),
+        Path.home() / ".config" / "fontconfig",
+        Path.home() / ".local" / "share" / "fonts",
+        Path.home() / ".fonts",
+    ],
+}
+
+
+class FontPathCache:
+    """字體路徑快取類別"""
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        cache_file: Path,
+        candidates: Iterable[str] = (),
+        watched_dirs: Optional[List[Path]] = None,
+    ):
+        self.cache_file = Path(cache_file)
+        self.candidates = list(candidates)
+        if watched_dirs is None:
+            watched_dirs = FONT_CONFIG_DIRS.get(sys.platform, FONT_CONFIG_DIRS["linux"])
+        self.watched_dirs = watched_dirs
+
+    def _cache_key(self) -> str:
+        """以平台、pygame 版本與候選字體清單組成快取鍵"""
+        digest = hashlib.sha1("\n".join(self.candidates).encode("utf-8")).hexdigest()
+        return "|".join(
+            [sys.platform, platform.release(), pygame.version.ver, digest[:12]]
+        )
+
+    def _fingerprint(self) -> List[float]:
+        """取得字體設定目錄的修改時間（不存在的目錄記為0）"""
+        mtimes = []
+        for directory in self.watched_dirs:
+            try:
+                mtimes.append(directory.stat().st_mtime)
+            except OSError:
+                mtimes.append(0.0)
+        return mtimes
+
+    def load(self) -> Tuple[bool, Optional[str]]:
+        """
+        讀取快取的字體路徑
+
+        Returns:
+            Tuple[bool, Optional[str]]: (是否命中, 字體路徑)；
+            路徑為 None 表示先前搜尋後決定使用 pygame 預設字體
+        """
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False, None
+
+        if (
+            entry.get("version") != self.VERSION
+            or entry.get("key") != self._cache_key()
+            or entry.get("fingerprint") != self._fingerprint()
+        ):
+            return False, None
+
+        font_path = entry.get("font_path")
+        if font_path is not None and not Path(font_path).exists():
+            return False, None
+        return True, font_path
+
+    def save(self, font_path: Optional[str]) -> bool:
+        """
+        儲存字體搜尋結果
+
+        Args:
+            font_path: 字體路徑，None 表示使用 pygame 預設字體
+
+        Returns:
+            bool: 儲存是否成功
+        """
+        entry = {
+            "version": self.VERSION,
+            "key": self._cache_key(),
+            "fingerprint": self._fingerprint(),
+            "font_path": font_path,
+        }
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                json.dump(entry, f, indent=2, ensure_ascii=False)
+            return True
+        except OSError as e:
+            print(f"儲存字體快取失敗: {e}")
+            return False
@@ -0,0 +1,239 @@
+"""
+背景持久化
+以「寫入暫存檔、fsync 再更名」的方式原子寫入檔案，寫入中當機不會留下寫到一半的檔案；
+背景寫入器在獨立執行緒編碼與寫入，短時間內對同一檔案的多次儲存合併為一次，
+主執行緒（繪製循環）不會進行任何磁碟寫入
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# 產生檔案內容的函式（在背景執行緒呼叫）
+Encoder = Callable[[], bytes]
+
+
+@contextmanager
+def atomic_output(file_path: Path) -> Iterator[Path]:
+    """
+    原子寫入的暫存路徑：區塊內將內容寫入產生的暫存檔，正常結束時 fsync 後以
+    os.replace 取代目標檔（供以路徑串流寫入的寫入器使用，如 WAV 或資源包）
+
+    Args:
+        file_path: 目標檔案路徑
+
+    Yields:
+        Path: 同目錄下、各行程與執行緒不重複的暫存檔路徑
+
+    Raises:
+        OSError: 寫入失敗（暫存檔會被刪除，原檔案不受影響）
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = file_path.with_name(
+        f"{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        yield temp_path
+        fd = os.open(temp_path, os.O_RDWR)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    _fsync_directory(file_path.parent)
+
+
+def atomic_write(file_path: Path, data: bytes) -> None:
+    """
+    原子寫入檔案（見 atomic_output）
+
+    Args:
+        file_path: 目標檔案路徑
+        data: 檔案內容
+
+    Raises:
+        OSError: 寫入失敗（暫存檔會被刪除，原檔案不受影響）
+    """
+    with atomic_output(file_path) as temp_path:
+        temp_path.write_bytes(data)
+
+
+def _fsync_directory(directory: Path) -> None:
+    """同步目錄項目，確保更名在斷電後仍然存在（不支援的平台略過）"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def json_encoder(data: Any, indent: Optional[int] = None) -> Encoder:
+    """
+    建立 JSON 編碼函式
+
+    Args:
+        data: 要儲存的資料（交給寫入器後不可再修改，需要時請先複製）
+        indent: 縮排空格數，None 為緊湊格式
+
+    Returns:
+        Encoder: 產生 UTF-8 JSON 內容的函式
+    """
+    return lambda: json.dumps(data, indent=indent, ensure_ascii=False).encode("utf-8")
+
+
+class BackgroundWriter:
+    """
+    背景寫入器類別
+
+    submit() 只記錄要寫入的內容與期限並立即返回；背景執行緒在期限到時編碼並原子寫入。
+    期限前再次提交同一檔案時取代先前的內容並延後期限，連續變更只寫入最後一次。
+    """
+
+    DEBOUNCE_SECONDS = 0.5
+
+    def __init__(self, debounce: float = DEBOUNCE_SECONDS):
+        """
+        Args:
+            debounce: 合併同一檔案連續儲存的等待時間（秒）
+        """
+        self.debounce = debounce
+        self.stats = {"submitted": 0, "coalesced": 0, "written": 0, "failed": 0}
+
+        # 以下欄位由 _condition 保護，與背景執行緒共用
+        self._condition = threading.Condition()
+        self._pending: Dict[Path, Tuple[float, Encoder]] = {}
+        self._writing = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(
+        self, file_path: Path, encoder: Encoder, delay: Optional[float] = None
+    ) -> None:
+        """
+        排入寫入
+
+        Args:
+            file_path: 目標檔案路徑
+            encoder: 產生檔案內容的函式（在背景執行緒呼叫）
+            delay: 寫入前的等待時間（秒），None 時使用 debounce
+        """
+        due = time.monotonic() + (self.debounce if delay is None else delay)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("寫入器已關閉")
+            file_path = Path(file_path)
+            if file_path in self._pending:
+                self.stats["coalesced"] += 1
+            self._pending[file_path] = (due, encoder)
+            self.stats["submitted"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="background-writer", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        立即寫入所有排入的內容並等待完成
+
+        Args:
+            timeout: 最長等待時間（秒），None 為無限等待
+
+        Returns:
+            bool: 是否在時限內全部寫入
+        """
+        with self._condition:
+            self._pending = {
+                path: (0.0, encoder) for path, (_, encoder) in self._pending.items()
+            }
+            self._condition.notify_all()
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._writing, timeout
+            )
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        寫入剩餘內容並停止背景執行緒
+
+        Args:
+            timeout: 最長等待時間（秒），None 為無限等待
+
+        Returns:
+            bool: 是否在時限內全部寫入
+        """
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None and flushed:
+            thread.join(timeout)
+        return flushed
+
+    def _run(self) -> None:
+        """背景執行緒：等待期限並寫入到期的檔案"""
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed and not self._pending:
+                        return
+                    now = time.monotonic()
+                    due = [
+                        path
+                        for path, (deadline, _) in self._pending.items()
+                        if deadline <= now
+                    ]
+                    if due:
+                        break
+                    timeout = None
+                    if self._pending:
+                        timeout = min(d for d, _ in self._pending.values()) - now
+                    self._condition.wait(timeout)
+                batch = [(path, self._pending.pop(path)[1]) for path in due]
+                self._writing += 1
+
+            for path, encoder in batch:
+                try:
+                    atomic_write(path, encoder())
+                    self.stats["written"] += 1
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    print(f"寫入檔案失敗 {path}: {e}")
+
+            with self._condition:
+                self._writing -= 1
+                self._condition.notify_all()
+
+
+_writer: Optional[BackgroundWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> BackgroundWriter:
+    """
+    取得共用的背景寫入器（程式結束時自動寫入剩餘內容）
+
+    Returns:
+        BackgroundWriter: 背景寫入器
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BackgroundWriter()
+            atexit.register(_writer.close)
+        return _writer
@@ -0,0 +1,186 @@
+"""
+設定快照
+將驗證後的配置編譯為不可變、具型別的設定物件，熱路徑直接讀取屬性而不需逐層查詢字典；
+按鍵名稱在編譯時轉為 pygame 按鍵碼，並建立按鍵碼對應方向的查詢表
+"""
+
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple
+
+import pygame
+
+# 遊戲的四個方向（按鍵設定中的其他動作不是方向）
+LANES = ("LEFT", "DOWN", "UP", "RIGHT")
+
+
+@dataclass(frozen=True, slots=True)
+class DisplaySettings:
+    """顯示設定"""
+
+    window_width: int
+    window_height: int
+    fullscreen: bool
+    fps: int
+
+
+@dataclass(frozen=True, slots=True)
+class AudioSettings:
+    """音訊設定"""
+
+    master_volume: float
+    sfx_volume: float
+    music_volume: float
+    enabled: bool
+    frequency: int
+    channels: int
+    buffer: int
+
+    @property
+    def music_gain(self) -> float:
+        """實際的音樂音量（主音量乘上音樂音量）"""
+        return self.master_volume * self.music_volume
+
+    @property
+    def sfx_gain(self) -> float:
+        """實際的音效音量（主音量乘上音效音量）"""
+        return self.master_volume * self.sfx_volume
+
+
+@dataclass(frozen=True, slots=True)
+class GameplaySettings:
+    """遊戲設定"""
+
+    default_difficulty: str
+    show_feedback: bool
+    auto_calibration: bool
+
+
+@dataclass(frozen=True, slots=True)
+class ControlSettings:
+    """
+    按鍵設定
+
+    key_bindings 為配置中的按鍵名稱；lane_keys 為按鍵碼對應方向的查詢表，
+    判定時以按下的按鍵碼直接查詢。
+    """
+
+    key_bindings: Mapping[str, str]
+    key_codes: Mapping[str, int]
+    lane_keys: Mapping[int, str]
+    pause_key: int
+    start_key: int
+
+    @classmethod
+    def compile(cls, key_bindings: Dict[str, str]) -> "ControlSettings":
+        """
+        將按鍵名稱編譯為按鍵碼與查詢表
+
+        按鍵名稱通常已在配置驗證時檢查；仍有無效的名稱時略過該動作，不中斷建立設定。
+
+        Args:
+            key_bindings: 動作對應 pygame 按鍵名稱（如 'K_LEFT'）
+
+        Returns:
+            ControlSettings: 按鍵設定
+        """
+        key_codes = {}
+        for action, name in key_bindings.items():
+            key_code = getattr(pygame, name, None) if isinstance(name, str) else None
+            if not isinstance(key_code, int) or not name.startswith("K_"):
+                print(f"無效的按鍵名稱，略過 {action}: {name!r}")
+                continue
+            key_codes[action] = key_code
+        lane_keys = {key_codes[lane]: lane for lane in LANES if lane in key_codes}
+        return cls(
+            key_bindings=MappingProxyType(dict(key_bindings)),
+            key_codes=MappingProxyType(key_codes),
+            lane_keys=MappingProxyType(lane_keys),
+            pause_key=key_codes.get("PAUSE", pygame.K_ESCAPE),
+            start_key=key_codes.get("START", pygame.K_RETURN),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class AssetSettings:
+    """資源快取預算（MB，0 為不限制）"""
+
+    image_cache_mb: int
+    sound_cache_mb: int
+    font_cache_mb: int
+    preview_cache_mb: int
+    keysound_cache_mb: int
+
+
+@dataclass(frozen=True, slots=True)
+class LibrarySettings:
+    """歌曲庫設定"""
+
+    music_dirs: Tuple[str, ...]
+    scan_workers: int
+
+
+@dataclass(frozen=True, slots=True)
+class PracticeSettings:
+    """練習模式設定"""
+
+    rates: Tuple[float, ...]
+    workers: int
+
+
+@dataclass(frozen=True, slots=True)
+class PerformanceSettings:
+    """效能設定（效能分析與垃圾回收）"""
+
+    profiler_enabled: bool
+    profiler_dump_path: str
+    gc_safe_points: bool
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    設定快照類別
+
+    由驗證後的配置一次建立，之後不可修改；配置重新載入時整份替換，
+    持有舊快照的程式碼不會讀到改到一半的設定。
+    """
+
+    display: DisplaySettings
+    audio: AudioSettings
+    gameplay: GameplaySettings
+    controls: ControlSettings
+    assets: AssetSettings
+    library: LibrarySettings
+    practice: PracticeSettings
+    performance: PerformanceSettings
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "Settings":
+        """
+        由驗證後的完整配置建立設定快照
+
+        Args:
+            config: Config.validate() 產生的配置
+
+        Returns:
+            Settings: 設定快照
+        """
+        sections = {}
+        for section in fields(cls):
+            data = config[section.name]
+            if section.type is ControlSettings:
+                sections[section.name] = ControlSettings.compile(data["key_bindings"])
+                continue
+            sections[section.name] = section.type(
+                **{
+                    field.name: _frozen(data[field.name])
+                    for field in fields(section.type)
+                }
+            )
+        return cls(**sections)
+
+
+def _frozen(value: Any) -> Any:
+    """將清單轉為 tuple，讓設定物件的內容也不可修改"""
+    return tuple(value) if isinstance(value, list) else value
@@ -0,0 +1,422 @@
+"""
+精靈圖去背
+以 NumPy 陣列遮罩移除圖片中與邊框相連的灰色棋盤格背景
+（匯出時未保留透明度的「假透明」），並羽化邊緣；
+整個資源目錄以行程池平行處理，依內容雜湊略過未變更的檔案
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from .persistence import atomic_write, json_encoder
+
+DEFAULT_TOLERANCE = 6
+DEFAULT_FEATHER = 1
+
+# 邊框像素中至少此比例為不透明灰色才視為棋盤格背景
+MIN_BORDER_RATIO = 0.5
+# 第二個色階在邊框灰色像素中的最低比例（低於此值視為單色背景）
+MIN_SHADE_RATIO = 0.1
+
+
+def load_rgba(file_path: Path) -> np.ndarray:
+    """
+    載入圖片為 RGBA 陣列
+
+    Args:
+        file_path: 圖片路徑
+
+    Returns:
+        np.ndarray: uint8 陣列 [高, 寬, 4]
+    """
+    surface = pygame.image.load(str(file_path))
+    width, height = surface.get_size()
+    data = pygame.image.tobytes(surface, "RGBA")
+    return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4).copy()
+
+
+def save_rgba(file_path: Path, pixels: np.ndarray) -> None:
+    """
+    將 RGBA 陣列原子寫入為 PNG
+
+    Args:
+        file_path: 輸出路徑
+        pixels: uint8 陣列 [高, 寬, 4]
+    """
+    height, width = pixels.shape[:2]
+    surface = pygame.image.frombytes(
+        np.ascontiguousarray(pixels).tobytes(), (width, height), "RGBA"
+    )
+    buffer = io.BytesIO()
+    pygame.image.save(surface, buffer, "image.png")
+    atomic_write(file_path, buffer.getvalue())
+
+
+def file_digest(file_path: Path) -> str:
+    """計算檔案內容雜湊"""
+    with open(file_path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def gray_levels(pixels: np.ndarray, tolerance: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    計算灰色像素遮罩與灰階值
+
+    逐聲道運算而不沿長度 3 的色彩軸歸約，大圖片快數倍。
+
+    Args:
+        pixels: RGBA 陣列
+        tolerance: RGB 最大差距在此值以內視為灰色
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 灰色遮罩與灰階值 (R+G+B)/3
+    """
+    red, green, blue = (pixels[..., channel].astype(np.int16) for channel in range(3))
+    chroma = np.maximum(np.maximum(red, green), blue)
+    chroma -= np.minimum(np.minimum(red, green), blue)
+    return chroma <= tolerance, (red + green + blue) // 3
+
+
+def detect_checker_shades(
+    pixels: np.ndarray,
+    tolerance: int,
+    levels: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> List[int]:
+    """
+    由邊框像素偵測棋盤格背景的灰階色階
+
+    Args:
+        pixels: RGBA 陣列
+        tolerance: 灰色判定與色階合併的容許誤差
+        levels: 已計算的 gray_levels() 結果
+
+    Returns:
+        List[int]: 棋盤格的灰階值（最多兩個），邊框不是灰色背景時為空清單
+    """
+    gray, level = levels or gray_levels(pixels, tolerance)
+    gray = gray & (pixels[..., 3] > 0)
+
+    def border(values: np.ndarray) -> np.ndarray:
+        return np.concatenate(
+            [values[0], values[-1], values[1:-1, 0], values[1:-1, -1]]
+        )
+
+    border_gray = border(gray)
+    if border_gray.mean() < MIN_BORDER_RATIO:
+        return []
+
+    counts = np.bincount(border(level)[border_gray], minlength=256)
+    total = counts.sum()
+    shades = []
+    for _ in range(2):
+        shade = int(np.argmax(counts))
+        if shades and counts[shade] < total * MIN_SHADE_RATIO:
+            break
+        shades.append(shade)
+        counts[max(0, shade - tolerance) : shade + tolerance + 1] = 0
+    return shades
+
+
+def _fill_runs(seed: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    """將含有種子的水平連續候選區段整段填滿"""
+    starts = candidate.copy()
+    starts[:, 1:] &= ~candidate[:, :-1]
+    run_ids = np.cumsum(starts.ravel()).reshape(candidate.shape) * candidate
+    seeded = np.zeros(int(run_ids.max()) + 1, dtype=bool)
+    seeded[run_ids[seed & candidate]] = True
+    seeded[0] = False
+    return seeded[run_ids]
+
+
+def connected_to_border(candidate: np.ndarray) -> np.ndarray:
+    """
+    取得與圖片邊框相連（4 鄰接）的候選像素
+
+    交替以水平與垂直方向整段填滿連續區段，直到不再擴張；一般精靈圖數次即收斂。
+
+    Args:
+        candidate: 候選像素遮罩 [高, 寬]
+
+    Returns:
+        np.ndarray: 與邊框相連的遮罩
+    """
+    region = np.zeros_like(candidate)
+    region[[0, -1], :] = candidate[[0, -1], :]
+    region[:, [0, -1]] |= candidate[:, [0, -1]]
+    filled = -1
+    while True:
+        region = _fill_runs(region, candidate)
+        region = _fill_runs(region.T, candidate.T).T
+        count = int(region.sum())
+        if count == filled:
+            return region
+        filled = count
+
+
+def _dilate(mask: np.ndarray) -> np.ndarray:
+    """以 4 鄰接擴張遮罩一個像素"""
+    grown = mask.copy()
+    grown[1:] |= mask[:-1]
+    grown[:-1] |= mask[1:]
+    grown[:, 1:] |= mask[:, :-1]
+    grown[:, :-1] |= mask[:, 1:]
+    return grown
+
+
+def remove_checker_background(
+    pixels: np.ndarray,
+    tolerance: int = DEFAULT_TOLERANCE,
+    feather: int = DEFAULT_FEATHER,
+) -> Tuple[np.ndarray, int]:
+    """
+    移除與邊框相連的灰色棋盤格背景
+
+    只移除色階符合邊框棋盤格、且與邊框相連的灰色像素，精靈內部的灰色不受影響。
+    背景旁 feather 像素內的邊緣依距離降低透明度，避免鋸齒與灰邊。
+
+    Args:
+        pixels: RGBA 陣列（不會被修改）
+        tolerance: 灰色判定與色階比對的容許誤差
+        feather: 羽化寬度（像素），0 表示不羽化
+
+    Returns:
+        Tuple[np.ndarray, int]: 處理後的 RGBA 陣列與移除的像素數
+    """
+    levels = gray_levels(pixels, tolerance)
+    shades = detect_checker_shades(pixels, tolerance, levels)
+    if not shades:
+        return pixels, 0
+
+    gray, level = levels
+    alpha = pixels[..., 3]
+    matches = np.zeros_like(gray)
+    for shade in shades:
+        matches |= np.abs(level - shade) <= tolerance
+    checker = gray & matches
+    # 原本就透明的像素也可連通背景
+    background = connected_to_border(checker | (alpha == 0))
+    removed = background & (alpha > 0)
+    if not removed.any():
+        return pixels, 0
+
+    result = pixels.copy()
+    result[..., 3][background] = 0
+    near = background
+    for step in range(1, feather + 1):
+        ring = _dilate(near) & ~near
+        result[..., 3][ring] = (
+            result[..., 3][ring].astype(np.uint16) * step // (feather + 1)
+        ).astype(np.uint8)
+        near = near | ring
+    return result, int(removed.sum())
+
+
+def process_sprite(
+    source: str, output: str, tolerance: int, feather: int
+) -> Tuple[str, Optional[str], int]:
+    """
+    處理單一圖片（在工作行程中執行）
+
+    Args:
+        source: 來源圖片路徑
+        output: 輸出路徑（與來源相同時直接覆寫）
+        tolerance: 容許誤差
+        feather: 羽化寬度
+
+    Returns:
+        Tuple[str, Optional[str], int]: 來源路徑、下次執行時來源應有的內容雜湊
+            （失敗時為 None）、移除的像素數
+    """
+    source_path, output_path = Path(source), Path(output)
+    try:
+        pixels, removed = remove_checker_background(
+            load_rgba(source_path), tolerance, feather
+        )
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if removed:
+            save_rgba(output_path, pixels)
+        elif output_path != source_path:
+            shutil.copyfile(source_path, output_path)
+        return source, file_digest(source_path), removed
+    except (OSError, ValueError, pygame.error) as e:
+        print(f"處理圖片失敗 {source_path.name}: {e}")
+        return source, None, 0
+
+
+class SpriteAlphaProcessor:
+    """
+    精靈圖批次去背類別
+
+    清單記錄每張圖片處理後的內容雜湊、輸出路徑與參數；三者都相同的圖片直接略過，
+    其餘交給行程池平行處理。去背結果再處理一次不會改變，清單遺失時也只是重新檢查。
+    """
+
+    VERSION = 1
+    MANIFEST_FILE = "sprite_alpha.json"
+    SUPPORTED_SUFFIXES = (".png",)
+    INLINE_LIMIT = 4  # 需要處理的圖片不超過此數量時不建立行程池
+
+    def __init__(
+        self,
+        manifest_file: Path,
+        tolerance: int = DEFAULT_TOLERANCE,
+        feather: int = DEFAULT_FEATHER,
+    ):
+        """
+        Args:
+            manifest_file: 清單檔路徑
+            tolerance: 灰色判定與色階比對的容許誤差
+            feather: 羽化寬度（像素）
+        """
+        self.manifest_file = Path(manifest_file)
+        self.params = [self.VERSION, tolerance, feather]
+        # 來源路徑對應 [處理後的來源內容雜湊, 輸出路徑]
+        self.entries: Dict[str, List[str]] = {}
+
+    def load(self) -> bool:
+        """
+        載入清單（參數不同的清單視為無效）
+
+        Returns:
+            bool: 載入是否成功
+        """
+        try:
+            with open(self.manifest_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("params") != self.params:
+                return False
+            self.entries = dict(data["files"])
+            return True
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"載入去背清單失敗: {e}")
+            return False
+
+    def save(self) -> bool:
+        """
+        儲存清單
+
+        Returns:
+            bool: 儲存是否成功
+        """
+        data = {"params": self.params, "files": self.entries}
+        try:
+            atomic_write(self.manifest_file, json_encoder(data)())
+            return True
+        except OSError as e:
+            print(f"儲存去背清單失敗: {e}")
+            return False
+
+    def collect(self, directories: Iterable[Path]) -> List[Path]:
+        """
+        遞迴收集目錄中的圖片（依路徑排序）
+
+        略過以 . 開頭的隱藏檔（如其他工具寫到一半的暫存檔）
+        """
+        files = set()
+        for directory in directories:
+            for suffix in self.SUPPORTED_SUFFIXES:
+                for path in Path(directory).resolve().rglob(f"*{suffix}"):
+                    if not path.name.startswith("."):
+                        files.add(path)
+        return sorted(files)
+
+    def run(
+        self,
+        directories: Iterable[Path],
+        output_dir: Optional[Path] = None,
+        workers: Optional[int] = None,
+        force: bool = False,
+    ) -> Dict[str, int]:
+        """
+        處理目錄中所有圖片
+
+        Args:
+            directories: 圖片目錄（會遞迴處理子目錄）
+            output_dir: 輸出目錄（保留相對於來源目錄的路徑），None 表示覆寫來源
+            workers: 行程池大小（None 為 CPU 核心數）
+            force: 忽略清單，全部重新處理
+
+        Returns:
+            Dict[str, int]: total（圖片總數）、processed（重新處理數）、
+                changed（有移除背景的圖片數）、skipped（略過數）、failed（失敗數）
+        """
+        jobs = []
+        total = unreadable = 0
+        for directory in directories:
+            root = Path(directory).resolve()
+            for source in self.collect([root]):
+                total += 1
+                output = source
+                if output_dir is not None:
+                    output = Path(output_dir).resolve() / source.relative_to(root)
+                try:
+                    digest = file_digest(source)
+                except OSError as e:
+                    print(f"讀取圖片失敗 {source.name}: {e}")
+                    unreadable += 1
+                    continue
+                entry = [digest, str(output)]
+                if (
+                    not force
+                    and self.entries.get(str(source)) == entry
+                    and output.exists()
+                ):
+                    continue
+                jobs.append((str(source), str(output)))
+
+        results = self._process_all(jobs, workers)
+        changed = failed = 0
+        for (source, output), (_, digest, removed) in zip(jobs, results, strict=True):
+            if digest is None:
+                failed += 1
+                self.entries.pop(source, None)
+                continue
+            self.entries[source] = [digest, output]
+            changed += bool(removed)
+        if jobs:
+            self.save()
+        return {
+            "total": total,
+            "processed": len(jobs),
+            "changed": changed,
+            "skipped": total - len(jobs) - unreadable,
+            "failed": failed + unreadable,
+        }
+
+    def _process_all(
+        self, jobs: List[Tuple[str, str]], workers: Optional[int]
+    ) -> List[Tuple[str, Optional[str], int]]:
+        """以行程池平行處理圖片（數量很少時直接在目前行程處理）"""
+        if not jobs:
+            return []
+        sources = [source for source, _ in jobs]
+        outputs = [output for _, output in jobs]
+        tolerances = [self.params[1]] * len(jobs)
+        feathers = [self.params[2]] * len(jobs)
+        if len(jobs) <= self.INLINE_LIMIT or workers == 1:
+            return list(map(process_sprite, sources, outputs, tolerances, feathers))
+
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    process_sprite,
+                    sources,
+                    outputs,
+                    tolerances,
+                    feathers,
+                    chunksize=chunksize,
+                )
+            )
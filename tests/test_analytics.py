@@ -0,0 +1,110 @@
+"""
+時機誤差分析測試
+"""
+
+import math
+import unittest
+import sys
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.analytics import JudgmentLog, TimingAnalytics
+
+
+class TestTimingAnalytics(unittest.TestCase):
+    """時機誤差統計測試"""
+
+    def setUp(self):
+        """測試設定"""
+        self.log = JudgmentLog(capacity=2)
+        self.analytics = TimingAnalytics()
+
+    def test_log_grows_beyond_capacity(self):
+        """測試記錄超過初始容量時自動擴充"""
+        for i in range(5):
+            self.log.record(float(i), "LEFT", 0.01 * i, "PERFECT")
+
+        self.assertEqual(self.log.count, 5)
+        self.assertAlmostEqual(self.log.errors[-1], 0.04)
+        self.assertEqual(self.log.times.tolist(), [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    def test_copy_for_export(self):
+        """測試匯出用的副本不受之後的記錄影響"""
+        self.log.record(1.0, "UP", -0.02, "GOOD")
+        self.log.record(2.0, "DOWN", math.nan, "MISS")
+        snapshot = self.log.copy()
+        self.log.reset()
+        self.log.record(3.0, "LEFT", 0.0, "PERFECT")
+
+        rows = self.analytics.encode_csv(snapshot).decode("utf-8").splitlines()
+        self.assertEqual(
+            rows,
+            [
+                "time_s,lane,judgment,error_ms",
+                "1.0000,UP,GOOD,-20.00",
+                "2.0000,DOWN,MISS,",
+            ],
+        )
+
+    def test_empty_log(self):
+        """測試沒有判定時的統計"""
+        stats = self.analytics.compute(self.log)
+
+        self.assertEqual(stats["sample_count"], 0)
+        self.assertIsNone(stats["mean_ms"])
+
+    def test_mean_and_percentiles(self):
+        """測試平均值與百分位數"""
+        self.log.record(1.0, "LEFT", -0.02, "PERFECT")
+        self.log.record(2.0, "DOWN", 0.0, "PERFECT")
+        self.log.record(3.0, "UP", 0.02, "PERFECT")
+        self.log.record(4.0, "RIGHT", 0.04, "GOOD")
+
+        stats = self.analytics.compute(self.log)
+
+        self.assertAlmostEqual(stats["mean_ms"], 10.0)
+        self.assertAlmostEqual(stats["percentiles_ms"]["p50"], 10.0)
+        self.assertEqual(stats["early_count"], 1)
+        self.assertEqual(stats["late_count"], 2)
+        self.assertEqual(sum(stats["histogram"]["counts"]), 4)
+
+    def test_unjudged_misses_excluded(self):
+        """測試未按下的Miss不列入誤差統計"""
+        self.log.record(1.0, "LEFT", 0.01, "PERFECT")
+        self.log.record(2.0, "LEFT", float("nan"), "MISS")
+
+        stats = self.analytics.compute(self.log)
+
+        self.assertEqual(stats["sample_count"], 1)
+        self.assertEqual(stats["unjudged_miss_count"], 1)
+        self.assertAlmostEqual(stats["mean_ms"], 10.0)
+
+    def test_lane_bias(self):
+        """測試各軌道偏差"""
+        self.log.record(1.0, "LEFT", -0.03, "GOOD")
+        self.log.record(2.0, "LEFT", -0.01, "PERFECT")
+        self.log.record(3.0, "RIGHT", 0.02, "PERFECT")
+
+        bias = self.analytics.compute(self.log)["lane_bias_ms"]
+
+        self.assertAlmostEqual(bias["LEFT"], -20.0)
+        self.assertAlmostEqual(bias["RIGHT"], 20.0)
+        self.assertIsNone(bias["UP"])
+
+    def test_drift(self):
+        """測試誤差隨時間的漂移"""
+        # 每秒延遲增加1ms，即每分鐘60ms
+        for second in range(10):
+            self.log.record(float(second), "UP", second / 1000.0, "PERFECT")
+
+        stats = self.analytics.compute(self.log)
+
+        self.assertTrue(math.isclose(stats["drift_ms_per_minute"], 60.0))
+        segments = [s for s in stats["drift_segments_ms"] if s is not None]
+        self.assertLess(segments[0], segments[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
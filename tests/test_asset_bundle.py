@@ -0,0 +1,109 @@
+"""
+資源包測試
+"""
+
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# 添加src與scripts目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from build_asset_bundle import collect_sounds
+from utils.asset_bundle import AssetBundle, AssetBundleWriter
+
+
+class TestAssetBundle(unittest.TestCase):
+    """資源包測試"""
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.mixer.init(frequency=22050, size=-16, channels=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.mixer.quit()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.bundle_path = self.root / "assets.bundle"
+        self.source_path = self.root / "arrow.png"
+
+        self.surface = pygame.Surface((7, 5), pygame.SRCALPHA)
+        self.surface.fill((10, 20, 30, 128))
+        self.surface.set_at((3, 2), (200, 100, 50, 255))
+        pygame.image.save(self.surface, str(self.source_path))
+
+        writer = AssetBundleWriter(pygame.mixer.get_init())
+        writer.add_image("arrows/arrow.png", self.surface, self.source_path)
+        writer.add_sound(
+            "effects/beep.wav", pygame.mixer.Sound(buffer=bytes(range(256)))
+        )
+        self.assertTrue(writer.write(self.bundle_path))
+        self.bundle = AssetBundle.open(self.bundle_path)
+
+    def tearDown(self):
+        self.bundle.close()
+        self.temp_dir.cleanup()
+
+    def test_image_round_trip(self):
+        """測試圖片像素與尺寸完整還原"""
+        surface = self.bundle.get_image("arrows/arrow.png", self.source_path)
+        self.assertEqual(surface.get_size(), (7, 5))
+        self.assertEqual(surface.get_at((3, 2)), pygame.Color(200, 100, 50, 255))
+        self.assertEqual(surface.get_at((0, 0)), pygame.Color(10, 20, 30, 128))
+
+    def test_sound_round_trip(self):
+        """測試音效 PCM 完整還原"""
+        sound = self.bundle.get_sound("effects/beep.wav")
+        self.assertEqual(sound.get_raw(), bytes(range(256)))
+
+    def test_missing_key(self):
+        """測試不在資源包中的資源回傳 None"""
+        self.assertIsNone(self.bundle.get_image("arrows/none.png"))
+        self.assertIsNone(self.bundle.get_sound("effects/none.wav"))
+
+    def test_stale_source_is_skipped(self):
+        """測試來源檔案變更後不使用資源包內容"""
+        stat = self.source_path.stat()
+        os.utime(self.source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNone(self.bundle.get_image("arrows/arrow.png", self.source_path))
+
+    def test_invalid_file(self):
+        """測試格式錯誤的檔案無法開啟"""
+        bad_path = self.root / "bad.bundle"
+        bad_path.write_bytes(b"not a bundle at all")
+        self.assertIsNone(AssetBundle.open(bad_path))
+        self.assertIsNone(AssetBundle.open(self.root / "missing.bundle"))
+
+
+class TestBuildAssetBundle(unittest.TestCase):
+    """資源包建置工具測試"""
+
+    def test_music_not_bundled(self):
+        """測試只打包音效，不打包串流播放的歌曲"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sounds_dir = Path(temp_dir) / "sounds"
+            for name in ("effects/hit.wav", "effects/ui/click.ogg", "music/song.wav"):
+                path = sounds_dir / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(b"")
+
+            keys = [
+                path.relative_to(sounds_dir).as_posix()
+                for path in collect_sounds(sounds_dir)
+            ]
+            self.assertEqual(keys, ["effects/hit.wav", "effects/ui/click.ogg"])
+
+
+if __name__ == "__main__":
+    unittest.main()
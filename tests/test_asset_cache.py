@@ -0,0 +1,80 @@
+"""
+資源快取測試
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.asset_cache import AssetCache, budget_from_mb
+
+
+class TestAssetCache(unittest.TestCase):
+    """資源快取測試"""
+
+    def setUp(self):
+        # 以字串長度作為項目大小
+        self.cache = AssetCache("test", budget_bytes=10, size_of=len)
+
+    def test_hit_and_miss(self):
+        """測試命中與未命中統計"""
+        self.cache.put("a", "xxx")
+        self.assertEqual(self.cache.get("a"), "xxx")
+        self.assertIsNone(self.cache.get("b"))
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["bytes"], 3)
+        self.assertAlmostEqual(stats["hit_rate"], 0.5)
+
+    def test_lru_eviction(self):
+        """測試超出預算時淘汰最久未使用的項目"""
+        self.cache.put("a", "xxxx")
+        self.cache.put("b", "xxxx")
+        self.cache.get("a")
+        self.cache.put("c", "xxxx")
+
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertIn("c", self.cache)
+        self.assertEqual(self.cache.total_bytes, 8)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_pinned_entries_are_kept(self):
+        """測試釘選項目不會被淘汰，取消釘選後依預算淘汰"""
+        self.cache.pin("a")
+        self.cache.put("a", "xxxx")
+        self.cache.put("b", "xxxx")
+        self.cache.put("c", "xxxx")
+
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertIn("c", self.cache)
+
+        self.cache.unpin("a")
+        self.cache.put("d", "xxxx")
+        self.assertNotIn("a", self.cache)
+        self.assertEqual(self.cache.total_bytes, 8)
+
+    def test_replace_updates_size(self):
+        """測試覆寫項目時更新位元組數"""
+        self.cache.put("a", "xxxxx")
+        self.cache.put("a", "xx")
+        self.assertEqual(self.cache.total_bytes, 2)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_unlimited_budget(self):
+        """測試預算為0時不淘汰"""
+        cache = AssetCache("unlimited", budget_from_mb(0), size_of=len)
+        for index in range(100):
+            cache.put(index, "x" * 100)
+        self.assertEqual(len(cache), 100)
+        self.assertEqual(cache.evictions, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+音訊格式轉換測試
+"""
+
+import tempfile
+import unittest
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.audio_convert import (
+    AudioConverter,
+    convert_channels,
+    read_wav,
+    resample,
+)
+
+
+def write_wav(file_path: Path, samples: np.ndarray, rate: int, channels: int) -> None:
+    """寫出 16-bit PCM WAV 測試檔案"""
+    with wave.open(str(file_path), "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(samples.astype("<i2").tobytes())
+
+
+class TestAudioConvert(unittest.TestCase):
+    """音訊格式轉換測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.wav_path = self.root / "tone.wav"
+        ramp = np.linspace(-16384, 16384, 1000)
+        write_wav(self.wav_path, ramp, 22050, 1)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_wav(self):
+        """測試讀取為正規化的浮點取樣"""
+        samples, rate = read_wav(self.wav_path)
+        self.assertEqual(rate, 22050)
+        self.assertEqual(samples.shape, (1000, 1))
+        self.assertAlmostEqual(float(samples[0, 0]), -0.5, places=3)
+
+    def test_convert_channels(self):
+        """測試單聲道展開與立體聲縮混"""
+        mono = np.array([[0.5], [-0.5]], dtype=np.float32)
+        stereo = convert_channels(mono, 2)
+        self.assertEqual(stereo.shape, (2, 2))
+        np.testing.assert_array_equal(stereo[:, 0], stereo[:, 1])
+
+        mixed = convert_channels(np.array([[1.0, 0.0]], dtype=np.float32), 1)
+        self.assertAlmostEqual(float(mixed[0, 0]), 0.5)
+
+    def test_resample_length(self):
+        """測試重新取樣後長度與數值"""
+        samples = np.linspace(0.0, 1.0, 100, dtype=np.float32).reshape(-1, 1)
+        result = resample(samples, 22050, 44100)
+        self.assertEqual(result.shape, (200, 1))
+        self.assertAlmostEqual(float(result[2, 0]), float(samples[1, 0]), places=5)
+
+    def test_convert_file_uses_cache(self):
+        """測試轉換結果寫入快取並於第二次載入命中"""
+        converter = AudioConverter(self.root / "cache")
+        pcm = converter.convert_file(self.wav_path, 44100, 2)
+        self.assertEqual(len(pcm), 2000 * 2 * 2)
+        self.assertEqual(converter.misses, 1)
+
+        self.assertEqual(converter.convert_file(self.wav_path, 44100, 2), pcm)
+        self.assertEqual(converter.hits, 1)
+
+        # 不同格式使用不同的快取項目
+        converter.convert_file(self.wav_path, 22050, 1)
+        self.assertEqual(converter.misses, 2)
+        self.assertEqual(len(list((self.root / "cache").iterdir())), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
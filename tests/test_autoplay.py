@@ -0,0 +1,61 @@
+"""
+自動遊玩機器人測試
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pygame
+
+from game.arrow import Arrow
+from game.autoplay import AutoplayBot
+
+
+class TestAutoplayBot(unittest.TestCase):
+    """自動遊玩機器人測試"""
+
+    def test_perfect_bot_presses_on_arrival(self):
+        """測試完美設定在箭頭抵達判定線時按鍵"""
+        bot = AutoplayBot()
+        arrow = Arrow("LEFT", 330, 250, 100)  # 距判定線100像素，1秒後抵達
+
+        bot.observe([arrow], current_time=10.0)
+
+        self.assertEqual(bot.poll(10.99), [])
+        self.assertEqual(bot.poll(11.0), [pygame.K_LEFT])
+        self.assertEqual(bot.poll(12.0), [])
+
+    def test_arrow_scheduled_once(self):
+        """測試同一支箭頭只排定一次"""
+        bot = AutoplayBot()
+        arrow = Arrow("UP", 430, 160, 100)
+
+        bot.observe([arrow], current_time=0.0)
+        bot.observe([arrow], current_time=0.05)
+
+        self.assertEqual(bot.poll(1.0), [pygame.K_UP])
+
+    def test_full_miss_rate_never_presses(self):
+        """測試失誤率為1時不按任何鍵"""
+        bot = AutoplayBot(miss_rate=1.0, seed=0)
+        bot.observe([Arrow("DOWN", 380, 300, 100)], current_time=0.0)
+
+        self.assertEqual(bot.poll(100.0), [])
+
+    def test_profile_and_reset(self):
+        """測試預設技巧設定與重置"""
+        bot = AutoplayBot.from_profile("average", seed=1)
+        self.assertGreater(bot.timing_sigma, 0.0)
+
+        bot.observe([Arrow("RIGHT", 480, 300, 100)], current_time=0.0)
+        bot.reset()
+
+        self.assertEqual(bot.poll(100.0), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+音訊節拍分析與自動譜面測試
+"""
+
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.beat_analysis import BeatAnalysis, BeatAnalysisCache, OnsetDetector
+from game.difficulty import Difficulty
+from game.song_generator import SongGenerator
+
+SAMPLE_RATE = 22050
+
+
+class TestBeatAnalysis(unittest.TestCase):
+    """音訊節拍分析測試"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.root = Path(cls.temp_dir.name)
+        cls.song_path = cls.root / "song.wav"
+        generator = SongGenerator(bpm=128, bars=24, seed=5, sample_rate=SAMPLE_RATE)
+        cls.reference = generator.render(cls.song_path)
+        cls.analysis = BeatAnalysis.from_file(cls.song_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def test_streaming_matches_single_pass(self):
+        """測試分塊送入與一次送入的起音包絡相同"""
+        samples = np.random.default_rng(0).uniform(-1, 1, 44100).astype(np.float32)
+        whole = OnsetDetector(44100)
+        whole.feed(samples)
+        streamed = OnsetDetector(44100)
+        for start in range(0, samples.size, 3001):
+            streamed.feed(samples[start : start + 3001])
+        np.testing.assert_allclose(streamed.envelope(), whole.envelope(), rtol=1e-4)
+
+    def test_tempo_estimate(self):
+        """測試速度估計"""
+        self.assertAlmostEqual(self.analysis.bpm, 128, delta=0.2)
+
+    def test_onsets_match_drum_hits(self):
+        """測試鼓點都偵測到起音，時間誤差在 20ms 內"""
+        onsets = self.analysis.onset_times
+        for time, _ in self.reference.notes:
+            self.assertLess(np.min(np.abs(onsets - time)), 0.02)
+
+    def test_chart_scales_with_difficulty(self):
+        """測試譜面密度隨難度提高，且音符間隔符合難度設定"""
+        difficulty = Difficulty()
+        easy = self.analysis.to_chart(difficulty)
+        difficulty.set_difficulty("NORMAL")
+        normal = self.analysis.to_chart(difficulty)
+
+        self.assertGreater(easy.note_count, 0)
+        self.assertGreater(normal.note_count, easy.note_count)
+        self.assertEqual(easy.difficulty, "EASY")
+
+        times = np.array([time for time, _ in easy.notes])
+        self.assertGreaterEqual(np.min(np.diff(times)), 0.4 - 1e-6)
+        beats = (times - easy.offset) / easy.beat_interval
+        np.testing.assert_allclose(beats, np.round(beats), atol=1e-6)
+
+    def test_chart_is_deterministic(self):
+        """測試同一首歌每次產生相同譜面"""
+        difficulty = Difficulty()
+        first = self.analysis.to_chart(difficulty)
+        second = BeatAnalysis.from_dict(self.analysis.to_dict()).to_chart(difficulty)
+        self.assertEqual(
+            [direction for _, direction in first.notes],
+            [direction for _, direction in second.notes],
+        )
+
+    def test_cache_by_content_hash(self):
+        """測試分析結果依內容雜湊快取"""
+        cache = BeatAnalysisCache(self.root / "cache")
+        first = cache.analyze(self.song_path)
+        copy_path = self.root / "renamed.wav"
+        copy_path.write_bytes(self.song_path.read_bytes())
+        second = cache.analyze(copy_path)
+
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(first.digest, second.digest)
+        self.assertAlmostEqual(first.bpm, second.bpm)
+
+    def test_cache_rejects_unsupported(self):
+        """測試不支援的格式回傳 None"""
+        cache = BeatAnalysisCache(self.root / "cache")
+        path = self.root / "song.ogg"
+        path.write_bytes(b"OggS")
+        self.assertIsNone(cache.analyze(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
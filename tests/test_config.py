@@ -0,0 +1,228 @@
+"""
+配置管理測試
+"""
+
+import dataclasses
+import json
+import tempfile
+import time
+import unittest
+import sys
+from pathlib import Path
+from typing import Optional
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pygame
+
+from utils.config import Config
+from utils.config_watcher import ConfigWatcher
+from utils.persistence import BackgroundWriter
+from utils.settings import ControlSettings
+
+
+class TestConfigValidation(unittest.TestCase):
+    """配置驗證測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_file = Path(self.temp_dir.name) / "config.json"
+        self.writer = BackgroundWriter()
+
+    def tearDown(self):
+        self.writer.close()
+        self.temp_dir.cleanup()
+
+    def write(self, data: dict) -> None:
+        self.config_file.write_text(json.dumps(data), encoding="utf-8")
+
+    def test_invalid_values_fall_back(self):
+        """測試型別錯誤、超出範圍與無效按鍵改用預設值，其他值照常載入"""
+        self.write(
+            {
+                "audio": {"master_volume": 3, "music_volume": 0.5},
+                "display": {"fps": "fast", "fullscreen": 1},
+                "controls": {
+                    "key_bindings": {
+                        "LEFT": "K_a",
+                        "UP": "K_nope",
+                        "JUMP": "K_NOPE",
+                        "DASH": "K_x",
+                    }
+                },
+                "custom": {"value": 1},
+            }
+        )
+        config = Config(str(self.config_file), self.writer)
+        self.assertEqual(config.get("audio.master_volume"), 0.7)
+        self.assertEqual(config.get("audio.music_volume"), 0.5)
+        self.assertEqual(config.get("display.fps"), 60)
+        self.assertIs(config.get("display.fullscreen"), False)
+        self.assertEqual(config.get("controls.key_bindings.LEFT"), "K_a")
+        self.assertEqual(config.get("controls.key_bindings.UP"), "K_UP")
+        self.assertIsNone(config.get("controls.key_bindings.JUMP"))
+        self.assertEqual(config.get("controls.key_bindings.DASH"), "K_x")
+        self.assertEqual(config.get("custom.value"), 1)
+        # 載入不會修改預設配置
+        self.assertEqual(config.default_config["audio"]["music_volume"], 0.6)
+
+    def test_duplicate_bindings_keep_previous(self):
+        """測試重複的按鍵設定保留原本的設定"""
+        config = Config(str(self.config_file), self.writer)
+        bindings = {"LEFT": "K_a", "RIGHT": "K_a"}
+        validated = config.validate(
+            {"controls": {"key_bindings": bindings}}, fallback=config.config
+        )
+        self.assertEqual(validated["controls"], config.config["controls"])
+
+    def test_first_launch_saves_in_background(self):
+        """測試首次啟動不在建構時寫入，由背景寫入器建立配置檔"""
+        config = Config(str(self.config_file), self.writer)
+        self.assertFalse(self.config_file.exists())
+        self.assertTrue(config.flush(timeout=5.0))
+        saved = json.loads(self.config_file.read_text(encoding="utf-8"))
+        self.assertEqual(saved, config.default_config)
+
+    def test_apply_notifies_changed_sections(self):
+        """測試套用新配置時只通知有變更的區段"""
+        config = Config(str(self.config_file), self.writer)
+        received = []
+        config.subscribe("audio", lambda section: received.append(("audio", section)))
+        config.subscribe("display", lambda section: received.append(("display", None)))
+
+        new_config = config.validate(
+            {"audio": {"sfx_volume": 0.2}}, fallback=config.config
+        )
+        self.assertEqual(
+            Config.diff(config.config, new_config), {"audio": {"sfx_volume"}}
+        )
+        self.assertEqual(config.apply(new_config), ["audio"])
+        self.assertEqual(received, [("audio", config.settings.audio)])
+        self.assertEqual(config.settings.audio.sfx_volume, 0.2)
+        self.assertEqual(config.get("audio.sfx_volume"), 0.2)
+
+
+class TestSettings(unittest.TestCase):
+    """設定快照測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_file = Path(self.temp_dir.name) / "config.json"
+        self.writer = BackgroundWriter()
+
+    def tearDown(self):
+        self.writer.close()
+        self.temp_dir.cleanup()
+
+    def test_compiled_snapshot(self):
+        """測試按鍵編譯為查詢表，清單轉為 tuple，無效的清單項目改用預設值"""
+        self.config_file.write_text(
+            json.dumps(
+                {
+                    "controls": {"key_bindings": {"LEFT": "K_a", "PAUSE": "K_p"}},
+                    "library": {"music_dirs": ["songs", 3]},
+                    "practice": {"rates": [0.5, 0.75]},
+                }
+            ),
+            encoding="utf-8",
+        )
+        settings = Config(str(self.config_file), self.writer).settings
+        controls = settings.controls
+        self.assertEqual(controls.lane_keys[pygame.K_a], "LEFT")
+        self.assertEqual(controls.lane_keys[pygame.K_DOWN], "DOWN")
+        self.assertNotIn(pygame.K_LEFT, controls.lane_keys)
+        self.assertNotIn(pygame.K_p, controls.lane_keys)
+        self.assertEqual(controls.pause_key, pygame.K_p)
+        self.assertEqual(controls.start_key, pygame.K_RETURN)
+        self.assertEqual(settings.practice.rates, (0.5, 0.75))
+        self.assertEqual(settings.library.music_dirs, ())
+
+    def test_compile_skips_unknown_keys(self):
+        """測試未經驗證的無效按鍵名稱被略過，不中斷建立設定"""
+        controls = ControlSettings.compile(
+            {"LEFT": "K_a", "JUMP": "K_NOPE", "UP": 3, "PAUSE": "pause"}
+        )
+        self.assertEqual(dict(controls.key_codes), {"LEFT": pygame.K_a})
+        self.assertEqual(dict(controls.lane_keys), {pygame.K_a: "LEFT"})
+        self.assertEqual(controls.pause_key, pygame.K_ESCAPE)
+
+    def test_immutable(self):
+        """測試設定快照不可修改"""
+        settings = Config(str(self.config_file), self.writer).settings
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            settings.display.fps = 30
+        with self.assertRaises(TypeError):
+            settings.controls.lane_keys[pygame.K_x] = "LEFT"
+        self.assertFalse(hasattr(settings.audio, "__dict__"))
+
+
+class TestConfigWatcher(unittest.TestCase):
+    """配置檔監看測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_file = Path(self.temp_dir.name) / "config.json"
+        self.writer = BackgroundWriter()
+        self.config = Config(str(self.config_file), self.writer)
+        self.config.flush()
+        self.volumes = []
+        self.config.subscribe(
+            "audio", lambda section: self.volumes.append(section.master_volume)
+        )
+
+    def tearDown(self):
+        self.writer.close()
+        self.temp_dir.cleanup()
+
+    def edit_and_wait(
+        self, watcher: ConfigWatcher, bindings: Optional[dict] = None, **audio
+    ) -> list:
+        """修改配置檔並等待背景執行緒重新載入"""
+        data = json.loads(self.config_file.read_text(encoding="utf-8"))
+        data["audio"].update(audio)
+        data["controls"]["key_bindings"].update(bindings or {})
+        # 以「寫入暫存檔再更名」的方式儲存，與多數編輯器相同
+        temp_path = self.config_file.with_name("config.json.tmp")
+        temp_path.write_text(json.dumps(data), encoding="utf-8")
+        temp_path.replace(self.config_file)
+
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
+            changed = watcher.poll()
+            if changed:
+                return changed
+            time.sleep(0.01)
+        self.fail("配置未在時限內重新載入")
+
+    def check_reload(self, watcher: ConfigWatcher) -> None:
+        watcher.start()
+        try:
+            self.assertEqual(self.edit_and_wait(watcher, master_volume=0.3), ["audio"])
+            self.assertEqual(self.volumes, [0.3])
+            # 無效的值保留目前的設定，同一區段的其他變更照常套用
+            self.edit_and_wait(watcher, master_volume=5, sfx_volume=0.1)
+            self.assertEqual(self.config.get("audio.sfx_volume"), 0.1)
+            self.assertEqual(self.volumes, [0.3, 0.3])
+            # 額外動作的無效按鍵被略過，之後的變更照常重新載入
+            self.edit_and_wait(watcher, {"JUMP": "K_nope"}, master_volume=0.4)
+            self.assertNotIn("JUMP", self.config.get("controls.key_bindings"))
+            self.edit_and_wait(watcher, master_volume=0.5)
+            self.assertEqual(self.volumes, [0.3, 0.3, 0.4, 0.5])
+        finally:
+            watcher.stop()
+
+    def test_reload_inotify(self):
+        """測試以 inotify 監看（不支援時自動改為輪詢）"""
+        self.check_reload(ConfigWatcher(self.config))
+
+    def test_reload_polling(self):
+        """測試輪詢修改時間"""
+        watcher = ConfigWatcher(self.config, use_inotify=False)
+        watcher.POLL_SECONDS = 0.02
+        self.check_reload(watcher)
+        self.assertEqual(watcher.mode, "poll")
+
+
+if __name__ == "__main__":
+    unittest.main()
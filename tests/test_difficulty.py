@@ -0,0 +1,63 @@
+"""
+難度管理系統測試
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.difficulty import Difficulty
+
+
+class TestDifficulty(unittest.TestCase):
+    """難度管理系統測試"""
+
+    def setUp(self):
+        """測試設定"""
+        self.difficulty = Difficulty()
+
+    def test_default_lanes(self):
+        """測試一般難度使用全部四個軌道"""
+        self.assertEqual(
+            self.difficulty.get_active_lanes(), ["LEFT", "DOWN", "UP", "RIGHT"]
+        )
+        self.assertFalse(self.difficulty.is_endless())
+
+    def test_configure_stress(self):
+        """測試設定壓力測試密度與軌道數"""
+        self.assertTrue(self.difficulty.configure_stress(200, lane_count=2))
+        self.difficulty.set_difficulty("STRESS")
+
+        self.assertAlmostEqual(self.difficulty.get_spawn_interval(), 0.005)
+        self.assertEqual(self.difficulty.get_active_lanes(), ["LEFT", "DOWN"])
+        self.assertTrue(self.difficulty.is_endless())
+
+    def test_chart_settings_scale_with_difficulty(self):
+        """測試自動譜面參數隨難度變化"""
+        easy = self.difficulty.get_chart_settings()
+        self.difficulty.set_difficulty("NORMAL")
+        normal = self.difficulty.get_chart_settings()
+
+        self.assertLess(easy["subdivision"], normal["subdivision"])
+        self.assertGreater(easy["min_gap"], normal["min_gap"])
+        self.assertLess(easy["density"], normal["density"])
+
+    def test_configure_stress_rejects_invalid(self):
+        """測試無效的壓力測試設定"""
+        self.assertFalse(self.difficulty.configure_stress(0))
+        self.assertFalse(self.difficulty.configure_stress(100, lane_count=5))
+
+    def test_define_difficulty_name(self):
+        """測試新難度不沿用基礎難度的名稱"""
+        self.assertTrue(self.difficulty.define_difficulty("CUSTOM", base="NORMAL"))
+        self.assertEqual(self.difficulty.difficulties["CUSTOM"]["name"], "Custom")
+
+        self.difficulty.define_difficulty("TUNED", base="EASY", name="Tuned 1")
+        self.assertEqual(self.difficulty.difficulties["TUNED"]["name"], "Tuned 1")
+
+
+if __name__ == "__main__":
+    unittest.main()
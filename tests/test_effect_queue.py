@@ -0,0 +1,70 @@
+"""
+特效佇列測試
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.effect_queue import EffectQueue
+
+
+class TestEffectQueue(unittest.TestCase):
+    """特效環形緩衝區測試"""
+
+    def setUp(self):
+        """測試設定"""
+        self.queue = EffectQueue(capacity=3, duration=1.0)
+
+    def test_push_and_iterate(self):
+        """測試推入與依序走訪"""
+        self.queue.push(0.0, text="PERFECT")
+        self.queue.push(0.5, text="GOOD")
+
+        self.assertEqual(len(self.queue), 2)
+        self.assertEqual([r.text for r in self.queue], ["PERFECT", "GOOD"])
+        self.assertEqual(self.queue[1]["text"], "GOOD")
+
+    def test_expire_pops_from_head(self):
+        """測試過期項目從頭端移除"""
+        self.queue.push(0.0, combo=1)
+        self.queue.push(0.8, combo=2)
+
+        expired = self.queue.expire(1.0)
+
+        self.assertEqual(expired, 1)
+        self.assertEqual(len(self.queue), 1)
+        self.assertEqual(self.queue[0].combo, 2)
+
+    def test_overflow_overwrites_oldest(self):
+        """測試佇列已滿時覆寫最舊項目"""
+        for combo in range(1, 5):
+            self.queue.push(float(combo), combo=combo)
+
+        self.assertEqual(len(self.queue), 3)
+        self.assertEqual([r.combo for r in self.queue], [2, 3, 4])
+
+    def test_records_are_reused(self):
+        """測試記錄物件重複使用，不額外配置"""
+        first = self.queue.push(0.0)
+        self.queue.expire(5.0)
+        for i in range(3):
+            record = self.queue.push(5.0 + i)
+
+        self.assertIs(record, first)
+
+    def test_clear(self):
+        """測試清空佇列"""
+        self.queue.push(0.0)
+        self.queue.clear()
+
+        self.assertEqual(len(self.queue), 0)
+        with self.assertRaises(IndexError):
+            self.queue[0]
+
+
+if __name__ == "__main__":
+    unittest.main()
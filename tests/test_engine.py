@@ -0,0 +1,188 @@
+"""
+遊戲引擎測試（無頭模式）
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+import sys
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.autoplay import AutoplayBot
+from game.chart import Chart
+from game.headless import create_headless_engine, is_playing, start_session, step_frame
+from game.song_generator import SongGenerator
+from game.song_library import SongInfo
+from utils.audio_convert import StreamingWavWriter
+from utils.cache import CACHE_DIR_ENV
+
+
+class TestEngineSong(unittest.TestCase):
+    """以歌曲遊玩的引擎測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.previous_cache = os.environ.get(CACHE_DIR_ENV)
+        os.environ[CACHE_DIR_ENV] = str(self.root / "cache")
+        self.engine = create_headless_engine()
+
+    def tearDown(self):
+        self.engine._cleanup()
+        if self.previous_cache is None:
+            os.environ.pop(CACHE_DIR_ENV, None)
+        else:
+            os.environ[CACHE_DIR_ENV] = self.previous_cache
+        self.temp_dir.cleanup()
+
+    def make_song(self) -> Path:
+        """產生沒有譜面檔的歌曲"""
+        song = self.root / "song.wav"
+        SongGenerator(bpm=120, bars=6, seed=3, sample_rate=22050).render(song)
+        return song
+
+    def test_song_without_sidecar_chart(self):
+        """測試沒有譜面檔的歌曲以自動產生的譜面遊玩"""
+        song = self.make_song()
+        self.assertFalse(Chart.sidecar_path(song).exists())
+
+        engine = self.engine
+        engine.set_autoplay(AutoplayBot())
+        start_session(engine, "EASY", song)
+        chart = engine.chart
+        self.assertGreater(chart.note_count, 0)
+        self.assertEqual(len(chart.note_samples), chart.note_count)
+        self.assertEqual(len(chart.scaled(0.75).notes), chart.note_count)
+        self.assertEqual(len(chart.to_dict()["notes"]), chart.note_count)
+
+        breakdown = engine.score.get_score_breakdown()
+        for _ in range(60 * 10):
+            step_frame(engine, 1 / 60, render=False)
+            breakdown = engine.score.get_score_breakdown()
+            if breakdown["perfect_count"] >= 3:
+                break
+        self.assertTrue(is_playing(engine))
+        self.assertGreaterEqual(breakdown["perfect_count"], 3)
+        self.assertEqual(breakdown["miss_count"], 0)
+
+    def open_song_select(self, paths) -> list:
+        """等待啟動時的歌曲庫掃描結束後，以指定的歌曲清單進入選歌畫面"""
+        for thread in threading.enumerate():
+            if thread.name == "song-library-scan":
+                thread.join()
+        songs = [SongInfo(str(path), 1, 1, sample_rate=22050) for path in paths]
+        self.engine.library.songs = list(songs)
+        self.engine._open_song_select()
+        return songs
+
+    def confirm_song(self) -> None:
+        """確認選歌，等待背景執行緒載入譜面後推進一個影格"""
+        self.engine._confirm_song()
+        self.engine.chart_job.result(timeout=30)
+        step_frame(self.engine, 1 / 60, render=False)
+
+    def finish_practice_job(self, song: Path, result) -> None:
+        """模擬選歌畫面中練習音訊的背景工作完成，並推進一個影格"""
+        engine = self.engine
+        self.open_song_select([song])
+        engine._cycle_song(1)
+        self.assertEqual(engine.selected_song, song)
+        engine.song_chart = engine._load_chart(song)
+        engine.practice_rate = 0.75
+        engine.practice_job = Future()
+        engine.practice_job.set_result(result)
+
+        def render(*args):
+            self.fail("不應在主執行緒產生練習音訊")
+
+        engine.practice.render = render
+        step_frame(engine, 1 / 60, render=False)
+        self.assertTrue(is_playing(engine))
+
+    def test_practice_job_result_used_directly(self):
+        """測試背景工作完成後直接使用其結果開始遊戲"""
+        song = self.make_song()
+        stretched = self.root / "song_0.75.wav"
+        stretched.write_bytes(song.read_bytes())
+
+        self.finish_practice_job(song, str(stretched))
+        self.assertEqual(self.engine.song_audio, stretched)
+        self.assertEqual(self.engine.practice_rate, 0.75)
+
+    def test_failed_practice_job_falls_back(self):
+        """測試背景工作失敗時改用原速，不在主執行緒重新計算"""
+        song = self.make_song()
+
+        self.finish_practice_job(song, None)
+        self.assertEqual(self.engine.song_audio, song)
+        self.assertEqual(self.engine.practice_rate, 1.0)
+
+    def test_song_without_chart_skips_practice_render(self):
+        """測試無法產生譜面的歌曲不產生變速音訊，直接以隨機模式開始"""
+        engine = self.engine
+        song = self.root / "silence.wav"
+        with StreamingWavWriter(song, 22050) as writer:
+            writer.write(np.zeros(22050 * 2, dtype=np.float32))
+        self.open_song_select([song])
+        engine._cycle_song(1)
+        engine.practice_rate = 0.75
+
+        def submit(*args):
+            self.fail("沒有譜面時不應產生變速音訊")
+
+        engine.practice.submit = submit
+        self.confirm_song()
+        self.assertTrue(is_playing(engine))
+        self.assertIsNone(engine.chart)
+        self.assertIsNone(engine.practice_job)
+
+    def test_chart_analyzed_off_main_thread(self):
+        """測試沒有譜面檔的歌曲在背景執行緒分析，繪製循環不等待"""
+        engine = self.engine
+        song = self.make_song()
+        self.open_song_select([song])
+        engine._cycle_song(1)
+        analyze = engine.beat_analysis.analyze
+        threads = []
+
+        def record(*args):
+            threads.append(threading.current_thread())
+            return analyze(*args)
+
+        engine.beat_analysis.analyze = record
+        self.confirm_song()
+        self.assertTrue(is_playing(engine))
+        self.assertGreater(engine.chart.note_count, 0)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+    def test_song_list_change_keeps_selection_consistent(self):
+        """測試背景掃描替換歌曲清單後，所選歌曲與游標一致"""
+        engine = self.engine
+        songs = self.open_song_select(self.root / f"{name}.wav" for name in "abc")
+        engine._cycle_song(3)
+        self.assertEqual(engine.selected_song, Path(songs[2].path))
+
+        # 重新排序：游標跟著所選歌曲移動
+        engine.library.songs = [songs[2], songs[0]]
+        step_frame(engine, 1 / 60)
+        self.assertEqual(engine.song_index, 1)
+        self.assertEqual(engine.selected_song, Path(songs[2].path))
+
+        # 所選歌曲被移除：游標限制於清單範圍內並改選該列的歌曲
+        engine.library.songs = [songs[0]]
+        step_frame(engine, 1 / 60)
+        self.assertEqual(engine.song_index, 1)
+        self.assertEqual(engine.selected_song, Path(songs[0].path))
+        self.assertEqual(engine.preview.target, songs[0].path)
+
+
+if __name__ == "__main__":
+    unittest.main()
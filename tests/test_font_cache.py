@@ -0,0 +1,71 @@
+"""
+字體路徑快取測試
+"""
+
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.font_cache import FontPathCache
+
+
+class TestFontPathCache(unittest.TestCase):
+    """字體路徑快取測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.font_dir = self.root / "fonts"
+        self.font_dir.mkdir()
+        self.font_file = self.font_dir / "test.ttf"
+        self.font_file.write_bytes(b"")
+        self.cache = FontPathCache(
+            self.root / "cache" / "font_cache.json",
+            ["test"],
+            watched_dirs=[self.font_dir],
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_miss_without_cache_file(self):
+        """測試沒有快取檔案時未命中"""
+        self.assertEqual(self.cache.load(), (False, None))
+
+    def test_round_trip(self):
+        """測試儲存後可讀回字體路徑與預設字體"""
+        self.assertTrue(self.cache.save(str(self.font_file)))
+        self.assertEqual(self.cache.load(), (True, str(self.font_file)))
+
+        self.cache.save(None)
+        self.assertEqual(self.cache.load(), (True, None))
+
+    def test_invalidated_by_font_dir_change(self):
+        """測試字體目錄修改時間改變後快取失效"""
+        self.cache.save(str(self.font_file))
+        stat = self.font_dir.stat()
+        os.utime(self.font_dir, (stat.st_atime, stat.st_mtime + 10))
+        self.assertEqual(self.cache.load(), (False, None))
+
+    def test_invalidated_by_candidate_change(self):
+        """測試候選字體清單改變後快取失效"""
+        self.cache.save(str(self.font_file))
+        other = FontPathCache(
+            self.cache.cache_file, ["other"], watched_dirs=[self.font_dir]
+        )
+        self.assertEqual(other.load(), (False, None))
+
+    def test_missing_font_file(self):
+        """測試快取的字體檔案已刪除時未命中"""
+        self.cache.save(str(self.font_file))
+        self.font_file.unlink()
+        self.assertFalse(self.cache.load()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+垃圾回收控制測試
+"""
+
+import gc
+import unittest
+import sys
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.gc_control import GcController
+
+
+class Cycle:
+    """循環參考的物件（只能由垃圾回收釋放）"""
+
+    def __init__(self):
+        self.self_ref = self
+
+
+class TestGcController(unittest.TestCase):
+    """垃圾回收控制測試"""
+
+    def setUp(self):
+        self.controller = GcController()
+        self.controller.install()
+
+    def tearDown(self):
+        self.controller.uninstall()
+        self.assertTrue(gc.isenabled())
+
+    def test_collects_only_at_safe_points(self):
+        """測試遊戲進行中停用自動回收，離開時回收累積的循環參考"""
+        self.controller.set_playing(True)
+        self.assertFalse(gc.isenabled())
+        for _ in range(20000):
+            Cycle()
+        self.assertEqual(self.controller.playing_collections, 0)
+
+        self.controller.set_playing(False)
+        self.assertTrue(gc.isenabled())
+        stats = self.controller.get_stats()
+        self.assertGreaterEqual(stats["collections"][2], 1)
+        self.assertGreaterEqual(stats["collected"], 20000)
+        self.assertEqual(stats["playing_collections"], 0)
+        self.assertEqual(
+            self.controller.histogram.sample_count, sum(stats["collections"])
+        )
+
+    def test_measure_only(self):
+        """測試停用時只量測，遊戲進行中的回收照常發生並被記錄"""
+        self.controller.enabled = False
+        self.controller.set_playing(True)
+        self.assertTrue(gc.isenabled())
+        gc.collect(0)
+        stats = self.controller.get_stats()
+        self.assertEqual(stats["playing_collections"], 1)
+        self.assertGreater(self.controller.histogram.total_ns, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
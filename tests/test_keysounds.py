@@ -0,0 +1,150 @@
+"""
+按鍵音測試
+"""
+
+import os
+import tempfile
+import time
+import unittest
+import sys
+import wave
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game.chart import Chart
+from game.keysounds import KeysoundBank
+from game.sfx_channels import SfxChannelManager
+
+SAMPLE_RATE = 22050
+NOTE_INTERVAL = 0.5
+NOTE_COUNT = 40
+
+
+def write_click(path: Path) -> None:
+    """寫入 0.1 秒的單聲道樣本"""
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(b"\x00\x10" * (SAMPLE_RATE // 10))
+
+
+class TestKeysoundChart(unittest.TestCase):
+    """按鍵音譜面測試"""
+
+    def test_round_trip(self):
+        """測試按鍵音樣本隨譜面存檔，未宣告的樣本視為沒有按鍵音"""
+        chart = Chart(
+            [(1.0, "UP", "kick"), (0.5, "LEFT")], bpm=120, samples={"kick": "k.wav"}
+        )
+        self.assertEqual(chart.notes, [(0.5, "LEFT"), (1.0, "UP")])
+        self.assertEqual(chart.note_samples, ["", "kick"])
+
+        data = chart.to_dict()
+        data["notes"].append([2.0, "DOWN", "snare"])
+        loaded = Chart.from_dict(data)
+        self.assertEqual(loaded.note_samples, ["", "kick", ""])
+        self.assertEqual(loaded.samples, {"kick": "k.wav"})
+        self.assertEqual(loaded.scaled(0.5).note_samples, ["", "kick", ""])
+
+
+class TestKeysoundBank(unittest.TestCase):
+    """按鍵音樣本庫測試"""
+
+    def setUp(self):
+        pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        # 每個音符使用不同樣本，最後一個樣本另外在開頭使用一次
+        samples = {}
+        notes = [(0.0, "LEFT", f"s{NOTE_COUNT - 1}")]
+        for index in range(NOTE_COUNT):
+            name = f"s{index}"
+            samples[name] = f"{name}.wav"
+            write_click(self.root / samples[name])
+            notes.append(((index + 1) * NOTE_INTERVAL, "DOWN", name))
+        self.chart = Chart(notes, bpm=120, samples=samples)
+        self.channels = SfxChannelManager({KeysoundBank.CHANNEL_CATEGORY: 4})
+        self.bank = KeysoundBank(self.chart, self.root, self.channels)
+
+    def tearDown(self):
+        self.bank.close()
+        self.channels.stop()
+        pygame.mixer.quit()
+        self.temp_dir.cleanup()
+
+    def advance(self, song_time: float, timeout: float = 5.0) -> None:
+        """移動視窗並等待背景執行緒載入完成"""
+        self.bank.update(song_time)
+        deadline = time.monotonic() + timeout
+        while self.bank._requested and time.monotonic() < deadline:
+            time.sleep(0.01)
+            self.bank.update(song_time)
+
+    def window_samples(self, song_time: float) -> set:
+        """視窗內音符使用的樣本"""
+        start = song_time - KeysoundBank.RELEASE_DELAY_SECONDS
+        end = song_time + KeysoundBank.LOOKAHEAD_SECONDS
+        return {
+            sample
+            for (note_time, _), sample in zip(
+                self.chart.notes, self.chart.note_samples, strict=True
+            )
+            if start <= note_time <= end
+        }
+
+    def loaded_samples(self) -> set:
+        """目前在快取中的樣本"""
+        return {name for name in self.chart.samples if name in self.bank.cache}
+
+    def test_loads_ahead_and_releases_behind(self):
+        """測試只載入前方視窗的樣本，通過後不再使用的樣本立即釋放"""
+        self.advance(0.0)
+        self.assertEqual(self.loaded_samples(), self.window_samples(0.0))
+
+        self.advance(10.0)
+        loaded = self.loaded_samples()
+        self.assertEqual(loaded, self.window_samples(10.0) | {f"s{NOTE_COUNT - 1}"})
+        self.assertGreater(self.bank.released, 0)
+
+    def test_trigger(self):
+        """測試已載入的樣本可播放，尚未載入時回報延遲"""
+        self.assertFalse(self.bank.trigger("s30"))
+        self.assertEqual(self.bank.late, 1)
+
+        self.advance(0.0)
+        self.assertTrue(self.bank.trigger("s1"))
+        self.assertTrue(self.channels.groups["keysound"].channels[0].get_busy())
+
+    def test_budget_bounds_reused_samples(self):
+        """測試離開視窗但之後仍會使用的樣本受預算限制"""
+        self.bank.close()
+        one_sample = SAMPLE_RATE // 10 * 2
+        self.bank = KeysoundBank(
+            self.chart, self.root, self.channels, budget_bytes=one_sample * 10
+        )
+        self.advance(0.0)
+        self.assertIn(f"s{NOTE_COUNT - 1}", self.bank.cache)
+
+        # 開頭的音符已離開視窗，之後才會再用到的樣本取消釘選，超出預算時先被淘汰
+        self.advance(3.0)
+        self.assertNotIn(f"s{NOTE_COUNT - 1}", self.bank.cache)
+        self.assertLessEqual(self.bank.cache.total_bytes, one_sample * 10)
+
+    def test_seek_reloads_window(self):
+        """測試段落循環回到起點時重新載入視窗內的樣本"""
+        self.advance(15.0)
+        self.assertNotIn("s1", self.bank.cache)
+        self.bank.seek(0.0)
+        self.advance(0.0)
+        self.assertIn("s1", self.bank.cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
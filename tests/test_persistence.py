@@ -0,0 +1,99 @@
+"""
+背景持久化測試
+"""
+
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.persistence import (
+    BackgroundWriter,
+    atomic_output,
+    atomic_write,
+    json_encoder,
+)
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """原子寫入測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_failed_write_keeps_original(self):
+        """測試編碼或寫入失敗時原檔案不變且不留下暫存檔"""
+        file_path = self.root / "data" / "score.json"
+        atomic_write(file_path, b"old")
+
+        writer = BackgroundWriter()
+        writer.submit(file_path, lambda: 1 / 0, delay=0.0)
+        self.assertTrue(writer.close(timeout=5.0))
+
+        self.assertEqual(file_path.read_bytes(), b"old")
+        self.assertEqual(writer.stats["failed"], 1)
+        self.assertEqual([p.name for p in file_path.parent.iterdir()], ["score.json"])
+
+    def test_streamed_output(self):
+        """測試以路徑串流寫入：完成時取代目標檔，中途失敗時刪除暫存檔"""
+        file_path = self.root / "song.wav"
+        with atomic_output(file_path) as temp_path:
+            temp_path.write_bytes(b"new")
+            self.assertFalse(file_path.exists())
+        self.assertEqual(file_path.read_bytes(), b"new")
+
+        with self.assertRaises(OSError):
+            with atomic_output(file_path) as temp_path:
+                temp_path.write_bytes(b"partial")
+                raise OSError("disk full")
+        self.assertEqual(file_path.read_bytes(), b"new")
+        self.assertEqual(list(self.root.iterdir()), [file_path])
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    """背景寫入器測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.writer = BackgroundWriter(debounce=60.0)
+
+    def tearDown(self):
+        self.writer.close()
+        self.temp_dir.cleanup()
+
+    def test_coalesces_until_flush(self):
+        """測試期限前的連續儲存合併為一次，只寫入最後的內容"""
+        file_path = self.root / "config.json"
+        encoded = []
+        for value in range(5):
+            encoder = json_encoder({"value": value})
+            self.writer.submit(file_path, lambda e=encoder: encoded.append(1) or e())
+        self.assertFalse(file_path.exists())
+
+        self.assertTrue(self.writer.flush(timeout=5.0))
+        self.assertEqual(file_path.read_text(encoding="utf-8"), '{"value": 4}')
+        self.assertEqual(len(encoded), 1)
+        self.assertEqual(self.writer.stats["coalesced"], 4)
+        self.assertEqual(self.writer.stats["written"], 1)
+
+    def test_delay(self):
+        """測試指定等待時間的寫入不需 flush 即會完成"""
+        file_path = self.root / "replay.bin"
+        self.writer.submit(file_path, lambda: b"\x01\x02", delay=0.0)
+        with self.writer._condition:
+            self.writer._condition.wait_for(
+                lambda: self.writer.stats["written"] == 1, timeout=5.0
+            )
+        self.assertEqual(file_path.read_bytes(), b"\x01\x02")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+練習模式測試
+"""
+
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game.chart import Chart
+from game.practice import (
+    PracticeRenderer,
+    WsolaStretcher,
+    load_section,
+    render_stretched,
+)
+from utils.audio_convert import StreamingWavWriter, read_wav
+
+SAMPLE_RATE = 22050
+
+
+def stretch(samples: np.ndarray, rate: float, block: int) -> np.ndarray:
+    """分塊送入變速器並取得完整輸出"""
+    stretcher = WsolaStretcher(rate, SAMPLE_RATE, samples.shape[1])
+    chunks = [
+        stretcher.feed(samples[start : start + block])
+        for start in range(0, samples.shape[0], block)
+    ]
+    chunks.append(stretcher.finish())
+    return np.concatenate(chunks)
+
+
+class TestWsolaStretcher(unittest.TestCase):
+    """WSOLA 變速測試"""
+
+    def setUp(self):
+        time = np.arange(SAMPLE_RATE * 2) / SAMPLE_RATE
+        self.tone = (0.5 * np.sin(2 * np.pi * 440 * time)).astype(np.float32)
+        self.tone = self.tone[:, np.newaxis]
+
+    def test_length_and_pitch(self):
+        """測試輸出長度為輸入 / 速率，音高與音量不變"""
+        output = stretch(self.tone, 0.75, 4096)
+        self.assertEqual(output.shape[0], round(self.tone.shape[0] / 0.75))
+
+        steady = output[SAMPLE_RATE // 2 : SAMPLE_RATE // 2 + SAMPLE_RATE, 0]
+        spectrum = np.abs(np.fft.rfft(steady))
+        self.assertEqual(np.argmax(spectrum), 440)
+        self.assertAlmostEqual(np.sqrt(np.mean(steady**2)), 0.5 / np.sqrt(2), 2)
+
+    def test_block_size_independent(self):
+        """測試分塊大小不影響輸出"""
+        np.testing.assert_allclose(
+            stretch(self.tone, 0.9, 1000), stretch(self.tone, 0.9, 9999), atol=1e-6
+        )
+
+    def test_onsets_scale_with_rate(self):
+        """測試起音位置移到原時間 / 速率"""
+        clicks = np.zeros((SAMPLE_RATE * 2, 1), dtype=np.float32)
+        for second in (0.5, 1.0, 1.5):
+            start = int(second * SAMPLE_RATE)
+            clicks[start : start + 200] = 0.8
+        output = stretch(clicks, 0.75, 4096)[:, 0]
+        for second in (0.5, 1.0, 1.5):
+            window = output[int((second / 0.75 - 0.05) * SAMPLE_RATE) :]
+            onset = np.argmax(window > 0.4) / SAMPLE_RATE + second / 0.75 - 0.05
+            self.assertAlmostEqual(onset, second / 0.75, delta=0.01)
+
+
+class TestPractice(unittest.TestCase):
+    """練習音訊與譜面測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.song_path = self.root / "song.wav"
+        time = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+        with StreamingWavWriter(self.song_path, SAMPLE_RATE, 2) as writer:
+            writer.write(0.3 * np.sin(2 * np.pi * 220 * time))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_chart_scaled(self):
+        """測試譜面時間依速率縮放"""
+        chart = Chart([(1.0, "LEFT"), (3.0, "UP")], bpm=120, offset=0.5, duration=4)
+        scaled = chart.scaled(0.8)
+        self.assertEqual([time for time, _ in scaled.notes], [1.25, 3.75])
+        self.assertAlmostEqual(scaled.bpm, 96)
+        self.assertAlmostEqual(scaled.duration, 5)
+        self.assertEqual(chart.notes[0][0], 1.0)
+
+    def test_render_cached_by_content(self):
+        """測試行程池產生的變速音訊依內容雜湊與速率快取"""
+        renderer = PracticeRenderer(self.root / "cache", workers=1)
+        try:
+            output = renderer.submit(self.song_path, 0.75).result(timeout=60)
+        finally:
+            renderer.shutdown()
+        samples, rate = read_wav(Path(output))
+        self.assertEqual(rate, SAMPLE_RATE)
+        self.assertEqual(samples.shape, (round(SAMPLE_RATE / 0.75), 2))
+
+        mtime = Path(output).stat().st_mtime_ns
+        self.assertEqual(
+            PracticeRenderer(self.root / "cache").render(self.song_path, 0.75),
+            Path(output),
+        )
+        self.assertEqual(Path(output).stat().st_mtime_ns, mtime)
+        self.assertNotEqual(renderer.cached_path(self.song_path, 0.9), Path(output))
+
+    def test_render_failure_keeps_cache(self):
+        """測試變速中途失敗時保留原本的快取，且不留下暫存檔"""
+        output = self.root / "cache" / "song_0.75.wav"
+        output.parent.mkdir()
+        output.write_bytes(b"old")
+        # 截斷在影格中間，讀到最後一個區塊時才會失敗
+        data = self.song_path.read_bytes()
+        self.song_path.write_bytes(data[: len(data) // 2])
+
+        with self.assertRaises(ValueError):
+            render_stretched(str(self.song_path), str(output), 0.75)
+        self.assertEqual(output.read_bytes(), b"old")
+        self.assertEqual(list(output.parent.iterdir()), [output])
+
+    def test_load_section(self):
+        """測試預先切出的段落長度"""
+        pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=2)
+        try:
+            section = load_section(self.song_path, 0.25, 0.75)
+            self.assertAlmostEqual(section.get_length(), 0.5, places=2)
+        finally:
+            pygame.mixer.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+影格效能分析器測試
+"""
+
+import json
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.profiler import FrameProfiler, PhaseHistogram
+
+
+class TestFrameProfiler(unittest.TestCase):
+    """影格效能分析器測試"""
+
+    def setUp(self):
+        """測試設定"""
+        self.profiler = FrameProfiler(enabled=True)
+
+    def test_histogram_percentiles(self):
+        """測試直方圖百分位數"""
+        histogram = PhaseHistogram()
+        for _ in range(99):
+            histogram.record(1_000_000)  # 1ms
+        histogram.record(10_000_000)  # 10ms
+
+        self.assertAlmostEqual(histogram.percentile_ms(50), 1.05)
+        self.assertAlmostEqual(histogram.percentile_ms(100), 10.05)
+        self.assertAlmostEqual(histogram.mean_ms(), 1.09)
+
+    def test_overflow_bucket(self):
+        """測試超出範圍的樣本歸入最後一箱"""
+        histogram = PhaseHistogram()
+        histogram.record(10_000_000_000)
+
+        self.assertEqual(histogram.counts[-1], 1)
+        self.assertEqual(histogram.max_ns, 10_000_000_000)
+
+    def test_toggle_overlay_enables_profiling(self):
+        """測試顯示覆蓋層時啟用量測"""
+        profiler = FrameProfiler()
+
+        self.assertTrue(profiler.toggle_overlay())
+        self.assertTrue(profiler.enabled)
+        self.assertFalse(profiler.toggle_overlay())
+
+    def test_summary_skips_empty_phases(self):
+        """測試摘要只包含有樣本的階段"""
+        self.profiler.record("update", 2_000_000)
+        self.profiler.record("frame", 16_000_000)
+
+        summary = self.profiler.get_summary()
+
+        self.assertEqual(set(summary), {"update", "frame"})
+        self.assertTrue(self.profiler.get_overlay_lines(60.0)[0].startswith("FPS"))
+
+    def test_dump_json_and_csv(self):
+        """測試匯出JSON與CSV"""
+        self.profiler.record("frame", 16_000_000)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = Path(tmp) / "profile.json"
+            csv_path = Path(tmp) / "profile.csv"
+
+            self.assertTrue(self.profiler.dump(json_path))
+            self.assertTrue(self.profiler.dump(csv_path))
+            self.assertEqual(json.loads(json_path.read_text())["frame"]["samples"], 1)
+            self.assertTrue(csv_path.read_text().startswith("phase,"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+音效聲道管理測試
+"""
+
+import os
+import unittest
+import sys
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game.sfx_channels import SfxChannelManager
+
+
+class TestSfxChannelManager(unittest.TestCase):
+    """音效聲道管理測試"""
+
+    def setUp(self):
+        pygame.mixer.init(frequency=22050, size=-16, channels=2)
+        # 足夠長的音效，測試期間保持播放中
+        self.sound = pygame.mixer.Sound(buffer=bytes(22050 * 4 * 5))
+        self.manager = SfxChannelManager({"judgment": 2, "combo": 1})
+
+    def tearDown(self):
+        self.manager.stop()
+        pygame.mixer.quit()
+
+    def test_reserved_channels(self):
+        """測試保留聲道不被自動選用"""
+        self.assertEqual(self.manager.reserved_count, 3)
+        self.assertGreaterEqual(pygame.mixer.get_num_channels(), 3)
+        self.assertEqual(len(self.manager.groups["judgment"].channels), 2)
+
+    def test_coalesce_same_frame(self):
+        """測試同一影格的相同音效只播放一次"""
+        self.assertIsNotNone(self.manager.play("perfect", self.sound, "judgment"))
+        self.assertIsNone(self.manager.play("perfect", self.sound, "judgment"))
+        self.assertEqual(self.manager.coalesced, 1)
+
+        self.manager.begin_frame()
+        self.assertIsNotNone(self.manager.play("perfect", self.sound, "judgment"))
+        self.assertEqual(self.manager.played, 2)
+
+    def test_steal_and_drop(self):
+        """測試聲道用盡時依優先權搶占或捨棄"""
+        self.manager.play("a", self.sound, "judgment", priority=1)
+        self.manager.play("b", self.sound, "judgment", priority=2)
+
+        # 優先權較低者無法搶占
+        self.assertIsNone(self.manager.play("c", self.sound, "judgment", priority=0))
+        self.assertEqual(self.manager.dropped, 1)
+
+        # 搶占優先權最低的聲道
+        channel = self.manager.play("d", self.sound, "judgment", priority=1)
+        self.assertIs(channel, self.manager.groups["judgment"].channels[0])
+        self.assertEqual(self.manager.stolen, 1)
+
+    def test_categories_are_isolated(self):
+        """測試不同類別不會互相搶占聲道"""
+        self.manager.play("a", self.sound, "judgment", priority=5)
+        self.manager.play("b", self.sound, "judgment", priority=5)
+        self.assertIsNotNone(self.manager.play("combo", self.sound, "combo"))
+        self.assertEqual(self.manager.get_stats()["stolen"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
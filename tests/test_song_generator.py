@@ -0,0 +1,94 @@
+"""
+程序化歌曲產生器與譜面測試
+"""
+
+import json
+import tempfile
+import unittest
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.chart import Chart
+from game.song_generator import STEPS_PER_BAR, SongGenerator
+from utils.audio_convert import StreamingWavWriter, read_wav
+
+
+class TestSongGenerator(unittest.TestCase):
+    """程序化歌曲產生器測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_streaming_writer_chunks(self):
+        """測試跨越區塊邊界寫入後內容完整"""
+        path = self.root / "ramp.wav"
+        samples = np.linspace(-0.5, 0.5, 1000, dtype=np.float32)
+        with StreamingWavWriter(path, 8000, chunk_frames=64) as writer:
+            writer.write(samples[:100])
+            writer.write(samples[100:])
+
+        loaded, rate = read_wav(path)
+        self.assertEqual(rate, 8000)
+        self.assertEqual(loaded.shape, (1000, 1))
+        np.testing.assert_allclose(loaded[:, 0], samples, atol=1e-4)
+
+    def test_render_song_and_chart(self):
+        """測試歌曲長度與譜面音符對齊十六分音符格線"""
+        generator = SongGenerator(bpm=150, bars=8, seed=3, sample_rate=8000)
+        wav_path = self.root / "song.wav"
+        chart = generator.render(wav_path, Chart.sidecar_path(wav_path))
+
+        with wave.open(str(wav_path), "rb") as wav_file:
+            duration = wav_file.getnframes() / wav_file.getframerate()
+        self.assertAlmostEqual(duration, chart.duration, places=3)
+        self.assertGreaterEqual(duration, 8 * 4 * 60 / 150)
+
+        self.assertGreater(chart.note_count, 0)
+        for time, _ in chart.notes:
+            steps = time / generator.step_seconds
+            self.assertAlmostEqual(steps, round(steps), places=6)
+            self.assertLess(steps, 8 * STEPS_PER_BAR)
+
+    def test_chart_round_trip(self):
+        """測試譜面儲存與載入"""
+        generator = SongGenerator(bpm=120, bars=4, seed=1, sample_rate=8000)
+        wav_path = self.root / "song.wav"
+        chart = generator.render(wav_path, Chart.sidecar_path(wav_path))
+
+        loaded = Chart.load(self.root / "song.chart.json")
+        self.assertEqual(loaded.bpm, 120)
+        self.assertEqual(loaded.audio_file, "song.wav")
+        self.assertEqual(loaded.notes, chart.notes)
+
+    def test_load_malformed_chart(self):
+        """測試格式錯誤的譜面檔：不合法的音符略過，整份錯誤時回傳 None"""
+        chart_path = self.root / "song.chart.json"
+        data = {"version": Chart.VERSION, "bpm": 120, "notes": [[1.0], 2, [1.5, "UP"]]}
+        chart_path.write_text(json.dumps(data), encoding="utf-8")
+        self.assertEqual(Chart.load(chart_path).notes, [(1.5, "UP")])
+
+        for content in ([1, 2], {"version": Chart.VERSION, "notes": [["x", "UP"]]}):
+            chart_path.write_text(json.dumps(content), encoding="utf-8")
+            self.assertIsNone(Chart.load(chart_path))
+
+    def test_same_seed_is_deterministic(self):
+        """測試相同種子產生相同譜面"""
+        first = SongGenerator(bpm=100, bars=4, seed=7, sample_rate=8000)
+        second = SongGenerator(bpm=100, bars=4, seed=7, sample_rate=8000)
+        chart_a = first.render(self.root / "a.wav")
+        chart_b = second.render(self.root / "b.wav")
+        self.assertEqual(chart_a.notes, chart_b.notes)
+
+
+if __name__ == "__main__":
+    unittest.main()
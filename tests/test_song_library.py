@@ -0,0 +1,116 @@
+"""
+歌曲庫索引測試
+"""
+
+import tempfile
+import unittest
+import sys
+import wave
+from pathlib import Path
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.chart import Chart
+from game.song_library import SongLibrary
+from game.song_generator import SongGenerator
+
+
+def write_silence(path: Path, seconds: float, sample_rate: int = 8000) -> None:
+    """寫入指定長度的靜音 WAV"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\0\0" * int(seconds * sample_rate))
+
+
+class TestSongLibrary(unittest.TestCase):
+    """歌曲庫索引測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.music_dir = self.root / "music"
+        self.index_file = self.root / "index.json"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_library(self, **kwargs) -> SongLibrary:
+        return SongLibrary(self.index_file, [self.music_dir], **kwargs)
+
+    def test_scan_extracts_metadata(self):
+        """測試擷取長度與取樣率，略過排除的檔名與無法解析的檔案"""
+        write_silence(self.music_dir / "b_song.wav", 2.0)
+        write_silence(self.music_dir / "album" / "a_song.wav", 1.5, sample_rate=22050)
+        write_silence(self.music_dir / "background.wav", 1.0)
+        (self.music_dir / "broken.wav").write_bytes(b"not a wav")
+        (self.music_dir / "notes.txt").write_text("skip")
+
+        library = self.create_library(exclude=["background.wav"])
+        stats = library.scan(use_processes=False)
+
+        self.assertEqual(stats["total"], 3)
+        self.assertEqual([song.title for song in library.songs], ["a_song", "b_song"])
+        first = library.songs[0]
+        self.assertEqual(first.sample_rate, 22050)
+        self.assertAlmostEqual(first.duration, 1.5)
+        self.assertFalse(first.has_chart)
+
+    def test_rescan_only_touches_changed_files(self):
+        """測試重新掃描只擷取大小或修改時間變更的檔案"""
+        for index in range(6):
+            write_silence(self.music_dir / f"song{index}.wav", 0.5)
+        library = self.create_library()
+        self.assertEqual(library.scan(workers=2, use_processes=False)["scanned"], 6)
+        self.assertEqual(library.scan(use_processes=False)["scanned"], 0)
+
+        write_silence(self.music_dir / "song1.wav", 1.0)
+        (self.music_dir / "song2.wav").unlink()
+        stats = library.scan(use_processes=False)
+        self.assertEqual((stats["scanned"], stats["removed"]), (1, 1))
+        self.assertAlmostEqual(library.get(self.music_dir / "song1.wav").duration, 1.0)
+
+    def test_index_persists(self):
+        """測試索引存檔後可直接載入，不需重新擷取"""
+        write_silence(self.music_dir / "song.wav", 1.0)
+        self.create_library().scan(use_processes=False)
+
+        library = self.create_library()
+        self.assertTrue(library.load())
+        self.assertEqual(len(library.songs), 1)
+        self.assertEqual(library.scan(use_processes=False)["scanned"], 0)
+
+    def test_chart_sidecar_triggers_rescan(self):
+        """測試新增譜面檔時重新擷取，BPM 取自譜面"""
+        song_path = self.music_dir / "song.wav"
+        write_silence(song_path, 1.0)
+        library = self.create_library()
+        library.scan(use_processes=False)
+        self.assertEqual(library.songs[0].bpm, 0)
+
+        Chart([(0.5, "LEFT")], bpm=140, title="Song Title").save(
+            Chart.sidecar_path(song_path)
+        )
+        self.assertEqual(library.scan(use_processes=False)["scanned"], 1)
+        song = library.songs[0]
+        self.assertTrue(song.has_chart)
+        self.assertEqual(song.bpm, 140)
+        self.assertEqual(song.title, "Song Title")
+
+    def test_scan_analyzes_bpm(self):
+        """測試沒有譜面的歌曲以音訊分析取得 BPM"""
+        song_path = self.music_dir / "song.wav"
+        SongGenerator(bpm=120, bars=8, seed=1, sample_rate=22050).render(song_path)
+
+        library = self.create_library(analysis_dir=self.root / "analysis")
+        library.scan(use_processes=False)
+        song = library.songs[0]
+        self.assertAlmostEqual(song.bpm, 120, delta=1)
+        self.assertTrue(song.digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+選歌試聽測試
+"""
+
+import os
+import tempfile
+import time
+import unittest
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game.song_library import SongLibrary
+from game.song_preview import SongPreview, decode_preview
+from utils.audio_convert import to_int16
+
+SAMPLE_RATE = 8000
+
+
+def write_ramp(path: Path, seconds: float) -> None:
+    """寫入振幅隨時間線性上升的單聲道 WAV（可由取樣值推算位置）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frames = int(seconds * SAMPLE_RATE)
+    samples = np.linspace(0.0, 0.9, frames, dtype=np.float32)
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(to_int16(samples).tobytes())
+
+
+class TestSongPreview(unittest.TestCase):
+    """選歌試聽測試"""
+
+    def setUp(self):
+        pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=2)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        for index in range(8):
+            write_ramp(self.root / "music" / f"song{index}.wav", 2.0)
+        self.library = SongLibrary(self.root / "index.json", [self.root / "music"])
+        self.library.scan(use_processes=False)
+        channels = [pygame.mixer.Channel(index) for index in range(2)]
+        self.preview = SongPreview(channels)
+
+    def tearDown(self):
+        self.preview.close()
+        pygame.mixer.quit()
+        self.temp_dir.cleanup()
+
+    def wait_for(self, paths, timeout: float = 5.0) -> None:
+        """等待背景執行緒解碼完成（每次以 update 收取結果）"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.preview.update(0.0)
+            if all(self.preview.is_ready(path) for path in paths):
+                return
+            time.sleep(0.01)
+        self.fail("試聽片段未在時限內解碼完成")
+
+    def test_decode_segment(self):
+        """測試只解碼指定的片段，轉為混音器格式並套用頭尾淡入淡出"""
+        path = self.root / "music" / "song0.wav"
+        pcm = decode_preview(path, SAMPLE_RATE, 2, start_ratio=0.5, seconds=0.5)
+        samples = np.frombuffer(pcm, dtype="<i2").reshape(-1, 2)
+
+        self.assertEqual(samples.shape[0], SAMPLE_RATE // 2)
+        self.assertEqual(samples[0, 0], 0)
+        # 片段中央約位於原曲 1.25 秒處
+        middle = samples[samples.shape[0] // 2, 0] / 32767
+        self.assertAlmostEqual(middle, 0.9 * 1.25 / 2.0, delta=0.01)
+        self.assertIsNone(decode_preview(self.root / "missing.wav", SAMPLE_RATE, 2))
+
+    def test_prefetch_around_cursor(self):
+        """測試預先解碼游標前後的歌曲，較遠的歌曲不解碼"""
+        songs = self.library.songs
+        self.preview.select(songs, 3)
+        nearby = [song.path for song in songs[1:6]]
+        self.wait_for(nearby)
+        self.assertEqual(len(self.preview.cache), 5)
+        self.assertFalse(self.preview.is_ready(songs[7].path))
+
+    def test_plays_after_cursor_settles(self):
+        """測試游標停留後才以試聽聲道播放，離開選歌時停止"""
+        songs = self.library.songs
+        self.preview.select(songs, 0)
+        self.wait_for([songs[0].path])
+        self.preview.select(songs, 1)
+        self.preview.update(0.0)
+        self.assertIsNone(self.preview.playing)
+
+        self.wait_for([songs[1].path])
+        self.preview.update(SongPreview.SETTLE_SECONDS)
+        self.assertEqual(self.preview.playing, songs[1].path)
+        self.assertTrue(any(channel.get_busy() for channel in self.preview.channels))
+
+        self.preview.stop()
+        self.assertIsNone(self.preview.playing)
+
+
+if __name__ == "__main__":
+    unittest.main()
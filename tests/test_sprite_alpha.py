@@ -0,0 +1,120 @@
+"""
+精靈圖去背測試
+"""
+
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.sprite_alpha import (
+    SpriteAlphaProcessor,
+    load_rgba,
+    remove_checker_background,
+    save_rgba,
+)
+
+SIZE = 64
+CELL = 8
+
+
+def make_sprite() -> np.ndarray:
+    """產生灰色棋盤格背景上的藍色方塊，方塊中央有一塊與背景同色的灰色"""
+    rows, cols = np.indices((SIZE, SIZE))
+    checker = np.where((rows // CELL + cols // CELL) % 2, 153, 102)
+    pixels = np.empty((SIZE, SIZE, 4), dtype=np.uint8)
+    pixels[..., :3] = checker[..., np.newaxis]
+    pixels[..., 3] = 255
+    pixels[16:48, 16:48, :3] = (40, 90, 230)
+    pixels[28:36, 28:36, :3] = 153
+    return pixels
+
+
+class TestRemoveChecker(unittest.TestCase):
+    """棋盤格去背測試"""
+
+    def test_removes_border_connected_checker(self):
+        """測試只移除與邊框相連的棋盤格，精靈內部的灰色保留，邊緣羽化"""
+        pixels = make_sprite()
+        result, removed = remove_checker_background(pixels, feather=1)
+        alpha = result[..., 3]
+
+        self.assertEqual(removed, SIZE * SIZE - 32 * 32)
+        self.assertEqual(alpha[0, 0], 0)
+        self.assertEqual(alpha[32, 32], 255)
+        self.assertEqual(alpha[16, 32], 127)
+        self.assertEqual(alpha[17, 32], 255)
+        self.assertEqual(pixels[0, 0, 3], 255)
+
+        # 已去背的圖片再處理一次不會改變
+        again, removed = remove_checker_background(result, feather=1)
+        self.assertEqual(removed, 0)
+        self.assertIs(again, result)
+
+    def test_tolerance(self):
+        """測試容許誤差內的雜訊仍視為棋盤格"""
+        pixels = make_sprite()
+        noise = np.random.default_rng(0).integers(-3, 4, pixels[..., :3].shape)
+        pixels[..., :3] = np.clip(pixels[..., :3] + noise, 0, 255)
+        _, removed = remove_checker_background(pixels, tolerance=6, feather=0)
+        self.assertEqual(removed, SIZE * SIZE - 32 * 32)
+        _, removed = remove_checker_background(pixels, tolerance=1, feather=0)
+        self.assertLess(removed, SIZE * SIZE - 32 * 32)
+
+
+class TestSpriteAlphaProcessor(unittest.TestCase):
+    """批次去背測試"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.images = self.root / "images"
+        for name in ("a.png", "b.png", "theme/c.png"):
+            path = self.images / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            save_rgba(path, make_sprite())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def processor(self) -> SpriteAlphaProcessor:
+        processor = SpriteAlphaProcessor(self.root / "manifest.json")
+        processor.load()
+        return processor
+
+    def test_skips_unchanged_files(self):
+        """測試內容未變更的圖片依清單略過，變更的圖片重新處理"""
+        stats = self.processor().run([self.images], workers=1)
+        self.assertEqual((stats["processed"], stats["changed"]), (3, 3))
+        self.assertEqual(load_rgba(self.images / "theme" / "c.png")[0, 0, 3], 0)
+
+        self.assertEqual(self.processor().run([self.images])["skipped"], 3)
+
+        save_rgba(self.images / "b.png", make_sprite())
+        stats = self.processor().run([self.images])
+        self.assertEqual((stats["processed"], stats["skipped"]), (1, 2))
+
+    def test_skips_temp_files(self):
+        """測試其他行程寫到一半的隱藏暫存檔不列入處理"""
+        temp = self.images / "theme" / ".c.1234.tmp.png"
+        save_rgba(temp, make_sprite())
+        files = self.processor().collect([self.images])
+        self.assertEqual(len(files), 3)
+        self.assertNotIn(temp.resolve(), files)
+
+    def test_output_dir(self):
+        """測試輸出到其他目錄時保留相對路徑且不修改來源"""
+        output = self.root / "out"
+        stats = self.processor().run([self.images], output_dir=output)
+        self.assertEqual(stats["changed"], 3)
+        self.assertEqual(load_rgba(output / "theme" / "c.png")[0, 0, 3], 0)
+        self.assertEqual(load_rgba(self.images / "a.png")[0, 0, 3], 255)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+程序化音效合成測試
+"""
+
+import os
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 添加src目錄到Python路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game.synth import (
+    SFX_GENERATORS,
+    fade_out,
+    mix_into,
+    sweep,
+    synthesize_sfx,
+    tone,
+)
+
+
+class TestSynth(unittest.TestCase):
+    """程序化音效合成測試"""
+
+    def test_tone(self):
+        """測試正弦波長度與振幅"""
+        samples = tone(440, 0.5, 8000, amplitude=0.5)
+        self.assertEqual(samples.dtype, np.float32)
+        self.assertEqual(samples.size, 4000)
+        self.assertAlmostEqual(float(np.abs(samples).max()), 0.5, places=3)
+
+    def test_sweep_zero_crossings(self):
+        """測試上升掃頻後半段的過零點比前半段多"""
+        samples = sweep(100, 1000, 1.0, 8000)
+        half = samples.size // 2
+        first = np.count_nonzero(np.diff(np.signbit(samples[:half])))
+        second = np.count_nonzero(np.diff(np.signbit(samples[half:])))
+        self.assertGreater(second, first)
+
+    def test_fade_out_and_mix(self):
+        """測試淡出結尾為0，疊加超出緩衝區時截斷"""
+        samples = fade_out(np.ones(100, dtype=np.float32), 0.001, 10000)
+        self.assertEqual(samples[-1], 0.0)
+        self.assertEqual(samples[0], 1.0)
+
+        buffer = np.zeros(10, dtype=np.float32)
+        mix_into(buffer, np.ones(5, dtype=np.float32), 8)
+        mix_into(buffer, np.ones(5, dtype=np.float32), 20)
+        self.assertEqual(float(buffer.sum()), 2.0)
+
+    def test_synthesize_sfx(self):
+        """測試以混音器格式合成所有音效"""
+        pygame.mixer.init(frequency=22050, size=-16, channels=2)
+        try:
+            for name in SFX_GENERATORS:
+                sound = synthesize_sfx(name)
+                self.assertIsNotNone(sound)
+                self.assertGreater(sound.get_length(), 0.1)
+            self.assertIsNone(synthesize_sfx("unknown"))
+        finally:
+            pygame.mixer.quit()
+
+
+if __name__ == "__main__":
+    unittest.main()